@@ -0,0 +1,21 @@
+"""index sweets on (created_at, id) for keyset pagination
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sweets_created_at_id", "sweets", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sweets_created_at_id", table_name="sweets")
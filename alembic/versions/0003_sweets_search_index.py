@@ -0,0 +1,33 @@
+"""full-text search index for sweets (FTS5 on SQLite, tsvector/GIN on PostgreSQL)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from app.services.search_index import POSTGRES_DDL, SQLITE_DDL, SQLITE_REBUILD
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": (*SQLITE_DDL, SQLITE_REBUILD), "postgresql": POSTGRES_DDL}.get(dialect, ())
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("sweets_fts_ai", "sweets_fts_ad", "sweets_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS sweets_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_sweets_search_vector")
+        op.execute("ALTER TABLE sweets DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,45 @@
+"""orders ledger: orders and order_lines
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_orders_user_id_created_at", "orders", ["user_id", "created_at"])
+    op.create_index("ix_orders_created_at", "orders", ["created_at"])
+
+    op.create_table(
+        "order_lines",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id"), nullable=False),
+        sa.Column("sweet_id", sa.Integer(), sa.ForeignKey("sweets.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("unit_price", sa.Float(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_order_lines_order_id", "order_lines", ["order_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_lines_order_id", table_name="order_lines")
+    op.drop_table("order_lines")
+    op.drop_index("ix_orders_created_at", table_name="orders")
+    op.drop_index("ix_orders_user_id_created_at", table_name="orders")
+    op.drop_table("orders")
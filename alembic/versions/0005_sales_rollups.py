@@ -0,0 +1,45 @@
+"""daily sales rollups, order line categories and a low-stock index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table, key in (("sweet_daily_sales", sa.Column("sweet_id", sa.Integer(), primary_key=True)),
+                       ("category_daily_sales", sa.Column("category", sa.String(), primary_key=True))):
+        op.create_table(
+            table,
+            sa.Column("day", sa.Date(), primary_key=True),
+            key,
+            sa.Column("units_sold", sa.Integer(), nullable=False),
+            sa.Column("revenue", sa.Float(), nullable=False),
+            sa.Column("units_restocked", sa.Integer(), nullable=False),
+        )
+    with op.batch_alter_table("order_lines") as batch:
+        batch.add_column(sa.Column("category", sa.String(), nullable=True))
+    # lines already in the ledger take their sweet's current category, so a
+    # rollup rebuild does not file all earlier revenue under no category
+    op.execute(
+        "UPDATE order_lines SET category = "
+        "(SELECT category FROM sweets WHERE sweets.id = order_lines.sweet_id) "
+        "WHERE sweet_id IS NOT NULL"
+    )
+    op.create_index("ix_sweets_quantity", "sweets", ["quantity"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sweets_quantity", table_name="sweets")
+    with op.batch_alter_table("order_lines") as batch:
+        batch.drop_column("category")
+    op.drop_table("category_daily_sales")
+    op.drop_table("sweet_daily_sales")
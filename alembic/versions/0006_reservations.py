@@ -0,0 +1,35 @@
+"""stock reservations (expiring holds)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reservations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("sweet_id", sa.Integer(), sa.ForeignKey("sweets.id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_reservations_user_id", "reservations", ["user_id"])
+    op.create_index("ix_reservations_expires_at", "reservations", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reservations_expires_at", table_name="reservations")
+    op.drop_index("ix_reservations_user_id", table_name="reservations")
+    op.drop_table("reservations")
@@ -0,0 +1,53 @@
+"""never reuse a deleted sweet's id on SQLite
+
+Without AUTOINCREMENT SQLite hands out max(id) + 1, so deleting the newest
+sweet gives its id, and with it the order lines, rollups and holds still
+carrying that id, to the next sweet created.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.search_index import SQLITE_DDL
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+# the highest sweet id anything has ever referred to
+HIGHEST_ID = """
+    SELECT max(
+        coalesce((SELECT max(id) FROM sweets), 0),
+        coalesce((SELECT max(sweet_id) FROM order_lines), 0),
+        coalesce((SELECT max(sweet_id) FROM sweet_daily_sales), 0),
+        coalesce((SELECT max(sweet_id) FROM reservations), 0)
+    )
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return  # sequences never hand out an id twice
+    ddl = bind.execute(sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'sweets'")).scalar()
+    if "AUTOINCREMENT" in ddl.upper():
+        return  # built by create_all from the current model
+    with op.batch_alter_table("sweets", recreate="always", table_kwargs={"sqlite_autoincrement": True}):
+        pass
+    highest = bind.execute(sa.text(HIGHEST_ID)).scalar()
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'sweets'")
+    op.execute(sa.text("INSERT INTO sqlite_sequence (name, seq) VALUES ('sweets', :seq)").bindparams(seq=highest))
+    # the rebuild dropped the search index triggers with the old table
+    if bind.execute(sa.text("SELECT 1 FROM sqlite_master WHERE name = 'sweets_fts'")).first():
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    pass  # the AUTOINCREMENT table serves the older revisions as it is
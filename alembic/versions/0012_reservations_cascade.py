@@ -0,0 +1,50 @@
+"""delete a sweet's holds with it
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def _sweet_fk(ondelete: str | None):
+    return sa.Column("sweet_id", sa.Integer(), sa.ForeignKey("sweets.id", ondelete=ondelete), nullable=False)
+
+
+def _set_ondelete(ondelete: str | None) -> None:
+    bind = op.get_bind()
+    fk = next(fk for fk in sa.inspect(bind).get_foreign_keys("reservations") if fk["referred_table"] == "sweets")
+    if fk["options"].get("ondelete") == ondelete:
+        return  # built by create_all from the current model
+    if bind.dialect.name == "sqlite":
+        # the constraint has no name to drop, so rebuild the table around a redefined column
+        seq = "SELECT seq FROM sqlite_sequence WHERE name = 'reservations'"
+        last_id = bind.execute(sa.text(seq)).scalar()
+        with op.batch_alter_table(
+            "reservations",
+            recreate="always",
+            reflect_args=[_sweet_fk(ondelete)],
+            table_kwargs={"sqlite_autoincrement": True},
+        ):
+            pass
+        if last_id is not None:
+            # the copy restarts the sequence at the highest live id; keep handing out fresh ones
+            op.execute(sa.text("UPDATE sqlite_sequence SET seq = :seq WHERE name = 'reservations'").bindparams(seq=last_id))
+        return
+    op.drop_constraint(fk["name"], "reservations", type_="foreignkey")
+    op.create_foreign_key(fk["name"], "reservations", "sweets", ["sweet_id"], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _set_ondelete("CASCADE")
+
+
+def downgrade() -> None:
+    _set_ondelete(None)
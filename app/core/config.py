@@ -10,6 +10,109 @@ class Settings(BaseSettings):
     refresh_token_expires_days: int = 7
     app_name: str = "Sweet Shop Management System API"
 
+    # serve the core routes through AsyncEngine/AsyncSession instead of the
+    # threadpool; async_database_url defaults to database_url with an async driver
+    db_async: bool = False
+    async_database_url: str | None = None
+
+    # how startup brings the schema up to date: alembic | create_all | none
+    db_schema: str = "alembic"
+
+    # connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = False
+
+    # applied to every new SQLite connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64 * 1024  # negative = KiB, so 64 MiB
+
+    # group commit: purchases, checkouts and restocks go through one writer
+    # thread that commits up to write_batch_max_ops of them per transaction,
+    # waiting at most write_batch_max_delay_ms for a batch to fill (0 = never wait)
+    write_batch_enabled: bool = False
+    write_batch_max_ops: int = 64
+    write_batch_max_delay_ms: float = 0.0
+
+    # how often each worker re-reads revoked tokens as a backstop for the bus (and drops expired ones)
+    token_revocation_sync_seconds: float = 5.0
+
+    # tells the other workers about catalog writes, role changes and revoked
+    # tokens: local (one process) | sqlite (a shared file, polled every
+    # invalidation_poll_ms) | redis (needs the redis package)
+    invalidation_bus: str = "local"
+    invalidation_sqlite_path: str = "invalidation_bus.db"
+    invalidation_poll_ms: float = 2.0
+    redis_url: str = "redis://localhost:6379/0"
+
+    # verified access tokens -> principal; 0 disables the cache
+    auth_cache_size: int = 10_000
+    auth_cache_ttl_seconds: int = 300
+
+    # bcrypt runs on a dedicated process pool; requests beyond
+    # workers + queue size are rejected with 429 instead of queueing
+    bcrypt_rounds: int = 12
+    bcrypt_workers: int = 2
+    bcrypt_queue_size: int = 16
+
+    # serialized catalog reads; 0 disables. A stock TTL > 0 lets purchases
+    # and restocks leave cached bodies alone for up to that many seconds.
+    catalog_cache_size: int = 1024
+    catalog_cache_stock_ttl_seconds: float = 0.0
+
+    # live stock stream: frames buffered per subscriber before it is dropped
+    stream_queue_size: int = 64
+    stream_max_subscribers: int = 10_000
+    stream_heartbeat_seconds: float = 15.0
+    # event streams never finish on their own: on shutdown, the launcher gives
+    # in-flight responses this long before cancelling them (streams included)
+    shutdown_grace_seconds: float = 5.0
+
+    # stock holds: lifetime, and how often / how many expired holds are released
+    reservation_ttl_seconds: int = 600
+    reservation_sweep_interval_seconds: float = 5.0
+    reservation_sweep_batch: int = 500
+
+    # Idempotency-Key on mutating sweet routes: how long a key's stored response
+    # is replayed, how many stay in memory, and how often expired keys are deleted.
+    # A claim whose request produced no response within idempotency_lease_seconds
+    # (e.g. the worker died) is handed to the next retry; keep it above the
+    # slowest mutating request.
+    idempotency_enabled: bool = True
+    idempotency_ttl_seconds: int = 24 * 60 * 60
+    idempotency_lease_seconds: float = 10.0
+    idempotency_cache_size: int = 10_000
+    idempotency_sweep_interval_seconds: float = 60.0
+    idempotency_sweep_batch: int = 1000
+
+    # token-bucket limits as "<count>/<second|minute|hour|day>"; "" turns a group off
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # memory | sqlite
+    rate_limit_sqlite_path: str = "rate_limits.db"
+    rate_limit_trust_forwarded: bool = False
+    rate_limit_auth: str = "10/minute"
+    rate_limit_purchase: str = "10/second"
+    rate_limit_default: str = "100/second"
+
+    # per-route latency histograms on /metrics; requests slower than
+    # slow_request_ms are logged with a per-phase breakdown (0 = off)
+    metrics_enabled: bool = True
+    slow_request_ms: float = 0.0
+
+    # gzip (and brotli, if installed) for bodies of at least compression_min_size
+    # bytes; catalog_precompress memoizes compressed catalog bodies per version
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    catalog_precompress: bool = True
+    catalog_cache_control: str = "public, max-age=5, stale-while-revalidate=30"
+
 
     # allow example extras (if present)
     postgres_db: str | None = None
@@ -1,14 +1,56 @@
-from sqlalchemy import create_engine
+from functools import lru_cache
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import get_settings
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.core.timing import instrument_engine
 
 settings = get_settings()
 
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _pool_options(url: str, poolclass) -> dict:
+    if _is_sqlite(url) and make_url(url).database in (None, "", ":memory:"):
+        # an in-memory database lives and dies with its single connection
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+    # off by default in SQLite; ON DELETE actions and references are not enforced without it
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
+    connect_args={"check_same_thread": False} if _is_sqlite(settings.database_url) else {},
     future=True,
+    **_pool_options(settings.database_url, InstrumentedQueuePool),
 )
+if _is_sqlite(settings.database_url):
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+if settings.metrics_enabled:
+    instrument_engine(engine)
+
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 def get_db():
@@ -17,3 +59,58 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def dialect_insert(dialect: str):
+    """The dialect's INSERT with ON CONFLICT support, or ``None``."""
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        return sqlite_insert
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        return pg_insert
+    return None
+
+
+# Sync driver -> async driver, for deriving the async URL from database_url.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    scheme, sep, rest = settings.database_url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+@lru_cache(maxsize=1)
+def get_async_engine():
+    # imported lazily: the async drivers are only needed when db_async is on
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = async_database_url()
+    async_engine = create_async_engine(url, **_pool_options(url, InstrumentedAsyncQueuePool))
+    if _is_sqlite(url):
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if settings.metrics_enabled:
+        instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker():
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,106 @@
+"""Bringing the database schema up to date at startup.
+
+``db_schema`` picks the strategy:
+
+* ``alembic`` (default): ``alembic upgrade head``.  A database that already
+  has tables but no ``alembic_version`` was created by the old import-time
+  ``create_all``.  That only ever added whole tables, so such a database can
+  hold any mix of revisions; it gets the missing tables, columns and indexes
+  from the models, is stamped at ``LEGACY_REVISION`` and upgraded from there.
+* ``create_all``: the old behaviour, for throwaway databases.
+* ``none``: leave it alone.  For several workers, migrate once before they
+  start (``alembic upgrade head``) rather than in every worker.
+
+Workers started together on one SQLite file take turns through a lock file
+beside the database, so only the first one migrates.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import make_url
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+# The last revision that only adds tables, columns and indexes, which
+# ``_adopt_legacy`` can reproduce from the models.  Later ones rebuild tables
+# or data in place and skip what a legacy database already has.
+LEGACY_REVISION = "0010"
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    # built without alembic.ini so env.py does not reconfigure the server's logging
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    return config
+
+
+def _is_memory_database(bind) -> bool:
+    url = make_url(str(bind.url))
+    # alembic connects on its own, and would get a different in-memory database
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+@contextmanager
+def _migration_lock(bind):
+    url = make_url(str(bind.url))
+    try:
+        import fcntl
+    except ImportError:  # not on POSIX
+        fcntl = None
+    if fcntl is None or url.get_backend_name() != "sqlite":
+        yield
+        return
+    with open(f"{url.database}.migrate.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def prepare_schema(bind, mode: str = "alembic") -> None:
+    if mode == "none":
+        return
+    from app.models import analytics, idempotency, order, reservation, sweet, token, user  # noqa: F401 - ensure models are imported
+    from app.models.base import Base
+
+    if mode == "create_all" or _is_memory_database(bind):
+        Base.metadata.create_all(bind=bind)
+        return
+    if mode != "alembic":
+        raise ValueError(f"Unknown db_schema {mode!r}; expected alembic, create_all or none")
+
+    from alembic import command
+
+    config = alembic_config()
+    with _migration_lock(bind):
+        with bind.connect() as conn:
+            tables = set(inspect(conn).get_table_names())
+        if tables and "alembic_version" not in tables:
+            _adopt_legacy(bind, Base.metadata)
+            command.stamp(config, LEGACY_REVISION)
+        command.upgrade(config, "head")
+
+
+def _adopt_legacy(bind, metadata) -> None:
+    """Add what ``create_all`` skipped: indexes and columns of tables that already existed."""
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from sqlalchemy import Column
+
+    metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        ops = Operations(MigrationContext.configure(conn))
+        for table in metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    # as the migrations add them: nullable, no backfill
+                    ops.add_column(table.name, Column(column.name, column.type, nullable=True))
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
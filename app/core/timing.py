@@ -0,0 +1,119 @@
+"""Per-request timing breakdown and the process-wide latency metrics.
+
+``TimingMiddleware`` puts a ``RequestTimings`` in a context variable for the
+duration of each request.  Code on the request path adds to it with
+``phase(...)``; the instrumented engines add every query.  Threadpool
+endpoints see the same object because Starlette copies the context into the
+worker thread.  Phases can nest (``user_lookup`` includes its query, which
+also counts towards ``db``), so they are a breakdown, not a partition.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.utils.metrics import COUNT_BUCKETS, registry
+
+request_seconds = registry.histogram(
+    "sweetshop_request_duration_seconds",
+    "Time from request start until the response is sent, by route template.",
+    ("method", "route", "status"),
+)
+request_phase_seconds = registry.histogram(
+    "sweetshop_request_phase_seconds",
+    "Per-request time spent in each phase, for requests that entered it.",
+    ("phase",),
+)
+request_queries = registry.histogram(
+    "sweetshop_request_db_queries",
+    "SQL statements executed per request, by route template.",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+query_seconds = registry.histogram(
+    "sweetshop_db_query_duration_seconds",
+    "Duration of individual SQL statements, in or out of a request.",
+)
+phase_seconds = registry.histogram(
+    "sweetshop_phase_duration_seconds",
+    "Duration of individual timed operations, in or out of a request.",
+    ("phase",),
+)
+
+
+class RequestTimings:
+    __slots__ = ("started", "queries", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+current_timings: ContextVar[RequestTimings | None] = ContextVar("current_timings", default=None)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    phase_seconds.labels(name).observe(seconds)
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def _timed(execute):
+    def timed_execute(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return execute(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_seconds.observe(elapsed)
+            timings = current_timings.get()
+            if timings is not None:
+                timings.queries += 1
+                timings.add("db", elapsed)
+
+    return timed_execute
+
+
+def instrument_engine(sync_engine) -> None:
+    """Time every statement run on ``sync_engine`` (an async engine's ``.sync_engine``).
+
+    Wraps the dialect's execute hooks rather than listening for cursor
+    events: any cursor-event listener moves every statement onto
+    SQLAlchemy's slower dispatching path, which costs more than the timing.
+    """
+    dialect = sync_engine.dialect
+    for name in ("do_execute", "do_executemany", "do_execute_no_params"):
+        setattr(dialect, name, _timed(getattr(dialect, name)))
+
+
+def _before_commit(session):
+    session.info["commit_started"] = time.perf_counter()
+
+
+def _after_commit(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        record_phase("commit", time.perf_counter() - started)
+
+
+# covers sync sessions and the sync Session inside every AsyncSession;
+# the timed span includes the flush that precedes COMMIT
+event.listen(Session, "before_commit", _before_commit)
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_commit)
@@ -1,32 +1,117 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware  # ✅ Added this line
 
 from app.core.config import get_settings
-from app.core.database import engine
-from app.models import sweet, user  # noqa: F401 - ensure models are imported
-from app.models.base import Base
-from app.routers import auth, sweets
+from app.core.database import SessionLocal, engine, get_async_engine
+from app.core.schema import prepare_schema
+from app.middleware.cache_control import CacheControlMiddleware, default_cache_policies
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, build_backend, default_groups
+from app.middleware.timing import TimingMiddleware
+from app.models import analytics, idempotency, order, reservation, sweet, token, user  # noqa: F401 - ensure models are imported
+from app.routers import admin_analytics, auth, metrics, orders, reservations, sweets, sweets_bulk, sweets_stream
+from app.services.auth_service import load_role_changes
+from app.services.idempotency import idempotency_store, sweep_expired_keys
+from app.services.invalidation import invalidation_bus
+from app.services.reservation_service import sweep_expired_holds
+from app.services.search_index import install_search_index
+from app.services.stock_events import stock_broker
+from app.services.token_revocation import revocations, sync_revocations
+from app.services.sweet_service import after_stock_commit
+from app.services.write_batcher import write_batcher
+from app.utils.security import bcrypt_pool
 
 settings = get_settings()
 
-# ✅ Create all tables
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # nothing touches the database until the server actually starts
+    prepare_schema(engine, settings.db_schema)
+    install_search_index(engine)
+    revocations.sync(engine)
+    load_role_changes(engine)
+    invalidation_bus.start()
+    if settings.write_batch_enabled:
+        write_batcher.start(SessionLocal, on_commit=after_stock_commit)
+    app.state.reservation_sweeper = asyncio.create_task(
+        sweep_expired_holds(settings.reservation_sweep_interval_seconds, settings.reservation_sweep_batch)
+    )
+    app.state.idempotency_sweeper = asyncio.create_task(
+        sweep_expired_keys(settings.idempotency_sweep_interval_seconds, settings.idempotency_sweep_batch)
+    )
+    app.state.revocation_sync = asyncio.create_task(sync_revocations(engine, settings.token_revocation_sync_seconds))
+    try:
+        yield
+    finally:
+        app.state.reservation_sweeper.cancel()
+        app.state.idempotency_sweeper.cancel()
+        app.state.revocation_sync.cancel()
+        write_batcher.stop()
+        invalidation_bus.stop()
+        bcrypt_pool.shutdown()
+        stock_broker.close()
+        # pooled aiosqlite connections each own a thread that would keep the process alive
+        if settings.db_async:
+            await get_async_engine().dispose()
+
 
 # ✅ Initialize FastAPI app
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 # ✅ Allow frontend to talk to backend (CORS fix)
+# added first so they run inside CORS and refusals still carry CORS headers
+app.add_middleware(CacheControlMiddleware, policies=default_cache_policies(settings))
+if settings.idempotency_enabled:
+    # inside the rate limiter, so replays still count against it
+    app.add_middleware(IdempotencyMiddleware, store=idempotency_store)
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        groups=default_groups(settings),
+        backend=build_backend(settings),
+        trust_forwarded=settings.rate_limit_trust_forwarded,
+    )
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],  # frontend origin
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # pagination cursors travel in a response header
+    expose_headers=["X-Next-Cursor"],
 )
+if settings.metrics_enabled:
+    # outermost, so the histograms include everything the client waits for
+    app.add_middleware(TimingMiddleware, slow_request_ms=settings.slow_request_ms)
 
 # ✅ Routers
+app.include_router(sweets_bulk.router, prefix="/api/sweets", tags=["sweets"])
+app.include_router(sweets_stream.router, prefix="/api/sweets", tags=["sweets"])
+if settings.db_async:
+    # async twins go first so they shadow the threadpool versions of the same routes
+    from app.routers import auth_async, sweets_async
+
+    app.include_router(auth_async.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(sweets_async.router, prefix="/api/sweets", tags=["sweets"])
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(sweets.router, prefix="/api/sweets", tags=["sweets"])
+app.include_router(orders.router, prefix="/api/orders", tags=["orders"])
+app.include_router(reservations.router, prefix="/api/reservations", tags=["reservations"])
+app.include_router(admin_analytics.router, prefix="/api/admin/analytics", tags=["analytics"])
+app.include_router(metrics.router, tags=["metrics"])
+
 
 @app.get("/")
 def root():
@@ -0,0 +1,68 @@
+"""Per-route ``Cache-Control`` policies as plain ASGI middleware.
+
+The first policy whose method and path match sets ``Cache-Control`` (and
+optionally ``Vary``) on the response, unless the route set its own.
+Catalog reads are public and revalidated through their ETags; anything
+carrying account, order or payment state is never stored.
+"""
+import re
+from typing import NamedTuple
+
+
+class CachePolicy(NamedTuple):
+    methods: frozenset | None
+    pattern: re.Pattern
+    cache_control: bytes
+    vary: bytes | None = None
+
+
+def cache_policy(methods, pattern: str, cache_control: str, vary: str | None = None) -> CachePolicy:
+    return CachePolicy(
+        frozenset(methods) if methods else None,
+        re.compile(pattern),
+        cache_control.encode(),
+        vary.encode() if vary else None,
+    )
+
+
+def default_cache_policies(settings) -> list[CachePolicy]:
+    return [
+        # the live stream sets its own no-cache header
+        cache_policy({"GET", "HEAD"}, r"^/api/sweets/(\d+|search)?$", settings.catalog_cache_control, vary="Accept-Encoding"),
+        cache_policy(None, r"^/api/(auth|sweets|orders|reservations|admin)/", "private, no-store"),
+        cache_policy(None, r"^/metrics", "no-store"),
+    ]
+
+
+class CacheControlMiddleware:
+    def __init__(self, app, policies: list[CachePolicy]):
+        self.app = app
+        self.policies = policies
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        policy = self._match(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_policy(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                names = {name for name, _ in headers}
+                if b"cache-control" not in names:
+                    headers.append((b"cache-control", policy.cache_control))
+                if policy.vary and b"vary" not in names:
+                    headers.append((b"vary", policy.vary))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_policy)
+
+    def _match(self, method: str, path: str) -> CachePolicy | None:
+        for policy in self.policies:
+            if (policy.methods is None or method in policy.methods) and policy.pattern.match(path):
+                return policy
+        return None
@@ -0,0 +1,91 @@
+"""Negotiated gzip/brotli response compression as plain ASGI middleware.
+
+Bodies under ``minimum_size``, non-text types, event streams and responses
+that already carry a ``Content-Encoding`` (the catalog cache's precompressed
+bodies) pass through untouched.  Streamed bodies are compressed chunk by
+chunk.  A strong ``ETag`` becomes weak on a compressed response, since the
+bytes no longer match the identity representation it was computed for.
+"""
+from app.utils.compression import StreamCompressor, compress, is_compressible, negotiate
+
+
+def _header(headers, name: bytes) -> bytes | None:
+    for key, value in headers:
+        if key == name:
+            return value
+    return None
+
+
+def _with_vary(headers: list, value: bytes = b"Accept-Encoding") -> list:
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return [*headers, (b"vary", value)]
+    if value.lower() in vary.lower():
+        return headers
+    return [(k, v + b", " + value if k == b"vary" else v) for k, v in headers]
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = _header(scope["headers"], b"accept-encoding")
+        encoding = negotiate(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                if _header(headers, b"content-encoding") or not is_compressible(_header(headers, b"content-type")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # held back until the first body chunk shows whether to compress
+                    start = {**message, "headers": headers}
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is not None:
+                data = compressor.chunk(body) if more_body else compressor.chunk(body) + compressor.finish()
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            headers = _with_vary(start["headers"])
+            if not more_body and len(body) < self.minimum_size:
+                passthrough = True
+                await send({**start, "headers": headers})
+                await send(message)
+                return
+
+            headers = [(k, v) for k, v in headers if k != b"content-length"]
+            headers.append((b"content-encoding", encoding.encode()))
+            headers = [(k, b"W/" + v if k == b"etag" and not v.startswith(b"W/") else v) for k, v in headers]
+            if more_body:
+                compressor = StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                await send({**start, "headers": headers})
+                await send({"type": "http.response.body", "body": compressor.chunk(body), "more_body": True})
+                return
+            data = compress(body, encoding, self.gzip_level, self.brotli_quality)
+            headers.append((b"content-length", str(len(data)).encode()))
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": data})
+
+        await self.app(scope, receive, send_compressed)
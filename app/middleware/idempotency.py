@@ -0,0 +1,124 @@
+"""``Idempotency-Key`` support for mutating routes, as plain ASGI middleware.
+
+A request to a matching route that carries the header and a valid bearer
+token is fingerprinted (method, path, query and body).  The first request
+with a key runs normally and its response is stored; a retry with the same
+key gets that response back, marked ``Idempotent-Replayed: true``, without
+running the mutation again.  A retry while the first attempt is still
+running gets 409, and reusing a key for a different request gets 422.
+Only 2xx and deterministic 4xx responses are stored; after any other the
+key is free again, so a retry runs the request.  Requests without the
+header are untouched.
+"""
+import hashlib
+import json
+import re
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.auth_service import principal_from_claims
+from app.services.idempotency import IdempotencyStore
+
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+# every mutating route in routers/sweets.py (and its async twins)
+SWEET_WRITES = r"^/api/sweets/(\d+(/(purchase|reserve|restock))?|checkout)?$"
+MAX_KEY_LENGTH = 255
+# 4xx answers a retry of the same request would get again; anything else that
+# is not a 2xx (401/403 before re-authenticating, 429, 5xx) is not stored
+STORED_CLIENT_ERRORS = frozenset({400, 404, 409, 422})
+
+
+def _error(status: int, detail: str) -> tuple[int, list, bytes]:
+    body = json.dumps({"detail": detail}).encode()
+    return status, [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())], body
+
+
+async def _respond(send, status: int, headers: list, body: bytes) -> None:
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app, store: IdempotencyStore, pattern: str = SWEET_WRITES):
+        self.app = app
+        self.store = store
+        self.pattern = re.compile(pattern)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS or not self.pattern.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        client_key = owner = None
+        for name, value in scope["headers"]:
+            if name == b"idempotency-key":
+                client_key = value.decode("latin-1").strip()
+            elif name == b"authorization" and value[:7].lower() == b"bearer ":
+                principal, payload = principal_from_claims(value[7:].decode("latin-1"))
+                owner = principal.email if principal is not None else (payload or {}).get("sub")
+        if client_key is None or owner is None:
+            # no key, or no caller to scope it to (the route will answer 401)
+            await self.app(scope, receive, send)
+            return
+        if not client_key or len(client_key) > MAX_KEY_LENGTH:
+            await _respond(send, *_error(400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"))
+            return
+
+        body = await self._read_body(receive)
+        digest = hashlib.sha256(f"{scope['method']} {scope['path']}?".encode())
+        digest.update(scope.get("query_string", b""))
+        digest.update(b"\n")
+        digest.update(body)
+        fingerprint = digest.hexdigest()
+        key = f"{owner}:{client_key}"
+
+        stored = self.store.cache.get(key) or await run_in_threadpool(self.store.claim, key, fingerprint)
+        if stored is not None:
+            if stored.fingerprint != fingerprint:
+                await _respond(send, *_error(422, "Idempotency-Key was already used for a different request"))
+            elif stored.status is None:
+                await _respond(send, *_error(409, "A request with this Idempotency-Key is still in progress"))
+            else:
+                await _respond(send, stored.status, [*stored.headers, (b"idempotent-replayed", b"true")], stored.body)
+            return
+
+        delivered = False
+
+        async def replay_receive():
+            nonlocal delivered
+            if delivered:
+                return await receive()
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        messages = []
+
+        async def capture(message):
+            messages.append(message)
+
+        try:
+            await self.app(scope, replay_receive, capture)
+        except BaseException:
+            await run_in_threadpool(self.store.release, key)
+            raise
+        # held back until stored, so a retry that follows the response is always a replay
+        start = next((m for m in messages if m["type"] == "http.response.start"), None)
+        status = start["status"] if start else 500
+        if not (200 <= status < 300 or status in STORED_CLIENT_ERRORS):
+            await run_in_threadpool(self.store.release, key)
+        else:
+            content = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+            await run_in_threadpool(self.store.complete, key, fingerprint, status, list(start["headers"]), content)
+        for message in messages:
+            await send(message)
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
@@ -0,0 +1,119 @@
+"""Token-bucket rate limiting as plain ASGI middleware.
+
+Each request is matched to the first route group whose method and path fit,
+then charged one token from the bucket of ``group:identity``.  The identity
+is the user id from a valid bearer token (read from the principal cache,
+never the database) or else the client IP.  Responses carry the draft IETF
+``RateLimit-*`` headers; refusals are 429 with ``Retry-After``.
+"""
+import json
+import math
+import re
+from typing import NamedTuple
+
+from app.services.auth_service import principal_from_claims
+from app.utils.rate_limit import MemoryBackend, RateLimitBackend, SQLiteBackend, parse_rate
+
+
+class RouteGroup(NamedTuple):
+    name: str
+    methods: frozenset | None
+    pattern: re.Pattern
+    rate: float
+    burst: int
+    # False: always key by IP, e.g. for login where there is no user yet
+    by_user: bool
+    policy: bytes
+
+
+def route_group(name: str, methods, pattern: str, limit: str, by_user: bool = True) -> RouteGroup | None:
+    parsed = parse_rate(limit)
+    if parsed is None:
+        return None
+    rate, burst = parsed
+    policy = f"{burst};w={round(burst / rate)}".encode()
+    return RouteGroup(name, frozenset(methods) if methods else None, re.compile(pattern), rate, burst, by_user, policy)
+
+
+def default_groups(settings) -> list[RouteGroup]:
+    groups = [
+        route_group("auth", {"POST"}, r"^/api/auth/(login|register)$", settings.rate_limit_auth, by_user=False),
+        route_group(
+            "purchase",
+            {"POST"},
+            r"^/api/(sweets/(\d+/(purchase|reserve)|checkout)|reservations/checkout)$",
+            settings.rate_limit_purchase,
+        ),
+        route_group("default", None, r"", settings.rate_limit_default),
+    ]
+    return [group for group in groups if group is not None]
+
+
+TOO_MANY_REQUESTS = json.dumps({"detail": "Too many requests"}).encode()
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, groups: list[RouteGroup], backend: RateLimitBackend, trust_forwarded: bool = False):
+        self.app = app
+        self.groups = groups
+        self.backend = backend
+        self.trust_forwarded = trust_forwarded
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        group = self._match(scope["method"], scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.backend.acquire(f"{group.name}:{self._identity(scope, group.by_user)}", group.rate, group.burst)
+        headers = [
+            (b"ratelimit-limit", str(group.burst).encode()),
+            (b"ratelimit-remaining", str(decision.remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(decision.reset_after)).encode()),
+            (b"ratelimit-policy", group.policy),
+        ]
+        if not decision.allowed:
+            headers += [
+                (b"retry-after", str(math.ceil(decision.retry_after)).encode()),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(TOO_MANY_REQUESTS)).encode()),
+            ]
+            await send({"type": "http.response.start", "status": 429, "headers": headers})
+            await send({"type": "http.response.body", "body": TOO_MANY_REQUESTS})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _match(self, method: str, path: str) -> RouteGroup | None:
+        for group in self.groups:
+            if (group.methods is None or method in group.methods) and group.pattern.match(path):
+                return group
+        return None
+
+    def _identity(self, scope, by_user: bool) -> str:
+        forwarded = None
+        for name, value in scope["headers"]:
+            if by_user and name == b"authorization" and value[:7].lower() == b"bearer ":
+                principal, _ = principal_from_claims(value[7:].decode("latin-1"))
+                if principal is not None:
+                    return f"user:{principal.id}"
+            elif name == b"x-forwarded-for" and self.trust_forwarded:
+                forwarded = value.decode("latin-1").split(",")[0].strip()
+        if forwarded:
+            return f"ip:{forwarded}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+
+def build_backend(settings) -> RateLimitBackend:
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteBackend(settings.rate_limit_sqlite_path)
+    return MemoryBackend()
@@ -0,0 +1,69 @@
+"""Request latency histograms and the optional slow-request log.
+
+Pure ASGI so it adds no task or body buffering of its own.  Latency is
+labelled with the matched route template (``/api/sweets/{sweet_id}``), not
+the raw path, so label cardinality stays bounded.  Event streams are left
+out: their duration is the client's session length, not a latency.
+"""
+import logging
+import time
+
+from app.core.timing import (
+    RequestTimings,
+    current_timings,
+    request_phase_seconds,
+    request_queries,
+    request_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TimingMiddleware:
+    def __init__(self, app, slow_request_ms: float = 0.0):
+        self.app = app
+        self.slow_request_seconds = slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        response = {"status": 500, "streaming": False}
+
+        async def send_and_watch(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type" and value.startswith(b"text/event-stream"):
+                        response["streaming"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_watch)
+        finally:
+            current_timings.reset(token)
+            if not response["streaming"]:
+                self._record(scope, timings, response["status"], time.perf_counter() - timings.started)
+
+    def _record(self, scope, timings: RequestTimings, status: int, elapsed: float) -> None:
+        route = scope.get("route")
+        template = getattr(route, "path_format", None) or "unmatched"
+        request_seconds.labels(scope["method"], template, str(status)).observe(elapsed)
+        request_queries.labels(scope["method"], template).observe(timings.queries)
+        for name, seconds in timings.phases.items():
+            request_phase_seconds.labels(name).observe(seconds)
+
+        if self.slow_request_seconds and elapsed >= self.slow_request_seconds:
+            breakdown = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings.phases.items())
+            logger.warning(
+                "slow request %s %s -> %d in %.1fms (%d queries) %s",
+                scope["method"],
+                scope["path"],
+                status,
+                elapsed * 1000,
+                timings.queries,
+                breakdown,
+            )
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Date, Float, Integer, String
+from app.models.base import Base
+
+
+# Daily rollups maintained on every sale and restock, so analytics reads
+# touch one row per day in the window rather than the whole order history.
+
+class SweetDailySales(Base):
+    __tablename__ = "sweet_daily_sales"
+    day = Column(Date, primary_key=True)
+    sweet_id = Column(Integer, primary_key=True)
+    units_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    units_restocked = Column(Integer, nullable=False, default=0)
+
+
+class CategoryDailySales(Base):
+    __tablename__ = "category_daily_sales"
+    day = Column(Date, primary_key=True)
+    # "" for sweets without a category, so the key stays NOT NULL
+    category = Column(String, primary_key=True)
+    units_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    units_restocked = Column(Integer, nullable=False, default=0)
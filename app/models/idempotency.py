@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String, Text
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """A mutating request's ``Idempotency-Key`` and the response it got.
+
+    The row is claimed before the request runs and filled in after, so
+    ``status`` is NULL while the first attempt is still in flight.  That
+    claim is a lease: once ``locked_until`` passes with no response stored
+    (the worker died mid-request), a retry takes the key over.
+    """
+
+    __tablename__ = "idempotency_keys"
+    # "<user email>:<client key>"; keys are per user
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status = Column(Integer, nullable=True)
+    headers = Column(Text, nullable=True)  # JSON [[name, value], ...]
+    body = Column(LargeBinary, nullable=True)
+    # the sweeper walks this index from the oldest expiry
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
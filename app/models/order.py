@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+
+class Order(Base):
+    """One purchase or checkout; rows are only ever inserted."""
+
+    __tablename__ = "orders"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    total = Column(Float, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # "my orders" pages walk (user_id, created_at); the admin view walks created_at
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+    )
+
+
+class OrderLine(Base):
+    __tablename__ = "order_lines"
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    # name and price are copied at purchase time so the ledger survives catalog edits
+    sweet_id = Column(Integer, ForeignKey("sweets.id", ondelete="SET NULL"), nullable=True)
+    name = Column(String, nullable=False)
+    category = Column(String, nullable=True)
+    unit_price = Column(Float, nullable=False)
+    quantity = Column(Integer, nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+
+class Reservation(Base):
+    """A live hold on stock, already taken out of ``Sweet.quantity``.
+
+    Rows exist only while the hold does: checkout turns them into an order,
+    release and expiry put the units back, and all three delete the row.
+    """
+
+    __tablename__ = "reservations"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # deleting a sweet discards its holds, and the units they took go with it
+    sweet_id = Column(Integer, ForeignKey("sweets.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # the sweeper walks this index from the oldest expiry
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    # rows are deleted constantly; never hand a stale id to a new hold
+    __table_args__ = {"sqlite_autoincrement": True}
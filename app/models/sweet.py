@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
 from sqlalchemy.sql import func
 from app.models.base import Base
 
@@ -11,4 +11,13 @@ class Sweet(Base):
     description = Column(String, nullable=True)
     price = Column(Float, nullable=False)
     quantity = Column(Integer, default=0)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # keyset pagination walks the catalog in (created_at, id) order
+        Index("ix_sweets_created_at_id", "created_at", "id"),
+        # low-stock alerts scan the cheap end of this index only
+        Index("ix_sweets_quantity", "quantity"),
+        # SQLite would otherwise hand a deleted sweet's id, and its order history, to the next one
+        {"sqlite_autoincrement": True},
+    )
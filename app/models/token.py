@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, String
+from app.models.base import Base
+
+
+class RevokedToken(Base):
+    """A revoked token id: an access or refresh token's ``jti``, or a whole
+    refresh-token family.  Rows are kept until the token would have expired
+    anyway; every worker mirrors them in memory."""
+
+    __tablename__ = "revoked_tokens"
+    jti = Column(String, primary_key=True)
+    # the sweeper deletes from the oldest expiry
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    # workers pick up each other's revocations by polling past their last sync
+    revoked_at = Column(DateTime(timezone=True), nullable=False, index=True)
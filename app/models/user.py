@@ -10,4 +10,6 @@ class User(Base):
     full_name = Column(String, nullable=True)
     password_hash = Column(String, nullable=False)
     role = Column(String, default="user", nullable=False)
+    # tokens issued before this carry a stale role claim (see auth_service)
+    role_changed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.schemas.analytics import AnalyticsSummary, BestSeller, CategoryRevenue, LowStockItem
+from app.services.analytics_service import AnalyticsService
+from app.services.auth_service import AuthService
+
+router = APIRouter(dependencies=[Depends(AuthService.get_current_admin_user)])
+
+DAYS = Query(default=30, ge=1, le=366, description="Window size in days, ending today (UTC)")
+
+
+@router.get("/", response_model=AnalyticsSummary)
+def summary(days: int = DAYS, db: Session = Depends(get_db)):
+    svc = AnalyticsService(db)
+    return AnalyticsSummary(
+        days=days,
+        best_sellers=svc.best_sellers(days=days),
+        revenue_by_category=svc.revenue_by_category(days=days),
+        low_stock=svc.low_stock(),
+    )
+
+
+@router.get("/best-sellers", response_model=list[BestSeller])
+def best_sellers(days: int = DAYS, limit: int = Query(default=10, ge=1, le=100), db: Session = Depends(get_db)):
+    return AnalyticsService(db).best_sellers(days=days, limit=limit)
+
+
+@router.get("/revenue-by-category", response_model=list[CategoryRevenue])
+def revenue_by_category(days: int = DAYS, db: Session = Depends(get_db)):
+    return AnalyticsService(db).revenue_by_category(days=days)
+
+
+@router.get("/low-stock", response_model=list[LowStockItem])
+def low_stock(
+    threshold: int = Query(default=5, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    return AnalyticsService(db).low_stock(threshold=threshold, limit=limit)
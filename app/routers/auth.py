@@ -1,20 +1,56 @@
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
-from app.services.auth_service import AuthService
+from app.schemas.auth import (
+    LoginRequest,
+    LogoutRequest,
+    RefreshRequest,
+    RegisterRequest,
+    RoleUpdate,
+    TokenResponse,
+    UserRead,
+)
+from app.services.auth_service import AuthService, oauth2_scheme
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=TokenResponse, response_model_exclude_none=True)
-def register(payload: RegisterRequest = Body(...), db: Session = Depends(get_db)):
+async def register(payload: RegisterRequest = Body(...), db: Session = Depends(get_db)):
     svc = AuthService(db)
-    svc.register(payload.email, payload.password, payload.full_name)
-    return svc.authenticate(payload.email, payload.password)
+    await svc.register(payload.email, payload.password, payload.full_name)
+    return await svc.authenticate(payload.email, payload.password)
 
 
 @router.post("/login", response_model=TokenResponse, response_model_exclude_none=True)
-def login(payload: LoginRequest = Body(...), db: Session = Depends(get_db)):
+async def login(payload: LoginRequest = Body(...), db: Session = Depends(get_db)):
     svc = AuthService(db)
-    return svc.authenticate(payload.email, payload.password)
+    return await svc.authenticate(payload.email, payload.password)
+
+
+@router.post("/refresh", response_model=TokenResponse, response_model_exclude_none=True)
+def refresh(payload: RefreshRequest = Body(...), db: Session = Depends(get_db)):
+    svc = AuthService(db)
+    return svc.refresh(payload.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    payload: LogoutRequest | None = Body(default=None),
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+    current_user=Depends(AuthService.get_current_user),
+):
+    svc = AuthService(db)
+    svc.logout(token, current_user, payload.refresh_token if payload else None)
+
+
+@router.put("/users/{user_id}/role", response_model=UserRead)
+def set_user_role(
+    user_id: int,
+    payload: RoleUpdate = Body(...),
+    db: Session = Depends(get_db),
+    current_admin=Depends(AuthService.get_current_admin_user),
+):
+    svc = AuthService(db)
+    return svc.set_role(user_id, payload.role)
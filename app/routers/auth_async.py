@@ -0,0 +1,41 @@
+"""Async twins of the routes in ``auth.py``, mounted ahead of them when
+``db_async`` is on."""
+from fastapi import APIRouter, Body, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, RegisterRequest, TokenResponse
+from app.services.async_auth_service import AsyncAuthService
+from app.services.auth_service import oauth2_scheme
+
+router = APIRouter()
+
+
+@router.post("/register", response_model=TokenResponse, response_model_exclude_none=True)
+async def register_async(payload: RegisterRequest = Body(...), db: AsyncSession = Depends(get_async_db)):
+    svc = AsyncAuthService(db)
+    await svc.register(payload.email, payload.password, payload.full_name)
+    return await svc.authenticate(payload.email, payload.password)
+
+
+@router.post("/login", response_model=TokenResponse, response_model_exclude_none=True)
+async def login_async(payload: LoginRequest = Body(...), db: AsyncSession = Depends(get_async_db)):
+    svc = AsyncAuthService(db)
+    return await svc.authenticate(payload.email, payload.password)
+
+
+@router.post("/refresh", response_model=TokenResponse, response_model_exclude_none=True)
+async def refresh_async(payload: RefreshRequest = Body(...), db: AsyncSession = Depends(get_async_db)):
+    svc = AsyncAuthService(db)
+    return await svc.refresh(payload.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_async(
+    payload: LogoutRequest | None = Body(default=None),
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(AsyncAuthService.get_current_user),
+):
+    svc = AsyncAuthService(db)
+    await svc.logout(token, current_user, payload.refresh_token if payload else None)
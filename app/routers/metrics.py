@@ -0,0 +1,65 @@
+import os
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import get_settings
+from app.core.database import engine, get_async_engine
+from app.core.pool import pool_snapshot
+from app.services.catalog_cache import catalog_cache
+from app.services.invalidation import invalidation_bus
+from app.services.stock_events import stock_broker
+from app.utils.metrics import gauge_lines, registry
+
+router = APIRouter()
+
+settings = get_settings()
+
+# Starlette appends "; charset=utf-8" to text/* types
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def resident_memory_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def snapshot() -> dict:
+    pools = {"sync": pool_snapshot(engine.pool)}
+    if settings.db_async:
+        pools["async"] = pool_snapshot(get_async_engine().pool)
+    return {
+        "pools": pools,
+        "catalog_cache": catalog_cache.stats(),
+        "stock_stream": stock_broker.stats(),
+        "invalidation": invalidation_bus.stats(),
+        "process": {"resident_memory_bytes": resident_memory_bytes()},
+    }
+
+
+def snapshot_lines(state: dict) -> list[str]:
+    """The JSON snapshot's numeric fields as gauges, one family per field."""
+    lines = []
+    pool_fields = sorted({key for pool in state["pools"].values() for key, value in pool.items() if key != "pool"})
+    for field in pool_fields:
+        samples = [({"pool": name}, pool.get(field)) for name, pool in state["pools"].items()]
+        lines += gauge_lines(f"sweetshop_db_pool_{field}", f"Connection pool {field.replace('_', ' ')}.", samples)
+    for section in ("catalog_cache", "stock_stream", "invalidation", "process"):
+        for field, value in state[section].items():
+            lines += gauge_lines(f"sweetshop_{section}_{field}", f"{section.replace('_', ' ')} {field.replace('_', ' ')}.", [({}, value)])
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition: request/phase/query histograms plus gauges."""
+    lines = registry.render() + snapshot_lines(snapshot())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/metrics/json")
+def metrics_json():
+    return snapshot()
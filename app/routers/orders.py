@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.schemas.order import OrderRead
+from app.services.auth_service import AuthService
+from app.services.order_service import OrderService
+
+router = APIRouter()
+
+@router.get("/", response_model=list[OrderRead])
+def list_orders(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=500, description="Page size"),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
+    user_id: int | None = Query(default=None, description="Admins only: orders of one user"),
+    db: Session = Depends(get_db),
+    current_user=Depends(AuthService.get_current_user),
+):
+    svc = OrderService(db)
+    orders, next_cursor = svc.list(current_user, limit=limit, cursor=cursor, user_id=user_id)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return orders
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.schemas.order import OrderRead
+from app.schemas.reservation import ReservationCheckout, ReservationRead
+from app.services.auth_service import AuthService
+from app.services.reservation_service import ReservationService
+
+router = APIRouter()
+
+@router.get("/", response_model=list[ReservationRead])
+def list_reservations(db: Session = Depends(get_db), current_user=Depends(AuthService.get_current_user)):
+    return ReservationService(db).live_holds(current_user.id)
+
+
+@router.post("/checkout", response_model=OrderRead)
+def checkout_reservations(
+    payload: ReservationCheckout,
+    db: Session = Depends(get_db),
+    current_user=Depends(AuthService.get_current_user),
+):
+    svc = ReservationService(db)
+    return svc.checkout(current_user.id, payload.reservation_ids)
+
+
+@router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
+def release_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(AuthService.get_current_user),
+):
+    svc = ReservationService(db)
+    svc.release(current_user.id, reservation_id)
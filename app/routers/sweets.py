@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.schemas.sweet import SweetCreate, SweetRead, SweetRestock, SweetUpdate
+from app.schemas.sweet import CheckoutRequest, SweetCreate, SweetRead, SweetRestock, SweetUpdate
+from app.schemas.reservation import ReservationRead, ReserveRequest
 from app.services.auth_service import AuthService
+from app.services.catalog_cache import catalog_cache
+from app.services.reservation_service import ReservationService
+from app.services.sweet_json import json_response, render_one, render_rows
 from app.services.sweet_service import SweetService
 
 router = APIRouter()
 
+# Sweet-returning routes send pre-serialized JSON (see sweet_json); their
+# response_model only documents the shape.
 @router.post("/", response_model=SweetRead)
 def create_sweet(
     payload: SweetCreate,
@@ -15,27 +21,53 @@ def create_sweet(
     current_admin=Depends(AuthService.get_current_admin_user),
 ):
     svc = SweetService(db)
-    return svc.create(payload)
+    return json_response(render_one(svc.create(payload)))
 
+# Read routes answer from the versioned catalog cache.
 @router.get("/", response_model=list[SweetRead])
-def list_sweets(db: Session = Depends(get_db)):
-    svc = SweetService(db)
-    return svc.list()
+def list_sweets(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=1000, description="Page size"),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
+    fields: str | None = Query(default=None, description="Comma-separated columns to return, e.g. id,name,price"),
+    db: Session = Depends(get_db),
+):
+    requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    def build():
+        svc = SweetService(db)
+        rows, next_cursor = svc.list(limit=limit, cursor=cursor, fields=requested)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return render_rows(rows, requested), headers
+
+    key = ("list", limit, cursor, tuple(requested or ()))
+    return catalog_cache.respond(request, key, build)
 
 
 @router.get("/search", response_model=list[SweetRead])
 def search_sweets(
+    request: Request,
+    q: str | None = Query(default=None, description="Words to match in name, category or description"),
     name: str | None = Query(default=None, description="Filter by sweet name"),
     category: str | None = Query(default=None, description="Filter by category"),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
     db: Session = Depends(get_db),
 ):
-    svc = SweetService(db)
-    return svc.search(name=name, category=category)
+    def build():
+        svc = SweetService(db)
+        return render_rows(svc.search(q=q, name=name, category=category, limit=limit, offset=offset)), {}
+
+    key = ("search", q, name, category, limit, offset)
+    return catalog_cache.respond(request, key, build)
 
 @router.get("/{sweet_id}", response_model=SweetRead)
-def get_sweet(sweet_id: int, db: Session = Depends(get_db)):
-    svc = SweetService(db)
-    return svc.get(sweet_id)
+def get_sweet(request: Request, sweet_id: int, db: Session = Depends(get_db)):
+    def build():
+        svc = SweetService(db)
+        return render_one(svc.get_row(sweet_id)), {}
+
+    return catalog_cache.respond(request, ("get", sweet_id), build)
 
 
 @router.put("/{sweet_id}", response_model=SweetRead)
@@ -46,7 +78,7 @@ def update_sweet(
     current_admin=Depends(AuthService.get_current_admin_user),
 ):
     svc = SweetService(db)
-    return svc.update(sweet_id, payload)
+    return json_response(render_one(svc.update(sweet_id, payload)))
 
 
 @router.delete("/{sweet_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -66,7 +98,28 @@ def purchase_sweet(
     current_user=Depends(AuthService.get_current_user),
 ):
     svc = SweetService(db)
-    return svc.purchase(sweet_id)
+    return json_response(render_one(svc.purchase(sweet_id, user_id=current_user.id)))
+
+
+@router.post("/checkout", response_model=list[SweetRead])
+def checkout(
+    payload: CheckoutRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(AuthService.get_current_user),
+):
+    svc = SweetService(db)
+    return json_response(render_rows(svc.checkout(payload.items, user_id=current_user.id)))
+
+
+@router.post("/{sweet_id}/reserve", response_model=ReservationRead, status_code=status.HTTP_201_CREATED)
+def reserve_sweet(
+    sweet_id: int,
+    payload: ReserveRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(AuthService.get_current_user),
+):
+    svc = ReservationService(db)
+    return svc.reserve(current_user.id, sweet_id, payload.quantity)
 
 
 @router.post("/{sweet_id}/restock", response_model=SweetRead)
@@ -77,5 +130,5 @@ def restock_sweet(
     current_admin=Depends(AuthService.get_current_admin_user),
 ):
     svc = SweetService(db)
-    return svc.restock(sweet_id, payload.quantity)
+    return json_response(render_one(svc.restock(sweet_id, payload.quantity)))
 
@@ -0,0 +1,120 @@
+"""Async twins of the core routes in ``sweets.py``, mounted ahead of them when
+``db_async`` is on.  Routes without a twin keep being served by ``sweets.py``.
+"""
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.schemas.sweet import CheckoutRequest, SweetCreate, SweetRead, SweetRestock, SweetUpdate
+from app.services.async_auth_service import AsyncAuthService
+from app.services.async_sweet_service import AsyncSweetService
+from app.services.catalog_cache import catalog_cache
+from app.services.sweet_json import json_response, render_one, render_rows
+
+router = APIRouter()
+
+@router.post("/", response_model=SweetRead)
+async def create_sweet_async(
+    payload: SweetCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin=Depends(AsyncAuthService.get_current_admin_user),
+):
+    svc = AsyncSweetService(db)
+    return json_response(render_one(await svc.create(payload)))
+
+@router.get("/", response_model=list[SweetRead])
+async def list_sweets_async(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=1000, description="Page size"),
+    cursor: str | None = Query(default=None, description="Value of X-Next-Cursor from the previous page"),
+    fields: str | None = Query(default=None, description="Comma-separated columns to return, e.g. id,name,price"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    async def build():
+        svc = AsyncSweetService(db)
+        rows, next_cursor = await svc.list(limit=limit, cursor=cursor, fields=requested)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return render_rows(rows, requested), headers
+
+    key = ("list", limit, cursor, tuple(requested or ()))
+    return await catalog_cache.respond_async(request, key, build)
+
+
+@router.get("/search", response_model=list[SweetRead])
+async def search_sweets_async(
+    request: Request,
+    q: str | None = Query(default=None, description="Words to match in name, category or description"),
+    name: str | None = Query(default=None, description="Filter by sweet name"),
+    category: str | None = Query(default=None, description="Filter by category"),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    async def build():
+        svc = AsyncSweetService(db)
+        return render_rows(await svc.search(q=q, name=name, category=category, limit=limit, offset=offset)), {}
+
+    key = ("search", q, name, category, limit, offset)
+    return await catalog_cache.respond_async(request, key, build)
+
+@router.get("/{sweet_id}", response_model=SweetRead)
+async def get_sweet_async(request: Request, sweet_id: int, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        svc = AsyncSweetService(db)
+        return render_one(await svc.get_row(sweet_id)), {}
+
+    return await catalog_cache.respond_async(request, ("get", sweet_id), build)
+
+
+@router.put("/{sweet_id}", response_model=SweetRead)
+async def update_sweet_async(
+    sweet_id: int,
+    payload: SweetUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin=Depends(AsyncAuthService.get_current_admin_user),
+):
+    svc = AsyncSweetService(db)
+    return json_response(render_one(await svc.update(sweet_id, payload)))
+
+
+@router.delete("/{sweet_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_sweet_async(
+    sweet_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin=Depends(AsyncAuthService.get_current_admin_user),
+):
+    svc = AsyncSweetService(db)
+    return await svc.delete(sweet_id)
+
+
+@router.post("/{sweet_id}/purchase", response_model=SweetRead)
+async def purchase_sweet_async(
+    sweet_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(AsyncAuthService.get_current_user),
+):
+    svc = AsyncSweetService(db)
+    return json_response(render_one(await svc.purchase(sweet_id, user_id=current_user.id)))
+
+
+@router.post("/checkout", response_model=list[SweetRead])
+async def checkout_async(
+    payload: CheckoutRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(AsyncAuthService.get_current_user),
+):
+    svc = AsyncSweetService(db)
+    return json_response(render_rows(await svc.checkout(payload.items, user_id=current_user.id)))
+
+
+@router.post("/{sweet_id}/restock", response_model=SweetRead)
+async def restock_sweet_async(
+    sweet_id: int,
+    payload: SweetRestock,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin=Depends(AsyncAuthService.get_current_admin_user),
+):
+    svc = AsyncSweetService(db)
+    return json_response(render_one(await svc.restock(sweet_id, payload.quantity)))
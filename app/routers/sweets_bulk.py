@@ -0,0 +1,103 @@
+"""Bulk catalog import and export.
+
+Mounted ahead of the other sweets routers so ``/export`` is not taken for a
+``/{sweet_id}``.
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, get_db
+from app.schemas.sweet import BulkImportReport, SweetImportRow
+from app.services.auth_service import AuthService
+from app.services.bulk_service import (
+    CHUNK_SIZE,
+    BulkService,
+    ImportReport,
+    database_message,
+    encode_csv,
+    encode_ndjson,
+    iter_lines,
+    iter_records,
+    resolve_format,
+    validation_message,
+)
+
+router = APIRouter()
+
+@router.post(
+    "/bulk",
+    response_model=BulkImportReport,
+    responses={
+        207: {"model": BulkImportReport, "description": "Stopped part-way; earlier chunks were imported"},
+        422: {"model": BulkImportReport, "description": "Stopped before anything was imported"},
+    },
+)
+async def import_sweets(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = Query(default=None, description="Defaults to the Content-Type"),
+    db: Session = Depends(get_db),
+    current_admin=Depends(AuthService.get_current_admin_user),
+):
+    fmt = resolve_format(format, request.headers.get("content-type"))
+    svc = BulkService(db)
+    report = ImportReport()
+    chunk: list[SweetImportRow] = []
+    chunk_start = 0
+
+    async def flush() -> None:
+        try:
+            report.accepted += await run_in_threadpool(svc.import_chunk, chunk)
+        except SQLAlchemyError as e:
+            report.abort(chunk_start, database_message(e))
+
+    async for line, record in iter_records(iter_lines(request.stream()), fmt):
+        if isinstance(record, str):
+            report.reject(line, record)
+            continue
+        try:
+            row = SweetImportRow.model_validate(record)
+        except ValidationError as e:
+            report.reject(line, validation_message(e))
+            continue
+        if not chunk:
+            chunk_start = line
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            await flush()
+            chunk = []
+            if report.failed:
+                break
+    if chunk and not report.failed:
+        await flush()
+    if report.accepted:
+        svc.finish_import()
+    if report.failed:
+        code = status.HTTP_207_MULTI_STATUS if report.accepted else status.HTTP_422_UNPROCESSABLE_ENTITY
+        return JSONResponse(report.result().model_dump(), status_code=code)
+    return report.result()
+
+
+@router.get("/export")
+def export_sweets(
+    format: Literal["csv", "ndjson"] = Query(default="csv"),
+    current_admin=Depends(AuthService.get_current_admin_user),
+):
+    def body():
+        # own session: the body is still streaming after the route returns
+        with SessionLocal() as db:
+            first = True
+            for rows in BulkService(db).export_rows():
+                yield encode_csv(rows, header=first) if format == "csv" else encode_ndjson(rows)
+                first = False
+            if first and format == "csv":
+                yield encode_csv([], header=True)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="sweets.{format}"'}
+    return StreamingResponse(body(), media_type=media_type, headers=headers)
@@ -0,0 +1,35 @@
+"""Live stock updates as server-sent events.
+
+Mounted ahead of the other sweets routers so ``/stream`` is not taken for a
+``/{sweet_id}``.
+"""
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.services.stock_events import BrokerFull, stock_broker
+
+router = APIRouter()
+
+settings = get_settings()
+
+
+@router.get("/stream")
+async def stream_sweets():
+    """``event: stock`` frames carry a list of ``{id, quantity, price}`` (or
+    ``{id, deleted}``) deltas; ``event: resync`` means refetch the catalog."""
+    try:
+        sub = stock_broker.subscribe()
+    except BrokerFull:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many live subscribers")
+
+    async def body():
+        try:
+            yield b"retry: 3000\n\n"
+            async for frame in sub.frames(settings.stream_heartbeat_seconds):
+                yield frame
+        finally:
+            stock_broker.unsubscribe(sub)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(body(), media_type="text/event-stream", headers=headers)
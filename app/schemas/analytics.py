@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class BestSeller(BaseModel):
+    sweet_id: int
+    name: str | None
+    units_sold: int
+    revenue: float
+
+
+class CategoryRevenue(BaseModel):
+    category: str | None
+    units_sold: int
+    revenue: float
+
+
+class LowStockItem(BaseModel):
+    id: int
+    name: str
+    category: str | None = None
+    quantity: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AnalyticsSummary(BaseModel):
+    days: int
+    best_sellers: list[BestSeller]
+    revenue_by_category: list[CategoryRevenue]
+    low_stock: list[LowStockItem]
@@ -1,4 +1,4 @@
-from typing import Optional, Annotated
+from typing import Optional, Annotated, Literal
 
 from pydantic import BaseModel, EmailStr, ConfigDict, constr, Field
 
@@ -23,11 +23,34 @@ class UserRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserPrincipal(BaseModel):
+    """The authenticated caller, as resolved from an access token."""
+
+    id: int
+    email: str
+    role: str
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class RoleUpdate(BaseModel):
+    role: Literal["user", "admin"]
+
+
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: str | None = None
     token_type: str = "bearer"
     user: UserRead
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = None
+
+
 class TokenData(BaseModel):
     email: Optional[str] = None
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class OrderLineRead(BaseModel):
+    sweet_id: int | None
+    name: str
+    unit_price: float
+    quantity: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrderRead(BaseModel):
+    id: int
+    user_id: int
+    total: float
+    created_at: datetime
+    lines: list[OrderLineRead]
@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, ConfigDict, conint, field_validator
+
+
+class ReserveRequest(BaseModel):
+    quantity: conint(gt=0) = 1
+
+
+class ReservationRead(BaseModel):
+    id: int
+    sweet_id: int
+    quantity: int
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("expires_at")
+    @classmethod
+    def _as_utc(cls, value: datetime) -> datetime:
+        # SQLite returns the stored UTC time naive; clients need the offset
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+class ReservationCheckout(BaseModel):
+    # omitted: every live hold of the caller
+    reservation_ids: list[int] | None = None
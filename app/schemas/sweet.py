@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, conint
+from pydantic import BaseModel, ConfigDict, conint, conlist
 
 
 class SweetCreate(BaseModel):
@@ -25,3 +25,30 @@ class SweetUpdate(BaseModel):
 
 class SweetRestock(BaseModel):
     quantity: conint(gt=0)
+
+
+class CheckoutLine(BaseModel):
+    sweet_id: int
+    quantity: conint(gt=0) = 1
+
+
+class CheckoutRequest(BaseModel):
+    items: conlist(CheckoutLine, min_length=1)
+
+
+class SweetImportRow(SweetCreate):
+    # rows carrying an id update that sweet in place; the rest are inserted
+    id: int | None = None
+
+
+class BulkRowError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkImportReport(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[BulkRowError]
+    # set when a chunk could not be written and the import stopped; ``line`` is its first row
+    failed: BulkRowError | None = None
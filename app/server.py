@@ -0,0 +1,77 @@
+"""Launcher for running the API with one or more uvicorn worker processes.
+
+    python -m app.server --workers 4 --port 8000
+
+Each worker keeps its own caches, so with more than one worker the
+invalidation bus must use a store that every worker shares.  Unless it is
+set explicitly, this launcher picks the SQLite one (``INVALIDATION_BUS=sqlite``)
+and refuses to start several workers on the ``local`` bus, because their
+caches would go stale.
+
+Rate-limit buckets stay per worker unless ``RATE_LIMIT_BACKEND=sqlite`` is
+set, so each client effectively gets ``--workers`` times its limits.  The
+SQLite store is opt-in because every limited request in every worker then
+takes the same file's write lock (``benchmarks/multi_worker.py`` measures
+the cost).
+
+Live stock streams never end by themselves, and uvicorn waits for in-flight
+responses before it runs the app's shutdown hook.  So the server started here
+ends the streams as soon as it is asked to exit.  Anything else still running
+after ``--timeout-graceful-shutdown`` seconds (``SHUTDOWN_GRACE_SECONDS``,
+default 5) is cancelled; plain ``uvicorn --timeout-graceful-shutdown`` gets
+that part too.
+"""
+import argparse
+import os
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+
+class Server(uvicorn.Server):
+    def handle_exit(self, sig, frame):
+        from app.services.stock_events import stock_broker
+
+        stock_broker.close()
+        super().handle_exit(sig, frame)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--proxy-headers", action="store_true")
+    parser.add_argument("--timeout-graceful-shutdown", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        # environment, not arguments: every worker reads its settings from it
+        os.environ.setdefault("INVALIDATION_BUS", "sqlite")
+
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if args.workers > 1 and settings.invalidation_bus == "local":
+        parser.error("INVALIDATION_BUS=local only reaches one process; use sqlite or redis with --workers > 1")
+    grace = args.timeout_graceful_shutdown if args.timeout_graceful_shutdown is not None else settings.shutdown_grace_seconds
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        proxy_headers=args.proxy_headers,
+        timeout_graceful_shutdown=grace,
+    )
+    server = Server(config)
+    if config.workers > 1:
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    main()
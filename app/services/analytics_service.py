@@ -0,0 +1,198 @@
+"""Sales and inventory analytics over incrementally maintained rollups.
+
+SweetService / AsyncSweetService add each sale and restock to the daily
+rollup tables in the same transaction as the stock change, so reads cost
+O(days in window), not O(order history).  ``AnalyticsService.rebuild``
+recomputes the sales counters from the orders ledger.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+from sqlalchemy import Date, cast, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.models.analytics import CategoryDailySales, SweetDailySales
+from app.models.order import Order, OrderLine
+from app.models.sweet import Sweet
+from app.schemas.analytics import BestSeller, CategoryRevenue, LowStockItem
+
+COUNTERS = ("units_sold", "revenue", "units_restocked")
+
+
+def today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+@lru_cache(maxsize=None)
+def rollup_upserts(dialect: str):
+    """Additive upserts for both rollup tables, or ``None`` if the dialect has no ON CONFLICT."""
+    insert_ = dialect_insert(dialect)
+    if insert_ is None:
+        return None
+
+    def upsert(model, keys):
+        table = model.__table__
+        stmt = insert_(table)
+        return stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={name: table.c[name] + stmt.excluded[name] for name in COUNTERS},
+        )
+
+    return upsert(SweetDailySales, ["day", "sweet_id"]), upsert(CategoryDailySales, ["day", "category"])
+
+
+def rollup_params(day: date, deltas) -> tuple[list[dict], list[dict]]:
+    """Per-sweet and per-category parameter rows from ``(sweet_id, category, sold, revenue, restocked)``.
+
+    A ``None`` sweet_id (an order line whose sweet was since deleted) only
+    counts towards its category.
+    """
+    by_sweet: dict = defaultdict(lambda: [0, 0.0, 0])
+    by_category: dict = defaultdict(lambda: [0, 0.0, 0])
+    for sweet_id, category, sold, revenue, restocked in deltas:
+        buckets = [by_category[category or ""]]
+        if sweet_id is not None:
+            buckets.append(by_sweet[sweet_id])
+        for bucket in buckets:
+            bucket[0] += sold
+            bucket[1] += revenue
+            bucket[2] += restocked
+    sweets = [
+        {"day": day, "sweet_id": sweet_id, "units_sold": s, "revenue": r, "units_restocked": k}
+        for sweet_id, (s, r, k) in by_sweet.items()
+    ]
+    categories = [
+        {"day": day, "category": category, "units_sold": s, "revenue": r, "units_restocked": k}
+        for category, (s, r, k) in by_category.items()
+    ]
+    return sweets, categories
+
+
+def rollup_writes(dialect: str, deltas) -> list[tuple]:
+    """Today's rollup upserts for ``deltas`` as ``(statement, params)`` pairs; none without ON CONFLICT."""
+    upserts = rollup_upserts(dialect)
+    if upserts is None:
+        return []
+    return [(stmt, params) for stmt, params in zip(upserts, rollup_params(today(), deltas)) if params]
+
+
+def sale_deltas(wanted: dict[int, int], rows: dict):
+    return [(sweet_id, rows[sweet_id].category, qty, rows[sweet_id].price * qty, 0) for sweet_id, qty in wanted.items()]
+
+
+def restock_deltas(row, qty: int):
+    return [(row.id, row.category, 0, 0.0, qty)]
+
+
+def _day_column(dialect: str):
+    # SQLite stores timestamps as text; CAST(... AS DATE) would yield a number there
+    return func.date(Order.created_at) if dialect == "sqlite" else cast(Order.created_at, Date)
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class AnalyticsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+
+    def best_sellers(self, days: int = 30, limit: int = 10) -> list[BestSeller]:
+        units = func.sum(SweetDailySales.units_sold)
+        # rank on the rollup alone; names are joined for the top ``limit`` only
+        top = (
+            select(SweetDailySales.sweet_id, units.label("units_sold"),
+                   func.sum(SweetDailySales.revenue).label("revenue"))
+            .where(SweetDailySales.day > today() - timedelta(days=days))
+            .group_by(SweetDailySales.sweet_id)
+            .having(units > 0)
+            .order_by(units.desc(), SweetDailySales.sweet_id)
+            .limit(limit)
+            .subquery()
+        )
+        rows = self.db.execute(
+            select(top.c.sweet_id, Sweet.name, top.c.units_sold, top.c.revenue)
+            .outerjoin(Sweet, Sweet.id == top.c.sweet_id)
+            .order_by(top.c.units_sold.desc(), top.c.sweet_id)
+        ).all()
+        return [BestSeller(**row._mapping) for row in rows]
+
+
+    def revenue_by_category(self, days: int = 30) -> list[CategoryRevenue]:
+        revenue = func.sum(CategoryDailySales.revenue)
+        rows = self.db.execute(
+            select(CategoryDailySales.category, func.sum(CategoryDailySales.units_sold).label("units_sold"),
+                   revenue.label("revenue"))
+            .where(CategoryDailySales.day > today() - timedelta(days=days))
+            .group_by(CategoryDailySales.category)
+            .order_by(revenue.desc(), CategoryDailySales.category)
+        ).all()
+        return [
+            CategoryRevenue(category=row.category or None, units_sold=row.units_sold, revenue=round(row.revenue, 2))
+            for row in rows
+        ]
+
+
+    def low_stock(self, threshold: int = 5, limit: int = 50) -> list[LowStockItem]:
+        rows = self.db.execute(
+            select(Sweet.id, Sweet.name, Sweet.category, Sweet.quantity)
+            .where(Sweet.quantity <= threshold)
+            .order_by(Sweet.quantity, Sweet.id)
+            .limit(limit)
+        ).all()
+        return [LowStockItem.model_validate(row) for row in rows]
+
+
+    def rebuild(self, batch_size: int = 10_000) -> int:
+        """Recompute the sales counters from the orders ledger; returns lines read.
+
+        Runs in one transaction so readers never see a half-built rollup.
+        Lines are streamed in id order ``batch_size`` at a time and each
+        batch is folded in with the same additive upsert the write path
+        uses.  Categories come from the category each line was sold under,
+        so lines whose sweet has since been deleted still count there;
+        lines recorded before that column existed take their sweet's.
+        Restock counters have no history to rebuild from and are kept.
+        """
+        dialect = self.db.get_bind().dialect.name
+        upserts = rollup_upserts(dialect)
+        if upserts is None:
+            raise RuntimeError(f"Rollups need INSERT ... ON CONFLICT, which {dialect} lacks")
+        day = _day_column(dialect)
+        for model in (SweetDailySales, CategoryDailySales):
+            self.db.execute(update(model.__table__).values(units_sold=0, revenue=0.0))
+        # lines from before categories were recorded, on databases migrated without the backfill
+        self.db.execute(
+            update(OrderLine.__table__)
+            .where(OrderLine.category.is_(None), OrderLine.sweet_id.is_not(None))
+            .values(category=select(Sweet.category).where(Sweet.id == OrderLine.sweet_id).scalar_subquery())
+        )
+
+        seen, last_id = 0, 0
+        while True:
+            lines = self.db.execute(
+                select(OrderLine.id, day.label("day"), OrderLine.sweet_id, OrderLine.category,
+                       OrderLine.quantity, OrderLine.unit_price)
+                .join(Order, Order.id == OrderLine.order_id)
+                .where(OrderLine.id > last_id)
+                .order_by(OrderLine.id)
+                .limit(batch_size)
+            ).all()
+            if not lines:
+                break
+            by_day = defaultdict(list)
+            for line in lines:
+                by_day[_as_date(line.day)].append(
+                    (line.sweet_id, line.category, line.quantity, line.unit_price * line.quantity, 0)
+                )
+            for batch_day, deltas in by_day.items():
+                for stmt, params in zip(upserts, rollup_params(batch_day, deltas)):
+                    if params:
+                        self.db.execute(stmt, params)
+            seen += len(lines)
+            last_id = lines[-1].id
+        self.db.commit()
+        return seen
@@ -0,0 +1,119 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.timing import phase
+from app.models.user import User
+from app.schemas.auth import TokenResponse, UserPrincipal
+from app.services.auth_service import (
+    credentials_error,
+    expires_at,
+    family_expires_at,
+    hash_password_async,
+    logout_revocations,
+    oauth2_scheme,
+    principal_from_claims,
+    refresh_claims,
+    remember_principal,
+    token_response,
+    verify_password_async,
+)
+from app.services.token_revocation import announce, revoke_statement
+
+
+class AsyncAuthService:
+    """AuthService over an AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def register(self, email: str, password: str, full_name: str | None):
+    # ⚠️ TEMPORARY BYPASS for debugging / UI testing (mirrors AuthService.register)
+        fake_hashed_password = await hash_password_async("hardcoded123")
+
+        user = User(
+            email=email,
+            password_hash=fake_hashed_password,
+            full_name=full_name,
+            role="user",
+        )
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def authenticate(self, email: str, password: str) -> TokenResponse:
+        user = await self._find_by_email(email)
+        # hand the connection back before the slow bcrypt step
+        await self.db.close()
+        if not user or not await verify_password_async(password, user.password_hash):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password",
+            )
+
+        return token_response(user)
+
+    async def refresh(self, refresh_token: str) -> TokenResponse:
+        payload = refresh_claims(refresh_token)
+        dialect = self.db.get_bind().dialect.name
+        if not (await self.db.execute(revoke_statement(dialect, payload["jti"], expires_at(payload)))).rowcount:
+            family_expiry = family_expires_at()
+            await self.db.execute(revoke_statement(dialect, payload["fam"], family_expiry))
+            await self.db.commit()
+            announce([(payload["fam"], family_expiry)])
+            raise credentials_error()
+        user = await self.db.get(User, payload["uid"])
+        if user is None:
+            await self.db.rollback()
+            raise credentials_error()
+        response = token_response(user, family=payload["fam"])
+        await self.db.commit()
+        announce([(payload["jti"], expires_at(payload))])
+        return response
+
+    async def logout(self, access_token: str, principal: UserPrincipal, refresh_token: str | None = None) -> None:
+        revoked = logout_revocations(access_token, principal, refresh_token)
+        dialect = self.db.get_bind().dialect.name
+        for token_id, expiry in revoked:
+            await self.db.execute(revoke_statement(dialect, token_id, expiry))
+        await self.db.commit()
+        announce(revoked)
+
+    async def _find_by_email(self, email: str) -> User | None:
+        return (await self.db.scalars(select(User).where(User.email == email))).first()
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserPrincipal:
+    principal, payload = principal_from_claims(token)
+    if principal is None and payload is not None:
+        with phase("user_lookup"):
+            user = (await db.scalars(select(User).where(User.email == payload["sub"]))).first()
+        if user:
+            principal = UserPrincipal.model_validate(user)
+            remember_principal(token, principal, payload)
+    if principal is None:
+        raise credentials_error()
+    return principal
+
+
+async def get_current_admin_user(
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> UserPrincipal:
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
+
+
+# Defined at module level because FastAPI cannot see through a staticmethod
+# wrapper when deciding whether a nested dependency is async; exposed on the
+# class to mirror AuthService.get_current_user / get_current_admin_user.
+AsyncAuthService.get_current_user = staticmethod(get_current_user)
+AsyncAuthService.get_current_admin_user = staticmethod(get_current_admin_user)
@@ -0,0 +1,147 @@
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sweet import Sweet
+from app.services.order_service import INSERT_ORDER, order_params
+from app.services.sweet_service import (
+    after_commit,
+    after_stock_commit,
+    get_statement,
+    list_statement,
+    merge_lines,
+    restock_op,
+    restock_statement,
+    restock_writes,
+    sale_writes,
+    search_statement,
+    short_stock_error,
+    split_page,
+    take_stock_op,
+    take_stock_statement,
+)
+from app.services.write_batcher import write_batcher
+
+
+class AsyncSweetService:
+    """SweetService over an AsyncSession; runs the same statements."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+
+    async def create(self, payload):
+        sweet = Sweet(**payload.dict())
+        self.db.add(sweet)
+        await self.db.commit()
+        await self.db.refresh(sweet)
+        after_commit(changed=[sweet])
+        return sweet
+
+
+    async def list(self, limit: int = 100, cursor: str | None = None, fields: list[str] | None = None):
+        rows = (await self.db.execute(list_statement(limit, cursor, fields))).all()
+        return split_page(rows, limit)
+
+
+    async def search(
+        self,
+        q: str | None = None,
+        name: str | None = None,
+        category: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ):
+        dialect = self.db.bind.dialect.name
+        return (await self.db.execute(search_statement(dialect, q, name, category, limit, offset))).all()
+
+
+    async def get(self, sweet_id: int):
+        sweet = await self.db.get(Sweet, sweet_id)
+        if not sweet:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweet not found")
+        return sweet
+
+
+    async def get_row(self, sweet_id: int):
+        row = (await self.db.execute(get_statement(sweet_id))).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweet not found")
+        return row
+
+
+    async def update(self, sweet_id: int, payload):
+        sweet = await self.get(sweet_id)
+        for k, v in payload.dict(exclude_unset=True).items():
+            setattr(sweet, k, v)
+        await self.db.commit()
+        await self.db.refresh(sweet)
+        after_commit(changed=[sweet])
+        return sweet
+
+
+    async def delete(self, sweet_id: int):
+        sweet = await self.get(sweet_id)
+        await self.db.delete(sweet)
+        await self.db.commit()
+        after_commit(deleted=[sweet_id])
+
+
+    async def purchase(self, sweet_id: int, qty: int = 1, user_id: int | None = None):
+        return (await self._take_stock({sweet_id: qty}, user_id))[0]
+
+
+    async def checkout(self, lines, user_id: int | None = None):
+        return await self._take_stock(merge_lines(lines), user_id)
+
+
+    async def _take_stock(self, wanted: dict[int, int], user_id: int | None = None):
+        if write_batcher.running:
+            return await write_batcher.run_async(take_stock_op(wanted, user_id))
+        try:
+            rows = await self.stage_take_stock(wanted, user_id)
+        except HTTPException:
+            await self.db.rollback()
+            raise
+        await self.db.commit()
+        after_stock_commit(rows)
+        return rows
+
+
+    async def stage_take_stock(self, wanted: dict[int, int], user_id: int | None = None):
+        rows = {row.id: row for row in await self.db.execute(take_stock_statement(wanted))}
+        if len(rows) != len(wanted):
+            existing = await self.db.scalars(select(Sweet.id).where(Sweet.id.in_(wanted)))
+            raise short_stock_error(wanted, rows, existing)
+        if user_id is not None:
+            await self.record_sale(user_id, wanted, rows)
+        return [rows[sweet_id] for sweet_id in wanted]
+
+
+    async def restock(self, sweet_id: int, qty: int):
+        if write_batcher.running:
+            return await write_batcher.run_async(restock_op(sweet_id, qty))
+        try:
+            row = await self.stage_restock(sweet_id, qty)
+        except HTTPException:
+            await self.db.rollback()
+            raise
+        await self.db.commit()
+        after_stock_commit([row])
+        return row
+
+
+    async def stage_restock(self, sweet_id: int, qty: int):
+        row = (await self.db.execute(restock_statement(sweet_id, qty))).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweet not found")
+        for stmt, params in restock_writes(self.db.bind.dialect.name, row, qty):
+            await self.db.execute(stmt, params)
+        return row
+
+
+    async def record_sale(self, user_id: int, wanted: dict[int, int], rows: dict) -> int:
+        order_id = (await self.db.execute(INSERT_ORDER, order_params(user_id, wanted, rows))).scalar_one()
+        for stmt, params in sale_writes(self.db.bind.dialect.name, order_id, wanted, rows):
+            await self.db.execute(stmt, params)
+        return order_id
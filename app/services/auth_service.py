@@ -1,24 +1,210 @@
+import time
+from datetime import datetime, timedelta, timezone
+
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from app.core.config import get_settings
 from app.core.database import get_db
+from app.core.timing import phase
 from app.models.user import User
-from app.schemas.auth import TokenData, TokenResponse
-from app.utils.security import create_access_token, decode_token, hash_password, verify_password
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.schemas.auth import TokenData, TokenResponse, UserPrincipal
+from app.services.invalidation import invalidation_bus
+from app.services.token_revocation import announce, revocations, revoke_statement
+from app.utils.cache import TTLCache
+from app.utils.security import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_TYPE,
+    HashingPoolFull,
+    bcrypt_pool,
+    create_access_token,
+    create_refresh_token,
+    decode_refresh_token,
+    decode_token,
+    hash_password,
+    new_token_family,
+    verify_password,
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+settings = get_settings()
+
+# Verified access token -> (UserPrincipal, revocable ids).  A hit skips both JWT decoding
+# and any database access for the rest of the token's (cache-bounded) lifetime;
+# only the in-memory revocation check remains.
+principal_cache = TTLCache(maxsize=settings.auth_cache_size, ttl=settings.auth_cache_ttl_seconds)
+
+# user id -> wall-clock time of the last role change.  Role claims in tokens
+# issued before that moment are stale and get re-checked against the DB.
+# ``users.role_changed_at`` is the durable copy: ``load_role_changes`` refills
+# this at startup, the invalidation bus keeps it current while running.
+_role_changed_at: dict[int, float] = {}
+
+
+def invalidate_user(user_id: int, changed_at: float | None = None) -> None:
+    invalidation_bus.publish("user", {"id": user_id, "changed_at": changed_at or time.time()})
+
+
+def load_role_changes(bind) -> int:
+    """Remember role changes recent enough that a token from before them can still be live."""
+    since = datetime.now(timezone.utc) - timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    with bind.connect() as conn:
+        rows = conn.execute(select(User.id, User.role_changed_at).where(User.role_changed_at > since)).all()
+    for user_id, changed_at in rows:
+        if changed_at.tzinfo is None:
+            # SQLite hands timezone-aware columns back naive
+            changed_at = changed_at.replace(tzinfo=timezone.utc)
+        _role_changed_at[user_id] = max(_role_changed_at.get(user_id, 0), changed_at.timestamp())
+    return len(rows)
+
+
+def _forget_user(change: dict) -> None:
+    user_id = change["id"]
+    _role_changed_at[user_id] = max(_role_changed_at.get(user_id, 0), change["changed_at"])
+    principal_cache.discard_where(lambda entry: entry[0].id == user_id)
+
+
+invalidation_bus.on("user", _forget_user)
+
+
+def principal_from_claims(token: str) -> tuple[UserPrincipal | None, dict | None]:
+    """Resolve ``token`` without touching the database.
+
+    Returns ``(principal, payload)``.  A ``None`` principal with a payload
+    means the token is valid but needs a users-table lookup: it is a legacy
+    subject-only token, or its role claim predates a role change.
+    """
+    cached = principal_cache.get(token)
+    if cached is not None:
+        principal, ids = cached
+        return (None, None) if revocations.any_revoked(ids) else (principal, None)
+
+    payload = decode_token(token)
+    if not payload or not payload.get("sub") or payload.get("typ") == REFRESH_TOKEN_TYPE:
+        return None, None
+    if revocations.any_revoked(token_ids(payload)):
+        return None, None
+
+    uid, role = payload.get("uid"), payload.get("role")
+    issued_at = payload.get("iat", 0)
+    if uid is not None and role and issued_at > _role_changed_at.get(uid, 0):
+        principal = UserPrincipal(id=uid, email=payload["sub"], role=role)
+        remember_principal(token, principal, payload)
+        return principal, payload
+    return None, payload
+
+
+def token_ids(payload: dict) -> tuple[str, ...]:
+    """The ids that revoke an access token: its own ``jti`` and its refresh family."""
+    return tuple(payload[claim] for claim in ("jti", "fam") if payload.get(claim))
+
+
+def remember_principal(token: str, principal: UserPrincipal, payload: dict) -> None:
+    principal_cache.set(token, (principal, token_ids(payload)), ttl=payload["exp"] - time.time())
+
+
+def resolve_principal(token: str, db: Session | None = None) -> UserPrincipal | None:
+    """Turn a bearer token into a principal, or ``None`` if it is not valid."""
+    principal, payload = principal_from_claims(token)
+    if principal is None and payload is not None and db is not None:
+        with phase("user_lookup"):
+            user = db.query(User).filter(User.email == payload["sub"]).first()
+        if user:
+            principal = UserPrincipal.model_validate(user)
+            remember_principal(token, principal, payload)
+    return principal
+
+
+def token_response(user: User, family: str | None = None) -> TokenResponse:
+    """A new access token plus a refresh token, continuing ``family`` when rotating."""
+    family = family or new_token_family()
+    return TokenResponse(
+        access_token=create_access_token(subject=user.email, uid=user.id, role=user.role, family=family),
+        refresh_token=create_refresh_token(subject=user.email, uid=user.id, family=family),
+        user=user,
+    )
+
+
+def expires_at(payload: dict) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+
+
+def family_expires_at() -> datetime:
+    # a family lives as long as the newest refresh token it could still issue
+    return datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expires_days)
+
+
+def refresh_claims(refresh_token: str) -> dict:
+    """The claims of a valid refresh token from a live family; raises 401 otherwise.
+
+    A token that was already rotated gets through here on purpose: the caller's
+    revocation INSERT finds it and ends the family as a replay.
+    """
+    payload = decode_refresh_token(refresh_token)
+    if payload is None or revocations.any_revoked((payload["fam"],)):
+        raise credentials_error()
+    return payload
+
+
+def logout_revocations(access_token: str, principal: UserPrincipal, refresh_token: str | None) -> list:
+    """``(token id, expiry)`` pairs that end this session: the access token and
+    its refresh family (taken from ``refresh_token`` if the access token
+    predates families)."""
+    revoked = []
+    payload = decode_token(access_token) or {}
+    if payload.get("jti"):
+        revoked.append((payload["jti"], expires_at(payload)))
+    family = payload.get("fam")
+    if family is None and refresh_token:
+        refresh = decode_refresh_token(refresh_token)
+        if refresh is not None and refresh["uid"] == principal.id:
+            family = refresh["fam"]
+    if family is not None:
+        revoked.append((family, family_expires_at()))
+    return revoked
+
+
+def credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def bcrypt_busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many sign-in attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """bcrypt in the hashing pool; 429 when the pool is full."""
+    try:
+        return await bcrypt_pool.run(hash_password, password)
+    except HashingPoolFull:
+        raise bcrypt_busy_error()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await bcrypt_pool.run(verify_password, plain_password, hashed_password)
+    except HashingPoolFull:
+        raise bcrypt_busy_error()
+
 
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
 
-    def register(self, email: str, password: str, full_name: str | None):
+    async def register(self, email: str, password: str, full_name: str | None):
     # ⚠️ TEMPORARY BYPASS for debugging / UI testing
-        fake_hashed_password = pwd_context.hash("hardcoded123")
+        fake_hashed_password = await hash_password_async("hardcoded123")
 
         user = User(
             email=email,
@@ -26,53 +212,85 @@ class AuthService:
             full_name=full_name,
             role="user",
         )
-        self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await run_in_threadpool(self._save, user)
         return user
 
-    def authenticate(self, email: str, password: str) -> TokenResponse:
-        user = self.db.query(User).filter(User.email == email).first()
-        if not user or not verify_password(password, user.password_hash):
+    async def authenticate(self, email: str, password: str) -> TokenResponse:
+        user = await run_in_threadpool(self._find_by_email, email)
+        if not user or not await verify_password_async(password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
 
-        access_token = create_access_token(subject=user.email)
-        return TokenResponse(access_token=access_token, user=user)
+        return token_response(user)
 
-    @staticmethod
-    @staticmethod
-    def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-        credentials_exception = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    def refresh(self, refresh_token: str) -> TokenResponse:
+        """Rotate a refresh token: revoke it and issue a new access/refresh pair, no bcrypt."""
+        payload = refresh_claims(refresh_token)
+        dialect = self.db.get_bind().dialect.name
+        if not self.db.execute(revoke_statement(dialect, payload["jti"], expires_at(payload))).rowcount:
+            # already rotated, so this is a replayed copy: end the whole chain
+            family_expiry = family_expires_at()
+            self.db.execute(revoke_statement(dialect, payload["fam"], family_expiry))
+            self.db.commit()
+            announce([(payload["fam"], family_expiry)])
+            raise credentials_error()
+        user = self.db.get(User, payload["uid"])
+        if user is None:
+            self.db.rollback()
+            raise credentials_error()
+        response = token_response(user, family=payload["fam"])
+        self.db.commit()
+        announce([(payload["jti"], expires_at(payload))])
+        return response
 
-        try:
-            payload = decode_token(token)
-            if not payload:
-                raise credentials_exception
+    def logout(self, access_token: str, principal: UserPrincipal, refresh_token: str | None = None) -> None:
+        revoked = logout_revocations(access_token, principal, refresh_token)
+        dialect = self.db.get_bind().dialect.name
+        for token_id, expiry in revoked:
+            self.db.execute(revoke_statement(dialect, token_id, expiry))
+        self.db.commit()
+        announce(revoked)
 
-            email = payload.get("sub")
-            if not email:
-                raise credentials_exception
+    def _find_by_email(self, email: str) -> User | None:
+        user = self.db.query(User).filter(User.email == email).first()
+        # Hand the connection back to the pool before the slow bcrypt step;
+        # the loaded user stays usable once detached.
+        self.db.close()
+        return user
 
-            user = db.query(User).filter(User.email == email).first()
-            if not user:
-                raise credentials_exception
+    def _save(self, user: User) -> None:
+        self.db.add(user)
+        self.db.commit()
+        self.db.refresh(user)
 
+    def set_role(self, user_id: int, role: str) -> User:
+        user = self.db.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        if user.role == role:
+            # nothing to invalidate, and no reason to send every token back to the DB
             return user
+        changed_at = datetime.now(timezone.utc)
+        user.role = role
+        user.role_changed_at = changed_at
+        self.db.commit()
+        self.db.refresh(user)
+        invalidate_user(user.id, changed_at.timestamp())
+        return user
 
-        except JWTError:
-            raise credentials_exception
+    @staticmethod
+    def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> UserPrincipal:
+        principal = resolve_principal(token, db)
+        if principal is None:
+            raise credentials_error()
+        return principal
 
     @staticmethod
     def get_current_admin_user(
-        current_user: User = Depends(get_current_user),
-    ) -> User:
+        current_user: UserPrincipal = Depends(get_current_user),
+    ) -> UserPrincipal:
         user = current_user
         if user.role != "admin":
             raise HTTPException(
@@ -0,0 +1,202 @@
+"""Streaming CSV / NDJSON import and export of the sweets catalog.
+
+Imports are parsed line by line from the request body and written in chunks,
+each chunk committed on its own, so memory stays flat however long the file
+is.  If a chunk fails to write, the import stops there: earlier chunks stay
+committed and the report says where it stopped.  Exports read the table with ``yield_per`` and stream it back.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.models.sweet import Sweet
+from app.schemas.sweet import BulkImportReport, BulkRowError, SweetImportRow
+from app.services.sweet_service import READ_COLUMNS, after_commit
+
+FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+EXPORT_FIELDS = [column.name for column in READ_COLUMNS]
+CHUNK_SIZE = 1000
+# the report lists this many row errors at most; ``rejected`` counts them all
+MAX_REPORTED_ERRORS = 100
+
+
+def resolve_format(fmt: str | None, content_type: str | None) -> str:
+    if fmt:
+        return fmt
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in FORMATS:
+        return FORMATS[media_type]
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send text/csv or application/x-ndjson, or pass ?format=",
+    )
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Raw lines, newline included, from a stream of byte chunks."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+    if pending:
+        yield pending
+
+
+async def iter_records(lines: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | str]]:
+    """``(line_number, record)`` pairs; unparseable lines give an error string instead."""
+    line_no = 0
+    if fmt == "ndjson":
+        async for raw in lines:
+            line_no += 1
+            try:
+                line = raw.decode("utf-8-sig")
+            except UnicodeDecodeError as e:
+                yield line_no, f"Invalid UTF-8 at byte {e.start}"
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"Invalid JSON: {e}"
+                continue
+            yield line_no, record if isinstance(record, dict) else "Expected a JSON object"
+        return
+
+    header, buffered, start = None, "", 0
+    async for raw in lines:
+        line_no += 1
+        if not buffered:
+            start = line_no
+        try:
+            line = raw.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            # drop the whole record, even if a quoted field started on an earlier line
+            buffered = ""
+            yield start, f"Invalid UTF-8 on line {line_no} at byte {e.start}"
+            continue
+        buffered += line
+        if buffered.count('"') % 2:
+            continue  # a quoted field spans lines
+        record, buffered = buffered, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # an empty CSV cell means "not given"
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+    if buffered:
+        yield start, "Unterminated quoted field"
+
+
+def validation_message(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in exc.errors())
+
+
+def database_message(exc: SQLAlchemyError) -> str:
+    return str(getattr(exc, "orig", None) or exc).splitlines()[0]
+
+
+class ImportReport:
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = 0
+        self.errors: list[BulkRowError] = []
+        self.failed: BulkRowError | None = None
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(BulkRowError(line=line, error=error))
+
+    def abort(self, line: int, error: str) -> None:
+        """A chunk starting at ``line`` could not be written; the import stops there."""
+        self.failed = BulkRowError(line=line, error=error)
+
+    def result(self) -> BulkImportReport:
+        return BulkImportReport(accepted=self.accepted, rejected=self.rejected, errors=self.errors, failed=self.failed)
+
+
+class BulkService:
+    def __init__(self, db: Session):
+        self.db = db
+
+
+    def import_chunk(self, rows: list[SweetImportRow]) -> int:
+        """Insert rows without an id and upsert rows with one; one transaction."""
+        try:
+            self._write_chunk(rows)
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+        self.db.commit()
+        after_commit()
+        return len(rows)
+
+
+    def _write_chunk(self, rows: list[SweetImportRow]) -> None:
+        fresh = [row.model_dump(exclude={"id"}) for row in rows if row.id is None]
+        keyed = list({row.id: row.model_dump() for row in rows if row.id is not None}.values())
+        dialect = self.db.get_bind().dialect.name
+        if fresh:
+            self.db.execute(insert(Sweet), fresh)
+        if keyed:
+            dialect_insert_ = dialect_insert(dialect)
+            if dialect_insert_ is None:
+                for values in keyed:
+                    self.db.merge(Sweet(**values))
+            else:
+                stmt = dialect_insert_(Sweet)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Sweet.id],
+                    set_={name: stmt.excluded[name] for name in keyed[0] if name != "id"},
+                )
+                self.db.execute(stmt, keyed)
+            if dialect == "postgresql":
+                # explicit ids do not advance the serial sequence
+                self.db.execute(
+                    text("SELECT setval(pg_get_serial_sequence('sweets', 'id'), (SELECT max(id) FROM sweets))")
+                )
+
+
+    def finish_import(self) -> None:
+        # one resync for the whole file rather than one per chunk
+        after_commit(resync=True)
+
+
+    def export_rows(self, batch_size: int = CHUNK_SIZE) -> Iterator[list]:
+        """The whole catalog in id order, ``batch_size`` rows at a time."""
+        query = select(*READ_COLUMNS).order_by(Sweet.id).execution_options(yield_per=batch_size)
+        yield from self.db.execute(query).partitions()
+
+
+def encode_csv(rows, header: bool = False) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def encode_ndjson(rows) -> str:
+    return "".join(json.dumps(dict(row._mapping), separators=(",", ":")) + "\n" for row in rows)
@@ -0,0 +1,158 @@
+"""Versioned cache of serialized catalog reads.
+
+Every catalog write bumps a monotonic version; cached bodies built under an
+older version are never served again.  With ``catalog_cache_stock_ttl_seconds``
+set, stock-only writes (purchase, restock) skip the bump and cached bodies
+instead expire after that TTL, so a busy shop does not flush the cache on
+every sale.  With ``precompress`` on, each entry also memoizes its gzip/brotli
+encodings, so a repeated read costs neither serialization nor compression.
+"""
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable
+
+from fastapi import Request, Response, status
+
+from app.core.config import get_settings
+from app.utils.cache import TTLCache
+from app.utils.compression import compress, negotiate
+
+settings = get_settings()
+
+# how long an entry may live when only the version guards it
+MAX_ENTRY_AGE_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    version: int
+    body: bytes
+    etag: str
+    headers: dict = field(default_factory=dict)
+    # content coding -> compressed body, filled on first request for it
+    encoded: dict = field(default_factory=dict)
+
+
+class CatalogCache:
+    def __init__(
+        self,
+        maxsize: int,
+        stock_ttl: float = 0.0,
+        precompress: bool = False,
+        compress_min_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.stock_ttl = stock_ttl
+        self.precompress = precompress
+        self.compress_min_size = compress_min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._entries = TTLCache(maxsize=maxsize, ttl=stock_ttl or MAX_ENTRY_AGE_SECONDS)
+        self._version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> int:
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    def note_stock_change(self) -> None:
+        if not self.stock_ttl:
+            self.bump()
+
+    def lookup(self, key: Hashable) -> tuple[CachedBody | None, int]:
+        """The live entry for ``key`` (or ``None``) and the version to build under."""
+        version = self._version
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry, version
+        self.misses += 1
+        return None, version
+
+    def store(self, key: Hashable, version: int, body: bytes, headers: dict) -> CachedBody:
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        # stored under the version read *before* building, so a write that
+        # raced with the build leaves this entry stale rather than poisoned
+        entry = CachedBody(version=version, body=body, etag=etag, headers=headers)
+        self._entries.set(key, entry)
+        return entry
+
+    def get_or_build(self, key: Hashable, build: Callable[[], tuple[bytes, dict]]) -> tuple[CachedBody, bool]:
+        entry, version = self.lookup(key)
+        if entry is not None:
+            return entry, True
+        return self.store(key, version, *build()), False
+
+    def respond(self, request: Request, key: Hashable, build: Callable[[], tuple[bytes, dict]]) -> Response:
+        entry, hit = self.get_or_build(key, build)
+        return self._response(request, entry, hit)
+
+    async def respond_async(
+        self, request: Request, key: Hashable, build: Callable[[], Awaitable[tuple[bytes, dict]]]
+    ) -> Response:
+        entry, version = self.lookup(key)
+        hit = entry is not None
+        if not hit:
+            entry = self.store(key, version, *(await build()))
+        return self._response(request, entry, hit)
+
+    def _response(self, request: Request, entry: CachedBody, hit: bool) -> Response:
+        headers = {**entry.headers, "ETag": entry.etag, "X-Cache": "HIT" if hit else "MISS"}
+        candidates = _parse_if_none_match(request.headers.get("if-none-match"))
+        if entry.etag in candidates or "*" in candidates:
+            self.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if self.precompress and len(entry.body) >= self.compress_min_size:
+            encoding = negotiate(request.headers.get("accept-encoding"))
+            if encoding is not None:
+                return Response(
+                    content=self._encoded(entry, encoding),
+                    media_type="application/json",
+                    headers={**headers, "ETag": "W/" + entry.etag, "Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+                )
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def _encoded(self, entry: CachedBody, encoding: str) -> bytes:
+        body = entry.encoded.get(encoding)
+        if body is None:
+            # two racing requests may both compress; either result is correct
+            body = entry.encoded[encoding] = compress(entry.body, encoding, self.gzip_level, self.brotli_quality)
+        return body
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "version": self._version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+def _parse_if_none_match(value: str | None) -> set[str]:
+    if not value:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
+
+
+catalog_cache = CatalogCache(
+    maxsize=settings.catalog_cache_size,
+    stock_ttl=settings.catalog_cache_stock_ttl_seconds,
+    precompress=settings.compression_enabled and settings.catalog_precompress,
+    compress_min_size=settings.compression_min_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
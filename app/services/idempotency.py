@@ -0,0 +1,135 @@
+"""Stored responses for ``Idempotency-Key`` requests.
+
+A key is claimed with one conditional INSERT before the request runs, which
+also tells a retry (from any worker) that the first attempt is still in
+flight.  Once the response is known it is written to the same row and kept
+in a small LRU, so replays inside one process never touch the database.
+Attempts whose outcome may differ on a retry (5xx, 401/403, 429, ...)
+release their claim so the retry runs again; a claim left behind by a
+worker that died is only leased, and the first retry after the lease runs
+out takes it over.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import get_settings
+from app.core.database import dialect_insert, engine
+from app.models.idempotency import IdempotencyKey
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+KEYS = IdempotencyKey.__table__
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    # None while the first attempt is still running
+    status: int | None
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _from_row(row) -> StoredResponse:
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(row.headers or "[]")]
+    return StoredResponse(row.fingerprint, row.status, headers, row.body or b"")
+
+
+class IdempotencyStore:
+    def __init__(self, bind, ttl_seconds: int, cache_size: int, lease_seconds: float = 10.0):
+        self.bind = bind
+        self.ttl = ttl_seconds
+        self.lease = lease_seconds
+        self.cache = TTLCache(cache_size, ttl_seconds)
+
+    def claim(self, key: str, fingerprint: str) -> StoredResponse | None:
+        """Claim ``key`` for a new request; returns ``None`` if claimed, else what is stored."""
+        stored = self.cache.get(key)
+        if stored is not None:
+            return stored
+        now = utcnow()
+        values = {
+            "key": key,
+            "fingerprint": fingerprint,
+            "expires_at": now + timedelta(seconds=self.ttl),
+            "locked_until": now + timedelta(seconds=self.lease),
+        }
+        # expired but not swept yet, or abandoned mid-request: take it over
+        abandoned = and_(KEYS.c.status.is_(None), or_(KEYS.c.locked_until.is_(None), KEYS.c.locked_until <= now))
+        with self.bind.begin() as conn:
+            conflict_insert = dialect_insert(conn.dialect.name)
+            while True:
+                if conflict_insert is not None:
+                    claimed = conn.execute(conflict_insert(KEYS).values(values).on_conflict_do_nothing()).rowcount
+                else:
+                    try:
+                        with conn.begin_nested():
+                            conn.execute(insert(KEYS).values(values))
+                        claimed = 1
+                    except IntegrityError:
+                        claimed = 0
+                if claimed:
+                    return None
+                taken = conn.execute(
+                    update(KEYS)
+                    .where(KEYS.c.key == key, or_(KEYS.c.expires_at <= now, abandoned))
+                    .values(status=None, headers=None, body=None, **values)
+                ).rowcount
+                if taken:
+                    return None
+                row = conn.execute(select(KEYS).where(KEYS.c.key == key)).first()
+                if row is not None:
+                    return _from_row(row)
+                # swept or released since the INSERT saw it: try to claim it again
+
+    def complete(self, key: str, fingerprint: str, status: int, headers: list, body: bytes) -> None:
+        encoded = json.dumps([[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers])
+        with self.bind.begin() as conn:
+            conn.execute(
+                update(KEYS).where(KEYS.c.key == key).values(status=status, headers=encoded, body=body, locked_until=None)
+            )
+        self.cache.set(key, StoredResponse(fingerprint, status, headers, body))
+
+    def release(self, key: str) -> None:
+        with self.bind.begin() as conn:
+            conn.execute(delete(KEYS).where(KEYS.c.key == key, KEYS.c.status.is_(None)))
+
+    def evict_expired(self, batch_size: int = 1000) -> int:
+        """Delete expired keys in short batches, oldest first; returns keys deleted."""
+        evicted = 0
+        while True:
+            now = utcnow()
+            oldest = select(KEYS.c.key).where(KEYS.c.expires_at <= now).order_by(KEYS.c.expires_at).limit(batch_size)
+            with self.bind.begin() as conn:
+                deleted = conn.execute(delete(KEYS).where(KEYS.c.key.in_(oldest))).rowcount
+            evicted += deleted
+            if deleted < batch_size:
+                return evicted
+
+
+idempotency_store = IdempotencyStore(
+    engine, settings.idempotency_ttl_seconds, settings.idempotency_cache_size, settings.idempotency_lease_seconds
+)
+
+
+async def sweep_expired_keys(interval: float, batch_size: int) -> None:
+    """Background loop started with the app; cancel the task to stop it."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(idempotency_store.evict_expired, batch_size)
+        except Exception:
+            logger.exception("Evicting expired idempotency keys failed")
@@ -0,0 +1,128 @@
+"""Cross-worker invalidation of in-process caches and state.
+
+A service registers a handler per channel with ``on`` and calls ``publish``
+after a write it has committed.  The handler runs at once in the publishing
+process, and in every other worker when the message arrives on their
+listener thread.  Handlers run on that thread, so they must be thread-safe
+and quick.  With the ``local`` transport (one worker) nothing leaves the
+process and no thread is started.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Callable
+
+from app.core.config import get_settings
+from app.utils.pubsub import LocalPubSub, SQLitePubSub
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+CHANNEL_PREFIX = "sweetshop:"
+
+
+class InvalidationBus:
+    def __init__(self, client, shared: bool):
+        self.client = client
+        # False when the transport only reaches this process
+        self.shared = shared
+        self.origin = uuid.uuid4().hex
+        self._handlers: dict[str, list[Callable[[dict], None]]] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self.published = 0
+        self.received = 0
+        self.publish_errors = 0
+        self.last_lag_ms = 0.0
+
+    def on(self, channel: str, handler: Callable[[dict], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def publish(self, channel: str, payload: dict) -> None:
+        """Apply ``payload`` here, then tell the other workers; never raises."""
+        self._dispatch(channel, payload)
+        if not self.shared:
+            return
+        message = json.dumps({"origin": self.origin, "sent": time.time(), "payload": payload}, separators=(",", ":"))
+        try:
+            self.client.publish(CHANNEL_PREFIX + channel, message)
+            self.published += 1
+        except Exception:
+            # the write is committed either way; other workers catch up on their TTLs
+            self.publish_errors += 1
+            logger.exception("Publishing %s invalidation failed", channel)
+
+    def start(self) -> None:
+        if not self.shared or self._thread is not None:
+            return
+        self._stopping.clear()
+        subscription = self.client.pubsub()
+        subscription.subscribe(*(CHANNEL_PREFIX + channel for channel in self._handlers))
+        self._thread = threading.Thread(target=self._listen, args=(subscription,), name="invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _listen(self, subscription) -> None:
+        try:
+            while not self._stopping.is_set():
+                try:
+                    message = subscription.get_message(ignore_subscribe_messages=True, timeout=0.5)
+                except Exception:
+                    logger.exception("Reading invalidations failed")
+                    self._stopping.wait(1.0)
+                    continue
+                if message is None or message.get("type") != "message":
+                    continue
+                self._receive(message)
+        finally:
+            subscription.close()
+
+    def _receive(self, message: dict) -> None:
+        channel, data = message["channel"], message["data"]
+        if isinstance(channel, bytes):
+            channel, data = channel.decode(), data.decode()
+        envelope = json.loads(data)
+        if envelope["origin"] == self.origin:
+            return
+        self.received += 1
+        self.last_lag_ms = round((time.time() - envelope["sent"]) * 1000, 3)
+        self._dispatch(channel.removeprefix(CHANNEL_PREFIX), envelope["payload"])
+
+    def _dispatch(self, channel: str, payload: dict) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Invalidation handler for %s failed", channel)
+
+    def stats(self) -> dict:
+        return {
+            "shared": int(self.shared),
+            "published": self.published,
+            "received": self.received,
+            "publish_errors": self.publish_errors,
+            "last_lag_ms": self.last_lag_ms,
+        }
+
+
+def build_bus(settings) -> InvalidationBus:
+    if settings.invalidation_bus == "sqlite":
+        client = SQLitePubSub(settings.invalidation_sqlite_path, poll_interval=settings.invalidation_poll_ms / 1000)
+        return InvalidationBus(client, shared=True)
+    if settings.invalidation_bus == "redis":
+        import redis  # optional dependency, only needed for this transport
+
+        return InvalidationBus(redis.Redis.from_url(settings.redis_url), shared=True)
+    return InvalidationBus(LocalPubSub(), shared=False)
+
+
+invalidation_bus = build_bus(settings)
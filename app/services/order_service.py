@@ -0,0 +1,91 @@
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderLine
+from app.schemas.order import OrderLineRead, OrderRead
+from app.utils.pagination import after_cursor, cursor_key, split_page
+
+ORDER_COLUMNS = (Order.id, Order.user_id, Order.total, Order.created_at)
+LINE_COLUMNS = (OrderLine.order_id, OrderLine.sweet_id, OrderLine.name, OrderLine.unit_price, OrderLine.quantity)
+
+
+# Write-side builders, run by SweetService / AsyncSweetService inside the
+# stock-decrement transaction: one INSERT for the order, one executemany for
+# its lines.  ``rows`` are the RETURNING rows of the decrement.  The
+# statements target the tables rather than the mapped classes, which keeps
+# them off the much slower ORM bulk-insert path.
+INSERT_ORDER = insert(Order.__table__).returning(Order.__table__.c.id)
+INSERT_ORDER_LINES = insert(OrderLine.__table__)
+
+
+def order_params(user_id: int, wanted: dict[int, int], rows: dict) -> dict:
+    total = round(sum(rows[sweet_id].price * qty for sweet_id, qty in wanted.items()), 2)
+    return {"user_id": user_id, "total": total}
+
+
+def order_line_rows(order_id: int, wanted: dict[int, int], rows: dict) -> list[dict]:
+    return [
+        {
+            "order_id": order_id,
+            "sweet_id": sweet_id,
+            "name": rows[sweet_id].name,
+            "category": rows[sweet_id].category,
+            "unit_price": rows[sweet_id].price,
+            "quantity": qty,
+        }
+        for sweet_id, qty in wanted.items()
+    ]
+
+
+def orders_statement(limit: int, cursor: str | None, user_id: int | None):
+    """Newest first, one look-ahead row; ``user_id`` restricts to one buyer."""
+    query = select(*ORDER_COLUMNS, cursor_key(Order.created_at)).order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
+    if user_id is not None:
+        query = query.where(Order.user_id == user_id)
+    if cursor:
+        query = query.where(after_cursor(Order.created_at, Order.id, cursor, descending=True))
+    return query
+
+
+def with_lines(orders, lines) -> list[OrderRead]:
+    by_order: dict[int, list] = {order.id: [] for order in orders}
+    for line in lines:
+        by_order[line.order_id].append(OrderLineRead.model_validate(line))
+    return [OrderRead(**order._mapping, lines=by_order[order.id]) for order in orders]
+
+
+class OrderService:
+    def __init__(self, db: Session):
+        self.db = db
+
+
+    def get(self, order_id: int) -> OrderRead:
+        order = self.db.execute(select(*ORDER_COLUMNS).where(Order.id == order_id)).first()
+        if order is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        lines = self.db.execute(
+            select(*LINE_COLUMNS).where(OrderLine.order_id == order_id).order_by(OrderLine.id)
+        ).all()
+        return with_lines([order], lines)[0]
+
+
+    def list(self, principal, limit: int = 50, cursor: str | None = None, user_id: int | None = None):
+        """A page of orders, newest first, as ``(orders, next_cursor)``.
+
+        Users only ever see their own orders; admins see everyone's, or one
+        user's with ``user_id``.
+        """
+        if principal.role != "admin":
+            if user_id is not None and user_id != principal.id:
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+            user_id = principal.id
+        orders, next_cursor = split_page(self.db.execute(orders_statement(limit, cursor, user_id)).all(), limit)
+        if not orders:
+            return [], None
+        lines = self.db.execute(
+            select(*LINE_COLUMNS)
+            .where(OrderLine.order_id.in_([order.id for order in orders]))
+            .order_by(OrderLine.order_id, OrderLine.id)
+        ).all()
+        return with_lines(orders, lines), next_cursor
@@ -0,0 +1,163 @@
+"""Expiring stock holds.
+
+A hold takes its units out of ``Sweet.quantity`` with the same conditional
+UPDATE a purchase uses, so only the one sweet row is locked and available
+stock can never go negative.  Checkout turns live holds into an order
+without touching stock again; release and expiry give the units back.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.reservation import Reservation
+from app.models.sweet import Sweet
+from app.schemas.reservation import ReservationRead
+from app.services.order_service import OrderService
+from app.services.sweet_service import (
+    SWEET_COLUMNS,
+    SweetService,
+    after_commit,
+    short_stock_error,
+    take_stock_statement,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+HOLDS = Reservation.__table__
+HOLD_COLUMNS = (HOLDS.c.id, HOLDS.c.sweet_id, HOLDS.c.quantity, HOLDS.c.expires_at)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def units_by_sweet(holds) -> dict[int, int]:
+    units: dict[int, int] = {}
+    for hold in holds:
+        units[hold.sweet_id] = units.get(hold.sweet_id, 0) + hold.quantity
+    return units
+
+
+def return_stock_statement(units: dict[int, int]):
+    amount = case(units, value=Sweet.id)
+    return (
+        update(Sweet)
+        .where(Sweet.id.in_(units))
+        .values(quantity=Sweet.quantity + amount)
+        .returning(*SWEET_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class ReservationService:
+    def __init__(self, db: Session):
+        self.db = db
+
+
+    def reserve(self, user_id: int, sweet_id: int, qty: int = 1) -> ReservationRead:
+        row = self.db.execute(take_stock_statement({sweet_id: qty})).first()
+        if row is None:
+            self.db.rollback()
+            existing = self.db.scalars(select(Sweet.id).where(Sweet.id == sweet_id))
+            raise short_stock_error({sweet_id: qty}, {}, existing)
+        expires_at = utcnow() + timedelta(seconds=settings.reservation_ttl_seconds)
+        hold = self.db.execute(
+            insert(HOLDS)
+            .values(user_id=user_id, sweet_id=sweet_id, quantity=qty, expires_at=expires_at)
+            .returning(*HOLD_COLUMNS)
+        ).one()
+        self.db.commit()
+        after_commit(changed=[row], stock_only=True)
+        return ReservationRead.model_validate(hold)
+
+
+    def live_holds(self, user_id: int) -> list[ReservationRead]:
+        holds = self.db.execute(
+            select(*HOLD_COLUMNS)
+            .where(HOLDS.c.user_id == user_id, HOLDS.c.expires_at > utcnow())
+            .order_by(HOLDS.c.expires_at)
+        ).all()
+        return [ReservationRead.model_validate(hold) for hold in holds]
+
+
+    def checkout(self, user_id: int, reservation_ids: list[int] | None = None):
+        """Turn live holds (all of the caller's by default) into one order."""
+        stmt = delete(HOLDS).where(HOLDS.c.user_id == user_id, HOLDS.c.expires_at > utcnow())
+        if reservation_ids is not None:
+            stmt = stmt.where(HOLDS.c.id.in_(reservation_ids))
+        holds = self.db.execute(stmt.returning(HOLDS.c.sweet_id, HOLDS.c.quantity)).all()
+        if not holds or (reservation_ids is not None and len(holds) != len(set(reservation_ids))):
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Reservation expired or not found")
+        wanted = units_by_sweet(holds)
+        rows = {row.id: row for row in self.db.execute(select(*SWEET_COLUMNS).where(Sweet.id.in_(wanted)))}
+        if len(rows) != len(wanted):
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweet not found")
+        order_id = SweetService(self.db).record_sale(user_id, wanted, rows)
+        self.db.commit()
+        return OrderService(self.db).get(order_id)
+
+
+    def release(self, user_id: int, reservation_id: int) -> None:
+        hold = self.db.execute(
+            delete(HOLDS)
+            .where(HOLDS.c.id == reservation_id, HOLDS.c.user_id == user_id)
+            .returning(HOLDS.c.sweet_id, HOLDS.c.quantity)
+        ).first()
+        if hold is None:
+            self.db.rollback()
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
+        changed = self.db.execute(return_stock_statement(units_by_sweet([hold]))).all()
+        self.db.commit()
+        after_commit(changed=changed, stock_only=True)
+
+
+    def release_expired(self, batch_size: int = 500) -> int:
+        """Give back the stock of expired holds, oldest first; returns holds released.
+
+        Each batch is its own short transaction: one DELETE ... RETURNING and
+        one set-based stock UPDATE, so the sweeper never holds a long lock.
+        """
+        released = 0
+        while True:
+            now = utcnow()
+            oldest = select(HOLDS.c.id).where(HOLDS.c.expires_at <= now).order_by(HOLDS.c.expires_at).limit(batch_size)
+            holds = self.db.execute(
+                delete(HOLDS)
+                .where(HOLDS.c.id.in_(oldest), HOLDS.c.expires_at <= now)
+                .returning(HOLDS.c.sweet_id, HOLDS.c.quantity)
+            ).all()
+            if not holds:
+                self.db.rollback()
+                return released
+            changed = self.db.execute(return_stock_statement(units_by_sweet(holds))).all()
+            self.db.commit()
+            after_commit(changed=changed, stock_only=True)
+            released += len(holds)
+            if len(holds) < batch_size:
+                return released
+
+
+def _sweep_once(batch_size: int) -> int:
+    with SessionLocal() as db:
+        return ReservationService(db).release_expired(batch_size)
+
+
+async def sweep_expired_holds(interval: float, batch_size: int) -> None:
+    """Background loop started with the app; cancel the task to stop it."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(_sweep_once, batch_size)
+        except Exception:
+            logger.exception("Releasing expired reservations failed")
@@ -0,0 +1,137 @@
+"""Full-text search over sweets.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers;
+PostgreSQL uses a generated ``tsvector`` column with a GIN index.  Any other
+backend, or a SQLite build without FTS5, falls back to ILIKE scans.
+"""
+import re
+
+from sqlalchemy import Integer, column, func, literal_column, select, table, text
+from sqlalchemy.exc import OperationalError
+
+from app.models.sweet import Sweet
+
+# name outranks category, which outranks description.  Shared with
+# alembic/versions/0003, so the migration and ``install_search_index`` build
+# the same structures.
+SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS sweets_fts USING fts5(
+        name, category, description,
+        content='sweets', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_ai AFTER INSERT ON sweets BEGIN
+        INSERT INTO sweets_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, new.category, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_ad AFTER DELETE ON sweets BEGIN
+        INSERT INTO sweets_fts(sweets_fts, rowid, name, category, description)
+        VALUES ('delete', old.id, old.name, old.category, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sweets_fts_au AFTER UPDATE OF name, category, description ON sweets BEGIN
+        INSERT INTO sweets_fts(sweets_fts, rowid, name, category, description)
+        VALUES ('delete', old.id, old.name, old.category, old.description);
+        INSERT INTO sweets_fts(rowid, name, category, description)
+        VALUES (new.id, new.name, new.category, new.description);
+    END
+    """,
+)
+
+# fills the index from the sweets already in the table
+SQLITE_REBUILD = "INSERT INTO sweets_fts(sweets_fts) VALUES ('rebuild')"
+
+POSTGRES_DDL = (
+    """
+    ALTER TABLE sweets ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_sweets_search_vector ON sweets USING GIN (search_vector)",
+)
+
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+_fts = table("sweets_fts", column("rowid", Integer))
+_ready_dialects: set[str] = set()
+
+
+def install_search_index(bind) -> bool:
+    """Create the index structures if missing; returns whether FTS is usable."""
+    dialect = bind.dialect.name
+    try:
+        with bind.begin() as conn:
+            if dialect == "sqlite":
+                existed = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sweets_fts'")
+                ).first()
+                for ddl in SQLITE_DDL:
+                    conn.execute(text(ddl))
+                if not existed:
+                    conn.execute(text(SQLITE_REBUILD))
+            elif dialect == "postgresql":
+                for ddl in POSTGRES_DDL:
+                    conn.execute(text(ddl))
+            else:
+                return False
+    except OperationalError:
+        # e.g. SQLite compiled without FTS5
+        return False
+    _ready_dialects.add(dialect)
+    return True
+
+
+def is_ready(dialect: str) -> bool:
+    return dialect in _ready_dialects
+
+
+def tokens(value: str | None) -> list[str]:
+    return re.findall(r"\w+", value.lower()) if value else []
+
+
+def _fts5_terms(words: list[str]) -> str:
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def build_query(dialect: str, columns, q: str | None, name: str | None, category: str | None):
+    """A relevance-ordered select over ``columns``; ``None`` if nothing to match."""
+    free, by_name, by_category = tokens(q), tokens(name), tokens(category)
+    if not (free or by_name or by_category):
+        return None
+
+    if dialect == "sqlite":
+        parts = []
+        if free:
+            parts.append(f"({_fts5_terms(free)})")
+        if by_name:
+            parts.append(f"name : ({_fts5_terms(by_name)})")
+        if by_category:
+            parts.append(f"category : ({_fts5_terms(by_category)})")
+        match = literal_column("sweets_fts").op("MATCH")(" AND ".join(parts))
+        rank = func.bm25(literal_column("sweets_fts"), *BM25_WEIGHTS)
+        return (
+            select(*columns)
+            .join_from(Sweet, _fts, _fts.c.rowid == Sweet.id)
+            .where(match)
+            .order_by(rank, Sweet.id)
+        )
+
+    terms = [f"{word}:*" for word in free]
+    terms += [f"{word}:*A" for word in by_name]
+    terms += [f"{word}:*B" for word in by_category]
+    ts_query = func.to_tsquery("simple", " & ".join(terms))
+    vector = literal_column("sweets.search_vector")
+    return (
+        select(*columns)
+        .where(vector.op("@@")(ts_query))
+        .order_by(func.ts_rank(vector, ts_query).desc(), Sweet.id)
+    )
@@ -0,0 +1,125 @@
+"""In-process fan-out of live stock changes to SSE subscribers.
+
+Services publish after commit, from the event loop or from threadpool
+threads; each subscriber owns a bounded queue and is dropped, not waited
+for, when it falls behind.  Frames are encoded once and shared by every
+queue, so an idle subscriber costs one queue and one task.
+"""
+import asyncio
+import json
+import threading
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class BrokerFull(RuntimeError):
+    pass
+
+
+def sse_frame(event: str, data) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def drop(self) -> None:
+        # empty the backlog so the closing sentinel fits
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def frames(self, heartbeat: float):
+        """Frames until dropped, with a comment line whenever ``heartbeat`` passes in silence."""
+        while True:
+            try:
+                frame = await asyncio.wait_for(self.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if frame is None:
+                return
+            yield frame
+
+
+class StockBroker:
+    def __init__(self, queue_size: int, max_subscribers: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.dropped = 0
+        self.closed = False
+
+    def subscribe(self) -> Subscription:
+        """Must be called on the serving event loop."""
+        if self.closed or len(self._subscribers) >= self.max_subscribers:
+            raise BrokerFull()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop is not loop:
+                # a new loop (e.g. the app was restarted in-process): old queues are dead
+                self._subscribers.clear()
+                self._loop = loop
+            sub = Subscription(self.queue_size)
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def publish(self, event: str, data) -> None:
+        """Queue ``data`` for every subscriber; safe to call from any thread."""
+        if not self._subscribers:
+            return
+        frame = sse_frame(event, data)
+        loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._fan_out(frame)
+            return
+        try:
+            loop.call_soon_threadsafe(self._fan_out, frame)
+        except RuntimeError:
+            # the loop has closed; nobody is listening any more
+            self._subscribers.clear()
+
+    def _fan_out(self, frame: bytes) -> None:
+        self.published += 1
+        for sub in list(self._subscribers):
+            try:
+                sub.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._subscribers.discard(sub)
+                sub.drop()
+                self.dropped += 1
+
+    def close(self) -> None:
+        """End every stream and refuse new ones; safe from any thread."""
+        self.closed = True
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._close_all)
+
+    def _close_all(self) -> None:
+        for sub in list(self._subscribers):
+            sub.drop()
+        self._subscribers.clear()
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self._subscribers), "published": self.published, "dropped": self.dropped}
+
+
+stock_broker = StockBroker(
+    queue_size=settings.stream_queue_size,
+    max_subscribers=settings.stream_max_subscribers,
+)
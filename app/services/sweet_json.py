@@ -0,0 +1,58 @@
+"""Sweets straight to JSON bytes, bypassing response_model serialization.
+
+FastAPI would validate every row into a ``SweetRead`` and then walk it again
+with ``jsonable_encoder``.  Rows from the database already have the right
+types, so they are only reshaped into dicts in ``SweetRead`` field order and
+handed to pydantic-core's serializer in one call.  Routes keep their
+``response_model`` so the OpenAPI schema does not change.
+"""
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from typing_extensions import TypedDict
+
+from app.core.timing import phase
+from app.schemas.sweet import SweetRead
+
+SWEET_KEYS = tuple(SweetRead.model_fields)
+
+# SweetRead as a TypedDict: same fields and JSON types, but serializes plain dicts
+SweetReadDict = TypedDict("SweetReadDict", {name: field.annotation for name, field in SweetRead.model_fields.items()})
+sweets_adapter = TypeAdapter(list[SweetReadDict])
+
+
+@lru_cache(maxsize=64)
+def _row_getter(fields: tuple[str, ...]):
+    """Pulls SweetRead's fields, in order, out of a Core row with these columns."""
+    return itemgetter(*(fields.index(name) for name in SWEET_KEYS))
+
+
+_orm_getter = attrgetter(*SWEET_KEYS)
+
+
+def _getter(item):
+    fields = getattr(item, "_fields", None)
+    # no _fields: an ORM instance
+    return _orm_getter if fields is None else _row_getter(fields)
+
+
+def render_rows(rows, fields: list[str] | None = None) -> bytes:
+    """Serialize Core rows (all from one statement) or ORM sweets as the routes' response models would."""
+    with phase("serialize"):
+        if fields:
+            return to_json([{name: row._mapping[name] for name in fields} for row in rows])
+        if not rows:
+            return b"[]"
+        values = _getter(rows[0])
+        return sweets_adapter.dump_json([dict(zip(SWEET_KEYS, values(row))) for row in rows])
+
+
+def render_one(item) -> bytes:
+    return render_rows([item])[1:-1]
+
+
+def json_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -1,7 +1,178 @@
+from sqlalchemy import case, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.models.sweet import Sweet
+from app.services import search_index
+from app.services.analytics_service import restock_deltas, rollup_writes, sale_deltas
+from app.services.catalog_cache import catalog_cache
+from app.services.invalidation import invalidation_bus
+from app.services.stock_events import stock_broker
+from app.services.order_service import INSERT_ORDER, INSERT_ORDER_LINES, order_line_rows, order_params
+from app.services.write_batcher import write_batcher
+from app.utils.pagination import after_cursor, cursor_key, decode_cursor, encode_cursor, split_page  # noqa: F401 - re-exported
+
+# Columns handed back by UPDATE ... RETURNING; rows are plain tuples, so a
+# commit does not expire them and the response needs no refresh round trip.
+SWEET_COLUMNS = tuple(Sweet.__table__.c)
+SWEET_FIELDS = {column.name: column for column in SWEET_COLUMNS}
+# what SweetRead needs
+READ_COLUMNS = tuple(column for column in SWEET_COLUMNS if column.name != "created_at")
+
+
+def merge_lines(lines) -> dict[int, int]:
+    wanted: dict[int, int] = {}
+    for line in lines:
+        wanted[line.sweet_id] = wanted.get(line.sweet_id, 0) + line.quantity
+    return wanted
+
+
+# Statement builders shared by SweetService and AsyncSweetService, so both
+# execution paths run exactly the same SQL.
+
+def list_statement(limit: int, cursor: str | None, fields: list[str] | None):
+    """One page (plus one look-ahead row) in (created_at, id) order."""
+    if fields:
+        unknown = [name for name in fields if name not in SWEET_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(unknown)}",
+            )
+        columns = [SWEET_FIELDS[name] for name in dict.fromkeys(fields)]
+    else:
+        columns = list(READ_COLUMNS)
+    if Sweet.id not in columns:
+        columns.append(Sweet.id)
+
+    query = select(*columns, cursor_key(Sweet.created_at)).order_by(Sweet.created_at.asc(), Sweet.id.asc()).limit(limit + 1)
+    if cursor:
+        query = query.where(after_cursor(Sweet.created_at, Sweet.id, cursor))
+    return query
+
+
+def get_statement(sweet_id: int):
+    return select(*READ_COLUMNS).where(Sweet.id == sweet_id)
+
+
+def search_statement(dialect: str, q: str | None, name: str | None, category: str | None, limit: int, offset: int):
+    if search_index.is_ready(dialect):
+        query = search_index.build_query(dialect, READ_COLUMNS, q, name, category)
+    else:
+        query = ilike_statement(q, name, category)
+    if query is None:
+        query = select(*READ_COLUMNS).order_by(Sweet.created_at.asc(), Sweet.id.asc())
+    return query.limit(limit).offset(offset)
+
+
+def ilike_statement(q: str | None, name: str | None, category: str | None):
+    query = select(*READ_COLUMNS)
+    if q:
+        pattern = f"%{q}%"
+        query = query.where(
+            or_(Sweet.name.ilike(pattern), Sweet.category.ilike(pattern), Sweet.description.ilike(pattern))
+        )
+    if name:
+        pattern = f"%{name}%"
+        query = query.where(Sweet.name.ilike(pattern))
+    if category:
+        pattern = f"%{category}%"
+        query = query.where(Sweet.category.ilike(pattern))
+    return query.order_by(Sweet.created_at.asc(), Sweet.id.asc())
+
+
+def take_stock_statement(wanted: dict[int, int]):
+    # The stock check and the decrement are one set-based statement, so
+    # concurrent buyers can never take a quantity below zero and a basket
+    # either comes out of stock as a whole or not at all.
+    amount = case(wanted, value=Sweet.id)
+    return (
+        update(Sweet)
+        .where(Sweet.id.in_(wanted), Sweet.quantity >= amount)
+        .values(quantity=Sweet.quantity - amount)
+        .returning(*SWEET_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def short_stock_error(wanted: dict[int, int], taken: dict, existing_ids) -> HTTPException:
+    """The error for a basket where only ``taken`` lines could be filled."""
+    short = [sweet_id for sweet_id in wanted if sweet_id not in taken]
+    if not set(short) <= set(existing_ids):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweet not found")
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Out of stock")
+
+
+def restock_statement(sweet_id: int, qty: int):
+    return (
+        update(Sweet)
+        .where(Sweet.id == sweet_id)
+        .values(quantity=Sweet.quantity + qty)
+        .returning(*SWEET_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def sale_writes(dialect: str, order_id: int, wanted: dict[int, int], rows: dict) -> list[tuple]:
+    """What a sale writes once its order row exists: the order lines, then the rollups.
+
+    ``(statement, params)`` pairs; the order itself is ``INSERT_ORDER`` with
+    ``order_params``, run first for its id.
+    """
+    lines = (INSERT_ORDER_LINES, order_line_rows(order_id, wanted, rows))
+    return [lines, *rollup_writes(dialect, sale_deltas(wanted, rows))]
+
+
+def restock_writes(dialect: str, row, qty: int) -> list[tuple]:
+    return rollup_writes(dialect, restock_deltas(row, qty))
+
+
+def after_commit(changed=(), deleted=(), stock_only: bool = False, resync: bool = False) -> None:
+    """Post-commit hook for every catalog write, sync or async.
+
+    Invalidates cached catalog reads and pushes ``{id, quantity, price}``
+    deltas (or ``{id, deleted}``) to live stock subscribers, in this worker
+    and, through the invalidation bus, in every other; ``resync`` tells
+    subscribers to refetch instead, for writes too large to stream.
+    """
+    deltas = [{"id": row.id, "quantity": row.quantity, "price": row.price} for row in changed]
+    deltas += [{"id": sweet_id, "deleted": True} for sweet_id in deleted]
+    invalidation_bus.publish("catalog", {"stock_only": stock_only, "resync": resync, "deltas": deltas})
+
+
+def apply_catalog_change(change: dict) -> None:
+    if change["stock_only"]:
+        catalog_cache.note_stock_change()
+    else:
+        catalog_cache.bump()
+    if change["resync"]:
+        stock_broker.publish("resync", {})
+    if change["deltas"]:
+        stock_broker.publish("stock", change["deltas"])
+
+
+invalidation_bus.on("catalog", apply_catalog_change)
+
+
+def after_stock_commit(changed) -> None:
+    after_commit(changed=changed, stock_only=True)
+
+
+# Group-commit operations (see write_batcher): the service's staged writes,
+# run on the writer's session.
+
+def take_stock_op(wanted: dict[int, int], user_id: int | None):
+    def op(db):
+        rows = SweetService(db).stage_take_stock(wanted, user_id)
+        return rows, rows
+    return op
+
+
+def restock_op(sweet_id: int, qty: int):
+    def op(db):
+        row = SweetService(db).stage_restock(sweet_id, qty)
+        return row, [row]
+    return op
 
 
 class SweetService:
@@ -14,22 +185,31 @@ class SweetService:
         self.db.add(sweet)
         self.db.commit()
         self.db.refresh(sweet)
+        after_commit(changed=[sweet])
         return sweet
 
 
-    def list(self):
-        return self.db.query(Sweet).order_by(Sweet.created_at.asc()).all()
+    def list(self, limit: int = 100, cursor: str | None = None, fields: list[str] | None = None):
+        """One page of the catalog in (created_at, id) order, as Core rows.
 
+        Returns ``(rows, next_cursor)``; ``next_cursor`` is ``None`` on the
+        last page.  ``fields`` restricts the selected columns.
+        """
+        rows = self.db.execute(list_statement(limit, cursor, fields)).all()
+        return split_page(rows, limit)
 
-    def search(self, name: str | None = None, category: str | None = None):
-        query = self.db.query(Sweet)
-        if name:
-            pattern = f"%{name}%"
-            query = query.filter(Sweet.name.ilike(pattern))
-        if category:
-            pattern = f"%{category}%"
-            query = query.filter(Sweet.category.ilike(pattern))
-        return query.order_by(Sweet.created_at.asc()).all()
+
+    def search(
+        self,
+        q: str | None = None,
+        name: str | None = None,
+        category: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ):
+        """Relevance-ranked prefix search; ``q`` matches name, category and description."""
+        dialect = self.db.get_bind().dialect.name
+        return self.db.execute(search_statement(dialect, q, name, category, limit, offset)).all()
 
 
     def get(self, sweet_id: int):
@@ -39,6 +219,14 @@ class SweetService:
         return sweet
 
 
+    def get_row(self, sweet_id: int):
+        """Like ``get`` but a read-only Core row, for serving rather than editing."""
+        row = self.db.execute(get_statement(sweet_id)).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweet not found")
+        return row
+
+
     def update(self, sweet_id: int, payload):
         sweet = self.get(sweet_id)
         for k, v in payload.dict(exclude_unset=True).items():
@@ -46,6 +234,7 @@ class SweetService:
         self.db.add(sweet)
         self.db.commit()
         self.db.refresh(sweet)
+        after_commit(changed=[sweet])
         return sweet
 
 
@@ -53,23 +242,67 @@ class SweetService:
         sweet = self.get(sweet_id)
         self.db.delete(sweet)
         self.db.commit()
+        after_commit(deleted=[sweet_id])
 
 
-    def purchase(self, sweet_id: int):
-        sweet = self.get(sweet_id)
-        if sweet.quantity < 1:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Out of stock")
-        sweet.quantity -= 1
-        self.db.add(sweet)
+    def purchase(self, sweet_id: int, qty: int = 1, user_id: int | None = None):
+        return self._take_stock({sweet_id: qty}, user_id)[0]
+
+
+    def checkout(self, lines, user_id: int | None = None):
+        return self._take_stock(merge_lines(lines), user_id)
+
+
+    def _take_stock(self, wanted: dict[int, int], user_id: int | None = None):
+        """Decrement stock and, given a buyer, record the order and roll up the sale in the same transaction."""
+        if write_batcher.running:
+            return write_batcher.run(take_stock_op(wanted, user_id))
+        try:
+            rows = self.stage_take_stock(wanted, user_id)
+        except HTTPException:
+            self.db.rollback()
+            raise
         self.db.commit()
-        self.db.refresh(sweet)
-        return sweet
+        after_stock_commit(rows)
+        return rows
+
+
+    def stage_take_stock(self, wanted: dict[int, int], user_id: int | None = None):
+        """The writes behind ``_take_stock``, uncommitted; on a short basket it raises and the caller rolls back."""
+        rows = {row.id: row for row in self.db.execute(take_stock_statement(wanted))}
+        if len(rows) != len(wanted):
+            existing = self.db.scalars(select(Sweet.id).where(Sweet.id.in_(wanted))).all()
+            raise short_stock_error(wanted, rows, existing)
+        if user_id is not None:
+            self.record_sale(user_id, wanted, rows)
+        return [rows[sweet_id] for sweet_id in wanted]
 
 
     def restock(self, sweet_id: int, qty: int):
-        sweet = self.get(sweet_id)
-        sweet.quantity += qty
-        self.db.add(sweet)
+        if write_batcher.running:
+            return write_batcher.run(restock_op(sweet_id, qty))
+        try:
+            row = self.stage_restock(sweet_id, qty)
+        except HTTPException:
+            self.db.rollback()
+            raise
         self.db.commit()
-        self.db.refresh(sweet)
-        return sweet
\ No newline at end of file
+        after_stock_commit([row])
+        return row
+
+
+    def stage_restock(self, sweet_id: int, qty: int):
+        row = self.db.execute(restock_statement(sweet_id, qty)).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sweet not found")
+        for stmt, params in restock_writes(self.db.get_bind().dialect.name, row, qty):
+            self.db.execute(stmt, params)
+        return row
+
+
+    def record_sale(self, user_id: int, wanted: dict[int, int], rows: dict) -> int:
+        """Ledger and rollup writes for a sale; the caller owns the transaction."""
+        order_id = self.db.execute(INSERT_ORDER, order_params(user_id, wanted, rows)).scalar_one()
+        for stmt, params in sale_writes(self.db.get_bind().dialect.name, order_id, wanted, rows):
+            self.db.execute(stmt, params)
+        return order_id
@@ -0,0 +1,124 @@
+"""Revoked token ids, persisted in ``revoked_tokens`` and mirrored in memory.
+
+Checking a token is one dict lookup, so it runs on every authenticated
+request, cached principal or not.  Revocations made in this process go
+straight into the mirror and out on the invalidation bus, which reaches
+the other workers within milliseconds.  The periodic sync is the backstop
+for a message that was lost (or a single-process bus): it applies
+revocations from elsewhere within ``token_revocation_sync_seconds``.
+Rows and entries are dropped once the token they name has expired, since
+the JWT expiry check rejects it from then on.
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, select
+
+from app.core.database import dialect_insert
+from app.models.token import RevokedToken
+from app.services.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+REVOKED = RevokedToken.__table__
+# catch rows committed by other workers just behind the last one seen
+SYNC_OVERLAP = timedelta(seconds=1)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def revoke_statement(dialect: str, token_id: str, expires_at: datetime):
+    """INSERT of one revoked id; its rowcount is 0 if the id was already revoked."""
+    values = {"jti": token_id, "expires_at": expires_at, "revoked_at": utcnow()}
+    conflict_insert = dialect_insert(dialect)
+    if conflict_insert is None:
+        return insert(REVOKED).values(values)
+    return conflict_insert(REVOKED).values(values).on_conflict_do_nothing()
+
+
+class RevocationList:
+    def __init__(self):
+        # token id -> unix time it stops mattering
+        self._expiry: dict[str, float] = {}
+        self._synced_to: datetime | None = None
+        self._lock = threading.Lock()
+
+    def any_revoked(self, token_ids) -> bool:
+        expiry = self._expiry
+        for token_id in token_ids:
+            if token_id in expiry:
+                return True
+        return False
+
+    def add(self, token_id: str, expires_at: datetime) -> None:
+        self._expiry[token_id] = expires_at.timestamp()
+
+    def sync(self, bind) -> int:
+        """Load revocations committed since the last sync; returns rows read."""
+        with self._lock:
+            query = select(REVOKED.c.jti, REVOKED.c.expires_at, REVOKED.c.revoked_at).where(REVOKED.c.expires_at > utcnow())
+            if self._synced_to is not None:
+                query = query.where(REVOKED.c.revoked_at >= self._synced_to - SYNC_OVERLAP)
+            with bind.connect() as conn:
+                rows = conn.execute(query).all()
+            for row in rows:
+                self.add(row.jti, _aware(row.expires_at))
+                revoked_at = _aware(row.revoked_at)
+                if self._synced_to is None or revoked_at > self._synced_to:
+                    self._synced_to = revoked_at
+            if self._synced_to is None:
+                self._synced_to = utcnow()
+            return len(rows)
+
+    def evict_expired(self, bind) -> int:
+        """Drop ids whose tokens have expired, here and in the table."""
+        now = time.time()
+        for token_id in [token_id for token_id, expires in list(self._expiry.items()) if expires <= now]:
+            self._expiry.pop(token_id, None)
+        with bind.begin() as conn:
+            return conn.execute(delete(REVOKED).where(REVOKED.c.expires_at <= utcnow())).rowcount
+
+    def clear(self) -> None:
+        self._expiry.clear()
+        self._synced_to = None
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+revocations = RevocationList()
+
+
+def announce(revoked) -> None:
+    """Mirror committed ``(token id, expiry)`` pairs here and in the other workers."""
+    invalidation_bus.publish("revoked", {"ids": [[token_id, expiry.timestamp()] for token_id, expiry in revoked]})
+
+
+def _apply_revocations(change: dict) -> None:
+    for token_id, expires in change["ids"]:
+        revocations.add(token_id, datetime.fromtimestamp(expires, tz=timezone.utc))
+
+
+invalidation_bus.on("revoked", _apply_revocations)
+
+
+async def sync_revocations(bind, interval: float) -> None:
+    """Background loop started with the app; cancel the task to stop it."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(revocations.sync, bind)
+            await run_in_threadpool(revocations.evict_expired, bind)
+        except Exception:
+            logger.exception("Syncing revoked tokens failed")
@@ -0,0 +1,144 @@
+"""Group commit for stock writes.
+
+With the batcher running, purchases, checkouts and restocks are handed to a
+single writer thread instead of each committing on its own connection.  The
+writer drains whatever is queued (waiting up to ``max_delay`` for more, if
+set), runs each operation inside its own SAVEPOINT and commits them all in
+one transaction, so a burst of sales costs one fsync instead of one each.
+An operation that fails (out of stock, unknown sweet) rolls back to its
+savepoint and only its caller sees the error.
+
+Operations are callables taking the writer's ``Session`` and returning
+``(result, changed_rows)``; ``on_commit`` gets the changed rows of the whole
+batch once it is durable.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.timing import phase
+from app.utils.metrics import COUNT_BUCKETS, registry
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+batch_size = registry.histogram(
+    "sweetshop_write_batch_size",
+    "Stock writes committed per group-commit transaction.",
+    buckets=COUNT_BUCKETS,
+)
+
+_STOP = object()
+
+
+class WriteBatcher:
+    def __init__(self, max_ops: int, max_delay: float):
+        self.max_ops = max_ops
+        self.max_delay = max_delay
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._session_factory = None
+        self._on_commit = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, session_factory, on_commit=None) -> None:
+        if self._thread is not None:
+            return
+        self._session_factory = session_factory
+        self._on_commit = on_commit
+        self._thread = threading.Thread(target=self._run, name="write-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Commit whatever is queued, then stop the writer."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, op) -> Future:
+        future: Future = Future()
+        self._queue.put((op, future))
+        return future
+
+    def run(self, op):
+        """Submit ``op`` and block until its batch has committed."""
+        with phase("write_batch"):
+            return self.submit(op).result()
+
+    async def run_async(self, op):
+        with phase("write_batch"):
+            return await asyncio.wrap_future(self.submit(op))
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_ops:
+                try:
+                    timeout = deadline - time.monotonic()
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch) -> None:
+        outcomes = []
+        changed = []
+        try:
+            with self._session_factory() as db:
+                if db.get_bind().dialect.name == "sqlite":
+                    # take the write lock up front; without an open transaction the
+                    # first SAVEPOINT would start (and its RELEASE end) one of its own
+                    db.execute(text("BEGIN IMMEDIATE"))
+                for op, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with db.begin_nested():
+                            result, rows = op(db)
+                    except Exception as exc:
+                        outcomes.append((future, exc, False))
+                    else:
+                        outcomes.append((future, result, True))
+                        changed.extend(rows)
+                db.commit()
+        except Exception as exc:
+            logger.exception("Group commit of %d stock writes failed", len(batch))
+            for op, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        batch_size.observe(len(outcomes))
+        if self._on_commit is not None and changed:
+            try:
+                self._on_commit(changed)
+            except Exception:
+                # the batch is durable; callers get their results regardless
+                logger.exception("Post-commit hook for %d stock writes failed", len(changed))
+        for future, value, ok in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+write_batcher = WriteBatcher(settings.write_batch_max_ops, settings.write_batch_max_delay_ms / 1000)
@@ -0,0 +1,55 @@
+import base64
+import binascii
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import String, tuple_, type_coerce
+
+# Cursors carry the last row's whole sort key, (created_at, id), so the next
+# page does not depend on that row still existing.  created_at is read and
+# compared without type processing: SQLite stores it as text in whichever
+# format wrote it (server default or SQLAlchemy), and only the stored string
+# itself sorts correctly against its neighbours.
+CURSOR_KEY = "cursor_key"
+
+
+def cursor_key(created_at_column):
+    """Select this alongside the page's columns; ``split_page`` reads it."""
+    return type_coerce(created_at_column, String).label(CURSOR_KEY)
+
+
+def after_cursor(created_at_column, id_column, cursor: str, descending: bool = False):
+    """WHERE clause for the rows past ``cursor`` in (created_at, id) order."""
+    created_at, last_id = decode_cursor(cursor)
+    key = tuple_(type_coerce(created_at_column, String), id_column)
+    bound = tuple_(type_coerce(created_at, String), last_id)
+    return key < bound if descending else key > bound
+
+
+def encode_cursor(created_at, last_id: int) -> str:
+    # text from SQLite, a datetime from drivers that parse timestamps themselves
+    stamp = f"d{created_at.isoformat()}" if isinstance(created_at, datetime) else f"s{created_at}"
+    return base64.urlsafe_b64encode(f"{stamp}|{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        stamp, _, last_id = raw.rpartition("|")
+        kind, created_at = stamp[:1], stamp[1:]
+        if kind == "d":
+            return datetime.fromisoformat(created_at), int(last_id)
+        if kind == "s":
+            return created_at, int(last_id)
+        raise ValueError(cursor)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def split_page(rows, limit: int):
+    """Trim the look-ahead row; returns ``(rows, next_cursor or None)``."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(getattr(last, CURSOR_KEY), last.id)
+    return rows, None
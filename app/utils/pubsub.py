@@ -0,0 +1,161 @@
+"""Publish/subscribe transports for the invalidation bus.
+
+Each transport speaks the subset of the redis-py client API the bus uses:
+``publish(channel, message)`` and ``pubsub()``, whose ``subscribe(*channels)``,
+``get_message(ignore_subscribe_messages=True, timeout=...)`` and ``close()``
+behave like redis-py's.  A ``redis.Redis`` client can therefore be used as is.
+``LocalPubSub`` only reaches subscribers in the same process.
+``SQLitePubSub`` is a local stand-in for Redis that every process opening the
+same file shares.
+"""
+import queue
+import sqlite3
+import threading
+import time
+
+
+def _message(channel: str, data) -> dict:
+    return {"type": "message", "pattern": None, "channel": channel, "data": data}
+
+
+class LocalPubSub:
+    """In-process delivery, for a single worker."""
+
+    def __init__(self):
+        self._subscribers: dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.queue.put(_message(channel, message))
+        return len(subscribers)
+
+    def pubsub(self) -> "_LocalSubscription":
+        return _LocalSubscription(self)
+
+    def close(self) -> None:
+        pass
+
+
+class _LocalSubscription:
+    def __init__(self, hub: LocalPubSub):
+        self.hub = hub
+        self.queue: queue.Queue = queue.Queue()
+        self.channels: set[str] = set()
+
+    def subscribe(self, *channels: str) -> None:
+        with self.hub._lock:
+            for channel in channels:
+                self.hub._subscribers.setdefault(channel, set()).add(self)
+        self.channels.update(channels)
+
+    def get_message(self, ignore_subscribe_messages: bool = True, timeout: float = 0.0) -> dict | None:
+        try:
+            return self.queue.get(timeout=timeout) if timeout else self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        with self.hub._lock:
+            for channel in self.channels:
+                self.hub._subscribers.get(channel, set()).discard(self)
+        self.channels.clear()
+
+
+class SQLitePubSub:
+    """Messages appended to a SQLite file and read back by every process.
+
+    Subscribers poll ``PRAGMA data_version``, which changes only when another
+    connection commits, so an idle poll costs no query.  Rows older than
+    ``retention`` seconds are deleted now and then by publishers.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS bus_messages "
+        "(id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, data TEXT NOT NULL, created REAL NOT NULL)"
+    )
+    PRUNE_EVERY = 256
+
+    def __init__(self, path: str, poll_interval: float = 0.002, retention: float = 60.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._local = threading.local()
+        self._published = 0
+        self._connect().execute(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.open_connection()
+            self._local.conn = conn
+        return conn
+
+    def open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        return conn
+
+    def publish(self, channel: str, message) -> int:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("INSERT INTO bus_messages (channel, data, created) VALUES (?, ?, ?)", (channel, message, now))
+        self._published += 1
+        if self._published % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM bus_messages WHERE created < ?", (now - self.retention,))
+        # receivers are unknown here; redis-py returns their count
+        return 0
+
+    def pubsub(self) -> "_SQLiteSubscription":
+        return _SQLiteSubscription(self)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _SQLiteSubscription:
+    def __init__(self, hub: SQLitePubSub):
+        self.hub = hub
+        self.conn = hub.open_connection()
+        self.channels: set[str] = set()
+        self.pending: list[dict] = []
+        # only messages published after subscribing are delivered
+        self.last_id = self.conn.execute("SELECT coalesce(max(id), 0) FROM bus_messages").fetchone()[0]
+        self.data_version = None
+
+    def subscribe(self, *channels: str) -> None:
+        self.channels.update(channels)
+
+    def get_message(self, ignore_subscribe_messages: bool = True, timeout: float = 0.0) -> dict | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self.pending:
+                self._poll()
+            if self.pending:
+                return self.pending.pop(0)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.hub.poll_interval, remaining))
+
+    def _poll(self) -> None:
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.data_version:
+            return
+        self.data_version = version
+        rows = self.conn.execute(
+            "SELECT id, channel, data FROM bus_messages WHERE id > ? ORDER BY id", (self.last_id,)
+        ).fetchall()
+        for row_id, channel, data in rows:
+            self.last_id = row_id
+            if channel in self.channels:
+                self.pending.append(_message(channel, data))
+
+    def close(self) -> None:
+        self.conn.close()
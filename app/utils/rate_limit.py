@@ -0,0 +1,128 @@
+"""Token-bucket rate limit backends.
+
+``MemoryBackend`` keeps buckets in process, split across shards so
+concurrent callers rarely share a lock.  ``SQLiteBackend`` is a stand-in
+for a shared store: every process pointing at the same file shares the
+buckets, with each decision made by one atomic UPSERT.  Anything
+implementing ``RateLimitBackend`` (e.g. a Redis script) can replace either.
+
+``acquire`` is awaited on the event loop for every limited request, so a
+backend that does blocking I/O must do it off the loop, as ``SQLiteBackend``
+does in a worker thread.
+"""
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+import anyio
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: int
+    # seconds until the bucket is full again / until the next token
+    reset_after: float
+    retry_after: float
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Decision:
+        """Take ``cost`` tokens from ``key``'s bucket if it has them."""
+
+    def close(self) -> None:
+        pass
+
+
+def _decide(tokens: float, rate: float, burst: int, cost: float, allowed: bool) -> Decision:
+    if allowed:
+        return Decision(True, math.floor(tokens), (burst - tokens) / rate, 0.0)
+    return Decision(False, math.floor(tokens), (burst - tokens) / rate, (cost - tokens) / rate)
+
+
+class MemoryBackend(RateLimitBackend):
+    def __init__(self, shards: int = 64, max_keys_per_shard: int = 10_000):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+
+    async def acquire(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Decision:
+        # a dict update under an uncontended lock; cheaper than a thread hop
+        buckets, lock = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            state = buckets.pop(key, None)
+            if state is None:
+                tokens = float(burst)
+            else:
+                tokens = min(burst, state[0] + (now - state[1]) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            # re-inserted last, so the first key is the least recently used
+            buckets[key] = (tokens, now)
+            if len(buckets) > self.max_keys_per_shard:
+                del buckets[next(iter(buckets))]
+        return _decide(tokens, rate, burst, cost, allowed)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """Buckets in a SQLite file, shared by every process that opens it."""
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS rate_limit_buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+    TAKE = """
+        INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (:key, :burst - :cost, :now)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = min(:burst, tokens + (:now - updated) * :rate) - :cost,
+            updated = :now
+        WHERE min(:burst, tokens + (:now - updated) * :rate) >= :cost
+        RETURNING tokens
+    """
+    PEEK = "SELECT min(:burst, tokens + (:now - updated) * :rate) FROM rate_limit_buckets WHERE key = :key"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    async def acquire(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Decision:
+        # the UPSERT can wait up to the busy timeout for another process's write lock
+        return await anyio.to_thread.run_sync(self.take, key, rate, burst, cost)
+
+    def take(self, key: str, rate: float, burst: int, cost: float = 1.0) -> Decision:
+        """``acquire``, blocking the calling thread."""
+        conn = self._connect()
+        # wall clock, not monotonic: the timestamps are shared between processes
+        params = {"key": key, "rate": rate, "burst": burst, "cost": cost, "now": time.time()}
+        row = conn.execute(self.TAKE, params).fetchone()
+        if row is not None:
+            return _decide(row[0], rate, burst, cost, True)
+        peek = conn.execute(self.PEEK, params).fetchone()
+        return _decide(peek[0] if peek else 0.0, rate, burst, cost, False)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def parse_rate(value: str) -> tuple[float, int] | None:
+    """``"10/minute"`` -> ``(10 / 60, 10)``: refill per second and burst; ``""`` -> ``None``."""
+    if not value:
+        return None
+    count, _, period = value.partition("/")
+    seconds = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}[period.strip().lower() or "second"]
+    burst = int(count)
+    return burst / seconds, burst
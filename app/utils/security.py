@@ -1,40 +1,147 @@
+import asyncio
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from app.core.config import get_settings
+from app.core.timing import phase
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """The shared CryptContext, built on first use rather than at import."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
 
 # ✅ use correct field name
 SECRET_KEY = settings.jwt_secret_key
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+REFRESH_TOKEN_TYPE = "refresh"
 
 
 def hash_password(password: str) -> str:
     # bcrypt passwords can only be up to 72 bytes long
-    return pwd_context.hash(password[:72])
+    return get_pwd_context().hash(password[:72])
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+class HashingPoolFull(RuntimeError):
+    """Raised when the bcrypt pool already has as much work as it may queue."""
+
+
+class BcryptPool:
+    """Size-limited process pool for bcrypt, kept off the request threadpool."""
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the server process is multi-threaded
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolFull()
+        try:
+            loop = asyncio.get_running_loop()
+            with phase("bcrypt"):
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
 
 
-def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
-    """Create a JWT token with email as the 'sub' field."""
-    to_encode = {"sub": subject}
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+bcrypt_pool = BcryptPool(settings.bcrypt_workers, settings.bcrypt_queue_size)
+
+
+def create_access_token(
+    subject: str,
+    expires_delta: timedelta | None = None,
+    uid: int | None = None,
+    role: str | None = None,
+    family: str | None = None,
+) -> str:
+    """Create a JWT token with email as the 'sub' field.
+
+    When ``uid`` and ``role`` are given they are embedded as claims so that
+    authenticated requests can be authorized without a users-table lookup.
+    The ``jti`` claim lets the token be revoked before it expires; ``family``
+    ties it to the refresh-token chain it was issued with, which can be
+    revoked as a whole.
+    """
+    now = datetime.utcnow()
+    to_encode = {"sub": subject, "iat": now, "jti": uuid.uuid4().hex}
+    if uid is not None:
+        to_encode["uid"] = uid
+    if role is not None:
+        to_encode["role"] = role
+    if family is not None:
+        to_encode["fam"] = family
+    expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def create_refresh_token(subject: str, uid: int, family: str) -> str:
+    """A single-use refresh token.  Every token rotated from one login shares
+    its ``fam`` claim, so a replayed token can revoke the whole chain."""
+    now = datetime.utcnow()
+    to_encode = {
+        "sub": subject,
+        "uid": uid,
+        "typ": REFRESH_TOKEN_TYPE,
+        "jti": uuid.uuid4().hex,
+        "fam": family,
+        "iat": now,
+        "exp": now + timedelta(days=settings.refresh_token_expires_days),
+    }
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def new_token_family() -> str:
+    return uuid.uuid4().hex
+
+
+def decode_refresh_token(token: str) -> dict | None:
+    payload = decode_token(token)
+    if not payload or payload.get("typ") != REFRESH_TOKEN_TYPE:
+        return None
+    if not all(payload.get(claim) for claim in ("sub", "uid", "jti", "fam")):
+        return None
+    return payload
+
+
 def decode_token(token: str) -> dict | None:
     """Decode JWT token and return payload as dictionary."""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with phase("jwt"):
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload  # ✅ Return full decoded dictionary
     except JWTError:
         return None
@@ -0,0 +1,138 @@
+"""Analytics read latency from the rollups vs an on-the-fly GROUP BY, as history grows.
+
+Order history is appended synthetically (spread over the past year, a
+fixed catalog of sweets) until each ``--lines`` size is reached; the
+rollups are then rebuilt with ``AnalyticsService.rebuild`` and both read
+paths are timed over the same 30-day window.  Rollup reads are bounded by
+rows per day times days (at most catalog size x window for best-sellers),
+so they stop growing once every sweet sells daily; the naive path keeps
+growing with history.
+
+    python -m benchmarks.analytics_rollups --lines 10000 100000 1000000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import create_schema, insert_synthetic_sweets, make_user, summarize, use_temp_database
+
+
+def append_history(conn, user_id: int, sweets: int, start_line: int, lines: int, rng: random.Random):
+    from sqlalchemy import func, insert, select
+
+    from app.models.order import Order, OrderLine
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    next_order = (conn.execute(select(func.max(Order.id))).scalar() or 0) + 1
+    orders, order_lines = [], []
+    written = 0
+    while written < lines:
+        created = now - timedelta(seconds=rng.randrange(365 * 86400))
+        basket = min(rng.randint(1, 3), lines - written)
+        picks = [rng.randint(1, sweets) for _ in range(basket)]
+        total = 0.0
+        for sweet_id in picks:
+            price = 10 + sweet_id % 90
+            total += price
+            order_lines.append({
+                "order_id": next_order, "sweet_id": sweet_id, "name": f"Sweet {sweet_id}",
+                "category": f"Category {sweet_id % 7}", "unit_price": price, "quantity": 1,
+            })
+        orders.append({"id": next_order, "user_id": user_id, "total": total, "created_at": created})
+        next_order += 1
+        written += basket
+        if len(order_lines) >= 50_000:
+            conn.execute(insert(Order.__table__), orders)
+            conn.execute(insert(OrderLine.__table__), order_lines)
+            orders, order_lines = [], []
+    if orders:
+        conn.execute(insert(Order.__table__), orders)
+        conn.execute(insert(OrderLine.__table__), order_lines)
+
+
+def naive_best_sellers(db, days: int, limit: int = 10):
+    from sqlalchemy import func, select
+
+    from app.models.order import Order, OrderLine
+
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    units = func.sum(OrderLine.quantity)
+    return db.execute(
+        select(OrderLine.sweet_id, units, func.sum(OrderLine.quantity * OrderLine.unit_price))
+        .join(Order, Order.id == OrderLine.order_id)
+        .where(Order.created_at >= since)
+        .group_by(OrderLine.sweet_id)
+        .order_by(units.desc())
+        .limit(limit)
+    ).all()
+
+
+def naive_revenue_by_category(db, days: int):
+    from sqlalchemy import func, select
+
+    from app.models.order import Order, OrderLine
+
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    return db.execute(
+        select(OrderLine.category, func.sum(OrderLine.quantity), func.sum(OrderLine.quantity * OrderLine.unit_price))
+        .join(Order, Order.id == OrderLine.order_id)
+        .where(Order.created_at >= since)
+        .group_by(OrderLine.category)
+    ).all()
+
+
+def timed(fn, repeat: int) -> dict:
+    latencies = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--sweets", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    from app.core.database import SessionLocal, engine
+    from app.models.user import User
+    from app.services.analytics_service import AnalyticsService
+
+    insert_synthetic_sweets(args.sweets)
+    make_user("analyst@example.com")
+    with SessionLocal() as db:
+        user_id = db.query(User.id).scalar()
+
+    rng = random.Random(7)
+    have = 0
+    for size in sorted(args.lines):
+        with engine.begin() as conn:
+            append_history(conn, user_id, args.sweets, have, size - have, rng)
+        have = size
+        with SessionLocal() as db:
+            svc = AnalyticsService(db)
+            t0 = time.perf_counter()
+            svc.rebuild()
+            rebuild_s = time.perf_counter() - t0
+            row = {
+                "history_lines": size,
+                "rebuild_s": round(rebuild_s, 3),
+                "rebuild_lines_per_sec": round(size / rebuild_s, 1),
+                "rollup_best_sellers": timed(lambda: svc.best_sellers(days=args.days), args.repeat),
+                "rollup_revenue_by_category": timed(lambda: svc.revenue_by_category(days=args.days), args.repeat),
+                "naive_best_sellers": timed(lambda: naive_best_sellers(db, args.days), max(3, args.repeat // 10)),
+                "naive_revenue_by_category": timed(lambda: naive_revenue_by_category(db, args.days), max(3, args.repeat // 10)),
+            }
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Requests/sec and tail latency for the sync (threadpool) and async DB stacks.
+
+Each mode runs in its own uvicorn process with the catalog cache disabled, so
+every read reaches the database.  Clients issue a mix of catalog page reads,
+single-sweet reads and purchases.
+
+    python -m benchmarks.async_vs_sync --concurrency 64 256 --seconds 10
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from benchmarks.common import (
+    Client,
+    create_schema,
+    insert_synthetic_sweets,
+    make_user,
+    serve_process,
+    summarize,
+    use_temp_database,
+)
+
+
+def drive(address, token, sweet_count, seconds, concurrency):
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed):
+        rng = random.Random(seed)
+        client = Client(address, token)
+        local, local_err = [], 0
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            sweet_id = rng.randint(1, sweet_count)
+            if roll < 0.5:
+                method, path = "GET", "/api/sweets/?limit=20"
+            elif roll < 0.9:
+                method, path = "GET", f"/api/sweets/{sweet_id}"
+            else:
+                method, path = "POST", f"/api/sweets/{sweet_id}/purchase"
+            t0 = time.perf_counter()
+            code, _ = client.request(method, path)
+            local.append(time.perf_counter() - t0)
+            local_err += code >= 500
+        client.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_err
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {"requests_per_sec": round(len(latencies) / elapsed, 1), "errors": errors[0], **summarize(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--sweets", type=int, default=1000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    insert_synthetic_sweets(args.sweets)
+    token = make_user("loadtest@bench.local")
+
+    for mode in ("sync", "async"):
+        env = {"DB_ASYNC": str(mode == "async").lower(), "CATALOG_CACHE_SIZE": "0"}
+        with serve_process(env=env) as address:
+            drive(address, token, args.sweets, 1.0, 4)  # warm up
+            for concurrency in args.concurrency:
+                row = {"mode": mode, "concurrency": concurrency, **drive(address, token, args.sweets, args.seconds, concurrency)}
+                print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Latency of POST /api/sweets/{id}/purchase with and without the auth fast path.
+
+"before" uses a subject-only token with the principal cache disabled, so every
+request decodes the JWT and looks the user up by email.  "after" uses a token
+carrying uid/role claims with the principal cache on.
+
+    python -m benchmarks.auth_fast_path --requests 2000 --concurrency 8
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.common import Client, create_schema, make_sweet, make_user, serve, summarize, use_temp_database
+
+
+def run(address, token, sweet_id, requests, concurrency):
+    latencies = []
+    lock = threading.Lock()
+    per_thread = requests // concurrency
+
+    def worker():
+        client = Client(address, token)
+        local = []
+        for _ in range(per_thread):
+            t0 = time.perf_counter()
+            code, _ = client.request("POST", f"/api/sweets/{sweet_id}/purchase")
+            local.append(time.perf_counter() - t0)
+            assert code == 200, code
+        client.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app.main import app
+    from app.services import auth_service
+    from app.utils.security import create_access_token
+
+    create_schema()
+    token = make_user("latency@bench.local")
+    legacy_token = create_access_token(subject="latency@bench.local")
+    sweet_id = make_sweet(4 * args.requests)
+    cache_size = auth_service.principal_cache.maxsize
+
+    with serve(app) as address:
+        run(address, token, sweet_id, 200, 4)  # warm up
+
+        auth_service.principal_cache.maxsize = 0
+        auth_service.principal_cache.clear()
+        before = run(address, legacy_token, sweet_id, args.requests, args.concurrency)
+
+        auth_service.principal_cache.maxsize = cache_size
+        after = run(address, token, sweet_id, args.requests, args.concurrency)
+
+    print(json.dumps({"concurrency": args.concurrency, "before": before, "after": after}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Rows/sec for the bulk CSV / NDJSON import and the streaming export.
+
+Each size is imported into an empty catalog, then re-imported with ids so
+every row takes the upsert path, then exported.  For comparison the same
+rows are also created one at a time through ``POST /api/sweets/``.
+
+    python -m benchmarks.bulk_import_export --rows 50000 --single 2000
+"""
+import argparse
+import csv
+import io
+import json
+import time
+
+from benchmarks.common import (
+    BASES,
+    CATEGORIES,
+    FLAVOURS,
+    Client,
+    create_schema,
+    make_user,
+    serve_process,
+    use_temp_database,
+)
+
+FIELDS = ["name", "category", "description", "price", "quantity"]
+
+
+def rows(count: int, with_ids: bool = False):
+    for i in range(count):
+        row = {
+            "name": f"{FLAVOURS[i % len(FLAVOURS)]} {BASES[i % len(BASES)]} {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": f"Supplier line {i}, made with ghee and sugar.",
+            "price": 10 + (i % 90),
+            "quantity": i % 50,
+        }
+        yield {"id": i + 1, **row} if with_ids else row
+
+
+def as_csv(count: int, with_ids: bool = False) -> bytes:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=(["id"] if with_ids else []) + FIELDS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows(count, with_ids))
+    return out.getvalue().encode()
+
+
+def as_ndjson(count: int, with_ids: bool = False) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows(count, with_ids)).encode()
+
+
+def upload(client: Client, body: bytes, content_type: str) -> dict:
+    client.conn.request(
+        "POST", "/api/sweets/bulk", body=body,
+        headers={"Authorization": client.headers["Authorization"], "Content-Type": content_type},
+    )
+    resp = client.conn.getresponse()
+    return json.loads(resp.read())
+
+
+def timed(label: str, count: int, fn) -> dict:
+    t0 = time.perf_counter()
+    extra = fn()
+    elapsed = time.perf_counter() - t0
+    return {"case": label, "rows": count, "seconds": round(elapsed, 3), "rows_per_sec": round(count / elapsed, 1), **(extra or {})}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--single", type=int, default=2000, help="rows for the one-at-a-time baseline")
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    token = make_user("admin@example.com", role="admin")
+
+    with serve_process() as address:
+        client = Client(address, token)
+
+        def one_by_one():
+            for row in rows(args.single):
+                client.request("POST", "/api/sweets/", row)
+
+        print(json.dumps(timed("single POST /api/sweets/", args.single, one_by_one)))
+
+        for fmt, encode, content_type in (("csv", as_csv, "text/csv"), ("ndjson", as_ndjson, "application/x-ndjson")):
+            inserts, upserts = encode(args.rows), encode(args.rows, with_ids=True)
+
+            def report(body, content_type=content_type):
+                result = upload(client, body, content_type)
+                return {"accepted": result["accepted"], "rejected": result["rejected"]}
+
+            print(json.dumps(timed(f"bulk {fmt} insert", args.rows, lambda: report(inserts))))
+            print(json.dumps(timed(f"bulk {fmt} upsert", args.rows, lambda: report(upserts))))
+
+            def export(fmt=fmt):
+                client.conn.request("GET", f"/api/sweets/export?format={fmt}", headers=client.headers)
+                resp = client.conn.getresponse()
+                size = 0
+                while chunk := resp.read(1 << 16):
+                    size += len(chunk)
+                return {"bytes": size}
+
+            # the export covers everything imported so far
+            exported = args.single + args.rows * (2 if fmt == "ndjson" else 1)
+            print(json.dumps(timed(f"export {fmt}", exported, export)))
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Cost of a dashboard polling GET /api/sweets/ with the catalog cache.
+
+Measures the same page uncached, as a cache hit, and as an ETag
+revalidation answered with 304, then prints the cache's counters.
+
+    python -m benchmarks.catalog_cache --rows 1000 --requests 2000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import Client, create_schema, insert_synthetic_sweets, serve, summarize, use_temp_database
+
+
+def poll(client, requests, headers=None):
+    latencies = []
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        code, _ = client.request("GET", "/api/sweets/?limit=100", headers=headers)
+        latencies.append(time.perf_counter() - t0)
+        assert code in (200, 304), code
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app.main import app
+    from app.services.catalog_cache import catalog_cache
+
+    create_schema()
+    insert_synthetic_sweets(args.rows)
+    cache_size = catalog_cache._entries.maxsize
+
+    with serve(app) as address:
+        client = Client(address)
+        catalog_cache._entries.maxsize = 0
+        uncached = poll(client, args.requests)
+
+        catalog_cache._entries.maxsize = cache_size
+        hits = poll(client, args.requests)
+        etag = client.last_headers["ETag"]
+        revalidated = poll(client, args.requests, headers={"If-None-Match": etag})
+        client.close()
+
+    print(json.dumps({
+        "uncached": uncached,
+        "cache_hit": hits,
+        "if_none_match_304": revalidated,
+        "counters": catalog_cache.stats(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
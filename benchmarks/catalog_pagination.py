@@ -0,0 +1,83 @@
+"""First-page cost of GET /api/sweets on a large synthetic catalog.
+
+Compares loading the whole catalog as ORM entities (the old behaviour) with
+a keyset page and a projected keyset page, measuring latency over HTTP and
+peak Python heap via tracemalloc.
+
+    python -m benchmarks.catalog_pagination --rows 1000000 --limit 100
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import Client, create_schema, insert_synthetic_sweets, serve, summarize, use_temp_database
+
+
+def timed(fn, repeat):
+    latencies = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies)
+
+
+def peak_kib(fn):
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--skip-full", action="store_true", help="skip the full ORM load (slow at 1M rows)")
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.models.sweet import Sweet
+    from app.schemas.sweet import SweetRead
+
+    create_schema()
+    t0 = time.perf_counter()
+    insert_synthetic_sweets(args.rows)
+    print(f"inserted {args.rows} rows in {time.perf_counter() - t0:.1f}s")
+
+    def full_orm_load():
+        with SessionLocal() as db:
+            rows = db.query(Sweet).order_by(Sweet.created_at.asc()).all()
+            [SweetRead.model_validate(row).model_dump_json() for row in rows]
+
+    result = {"rows": args.rows, "limit": args.limit}
+    with serve(app) as address:
+        client = Client(address)
+        client.request("GET", f"/api/sweets/?limit={args.limit}")
+        cursor = client.last_headers["X-Next-Cursor"]
+
+        def page():
+            client.request("GET", f"/api/sweets/?limit={args.limit}")
+
+        def cursor_page():
+            client.request("GET", f"/api/sweets/?limit={args.limit}&cursor={cursor}")
+
+        def projected():
+            client.request("GET", f"/api/sweets/?limit={args.limit}&fields=id,name,price")
+
+        result["keyset_first_page"] = {"latency": timed(page, args.repeat), "peak_kib": peak_kib(page)}
+        result["keyset_next_page"] = {"latency": timed(cursor_page, args.repeat), "peak_kib": peak_kib(cursor_page)}
+        result["projected_first_page"] = {"latency": timed(projected, args.repeat), "peak_kib": peak_kib(projected)}
+        client.close()
+    if not args.skip_full:
+        result["full_orm_load"] = {"latency": timed(full_orm_load, 1), "peak_kib": peak_kib(full_orm_load)}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
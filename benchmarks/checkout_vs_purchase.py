@@ -0,0 +1,63 @@
+"""Per-item cost of POST /api/sweets/checkout versus the per-unit purchase route.
+
+Each round buys the same basket (``--items`` distinct sweets, ``--units`` of
+each) once through repeated single-unit purchases and once as one checkout.
+
+    python -m benchmarks.checkout_vs_purchase --items 10 --units 1 --rounds 50
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import Client, create_schema, make_sweet, make_user, serve, use_temp_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--units", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app.main import app
+
+    create_schema()
+    token = make_user("basket@bench.local")
+    stock = 2 * args.rounds * args.units
+    sweet_ids = [make_sweet(stock, name=f"Bench Sweet {i}") for i in range(args.items)]
+    basket = [{"sweet_id": sweet_id, "quantity": args.units} for sweet_id in sweet_ids]
+    units_per_round = args.items * args.units
+
+    with serve(app) as address:
+        client = Client(address, token)
+
+        t0 = time.perf_counter()
+        for _ in range(args.rounds):
+            for line in basket:
+                for _ in range(line["quantity"]):
+                    code, _ = client.request("POST", f"/api/sweets/{line['sweet_id']}/purchase")
+                    assert code == 200, code
+        per_unit = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for _ in range(args.rounds):
+            code, _ = client.request("POST", "/api/sweets/checkout", {"items": basket})
+            assert code == 200, code
+        checkout = time.perf_counter() - t0
+        client.close()
+
+    units = args.rounds * units_per_round
+    result = {
+        "basket_items": args.items,
+        "units_per_item": args.units,
+        "rounds": args.rounds,
+        "per_unit_endpoint_us_per_item": round(per_unit / units * 1e6, 1),
+        "checkout_us_per_item": round(checkout / units * 1e6, 1),
+        "speedup": round(per_unit / checkout, 2),
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
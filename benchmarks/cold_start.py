@@ -0,0 +1,104 @@
+"""Cold start: import cost of ``app.main`` and time to first response.
+
+The import profile comes from ``python -X importtime -c "import app.main"``
+and lists the modules with the largest cumulative import time.  Time to
+first response starts a fresh uvicorn process per run and polls
+``GET /api/sweets/`` until it answers 200, for each worker count and schema
+mode.  ``alembic (fresh)`` migrates an empty database on startup,
+``alembic`` finds it already at head, ``none`` skips the schema step.
+
+    python -m benchmarks.cold_start --workers 1 2 4 --runs 5
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import free_port, use_temp_database
+
+
+def import_profile(top: int) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    total = next(cumulative for name, _, cumulative in modules if name == "app.main")
+    app_modules = [m for m in modules if m[0].startswith("app.")]
+    return {
+        "import_app_main_ms": round(total / 1000, 1),
+        "app_modules_self_ms": round(sum(m[1] for m in app_modules) / 1000, 1),
+        "slowest": [
+            {"module": name, "self_ms": round(s / 1000, 1), "cumulative_ms": round(c / 1000, 1)}
+            for name, s, c in sorted(modules, key=lambda m: m[2], reverse=True)[:top]
+        ],
+    }
+
+
+def time_to_first_response(workers: int, env: dict, timeout: float = 60.0) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning",
+         "--workers", str(workers)],
+        env={**os.environ, **env},
+    )
+    try:
+        while True:
+            # with --workers the supervisor binds the socket before any worker can answer
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/api/sweets/")
+                status = conn.getresponse().status
+                conn.close()
+                if status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                pass
+            if proc.poll() is not None or time.perf_counter() - started > timeout:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(json.dumps(import_profile(args.top)))
+
+    for workers in args.workers:
+        timings = {"alembic (fresh)": [], "alembic": [], "none": []}
+        for run in range(args.runs):
+            use_temp_database(f"cold-{workers}-{run}.db")
+            timings["alembic (fresh)"].append(time_to_first_response(workers, {"DB_SCHEMA": "alembic"}))
+            timings["alembic"].append(time_to_first_response(workers, {"DB_SCHEMA": "alembic"}))
+            timings["none"].append(time_to_first_response(workers, {"DB_SCHEMA": "none"}))
+        for mode, values in timings.items():
+            print(json.dumps({
+                "workers": workers,
+                "db_schema": mode,
+                "median_ms": round(statistics.median(values) * 1000, 1),
+                "min_ms": round(min(values) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1),
+            }))
+
+
+if __name__ == "__main__":
+    main()
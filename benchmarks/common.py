@@ -0,0 +1,204 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite file, never ``sweet_shop.db``.
+Call ``use_temp_database()`` before importing anything from ``app`` because
+settings and the engine are built at import time.  It also switches rate
+limiting off unless ``RATE_LIMIT_ENABLED`` is already set.
+"""
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+
+def use_temp_database(name: str = "bench.db") -> str:
+    directory = tempfile.mkdtemp(prefix="sweet-bench-")
+    url = f"sqlite:///{os.path.join(directory, name)}"
+    os.environ["DATABASE_URL"] = url
+    # benchmarks measure the endpoints, not the throttle in front of them
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    return url
+
+
+def create_schema():
+    from app.core.database import engine
+    from app.models import analytics, idempotency, order, reservation, sweet, token, user  # noqa: F401 - ensure models are imported
+    from app.models.base import Base
+    from app.services.search_index import install_search_index
+
+    Base.metadata.create_all(bind=engine)
+    install_search_index(engine)
+
+
+def make_user(email: str, role: str = "user", password: str = "benchpass123") -> str:
+    """Insert a user directly and return a bearer token for it."""
+    from app.core.database import SessionLocal
+    from app.models.user import User
+    from app.utils.security import create_access_token, hash_password
+
+    with SessionLocal() as db:
+        user = User(email=email, full_name=email, password_hash=hash_password(password), role=role)
+        db.add(user)
+        db.commit()
+        return create_access_token(subject=email, uid=user.id, role=role)
+
+
+def make_sweet(quantity: int, price: float = 10.0, name: str = "Bench Ladoo") -> int:
+    from app.core.database import SessionLocal
+    from app.models.sweet import Sweet
+
+    with SessionLocal() as db:
+        sweet = Sweet(name=name, category="Bench", description="benchmark row", price=price, quantity=quantity)
+        db.add(sweet)
+        db.commit()
+        return sweet.id
+
+
+CATEGORIES = ("Traditional", "Milk Sweet", "Dry Fruit", "Festive", "Bengali", "Fusion", "Coconut")
+FLAVOURS = ("Kesar", "Pista", "Rose", "Elaichi", "Chocolate", "Mango", "Badam", "Gur", "Coconut", "Kaju")
+BASES = ("Barfi", "Ladoo", "Halwa", "Peda", "Katli", "Jamun", "Sandesh", "Rasgulla", "Jalebi", "Kalakand", "Modak")
+
+
+def insert_synthetic_sweets(count: int, start: int = 0, batch: int = 50_000) -> None:
+    """Bulk-insert ``count`` generated sweets with executemany batches."""
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import insert
+
+    from app.core.database import engine
+    from app.models.sweet import Sweet
+
+    epoch = datetime(2024, 1, 1)
+    end = start + count
+    with engine.begin() as conn:
+        for offset in range(start, end, batch):
+            rows = [
+                {
+                    "name": f"{FLAVOURS[i % len(FLAVOURS)]} {BASES[(i // 10) % len(BASES)]} {i}",
+                    "category": CATEGORIES[i % len(CATEGORIES)],
+                    "description": f"Batch {i // 1000} sweet made with ghee, sugar and {FLAVOURS[(i // 7) % len(FLAVOURS)].lower()}.",
+                    "price": 10 + (i % 90),
+                    "quantity": i % 50,
+                    "created_at": epoch + timedelta(seconds=i // 3),
+                }
+                for i in range(offset, min(end, offset + batch))
+            ]
+            conn.execute(insert(Sweet), rows)
+
+
+def insert_synthetic_users(count: int, password: str = "benchpass123", admins: int = 0, batch: int = 50_000) -> None:
+    """Bulk-insert ``user{n}@example.com`` (and ``admin{n}@example.com``) sharing one password hash."""
+    from sqlalchemy import insert
+
+    from app.core.database import engine
+    from app.models.user import User
+    from app.utils.security import hash_password
+
+    password_hash = hash_password(password)
+    people = [(f"admin{n}@example.com", "admin") for n in range(admins)]
+    people += [(f"user{n}@example.com", "user") for n in range(count)]
+    with engine.begin() as conn:
+        for offset in range(0, len(people), batch):
+            rows = [
+                {"email": email, "full_name": email.split("@")[0], "password_hash": password_hash, "role": role}
+                for email, role in people[offset:offset + batch]
+            ]
+            conn.execute(insert(User), rows)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve(app, port: int | None = None):
+    """Run ``app`` under uvicorn in a background thread and yield its host/port."""
+    import uvicorn
+
+    port = port or free_port()
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield ("127.0.0.1", port)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+@contextmanager
+def serve_process(app_path: str = "app.main:app", env: dict | None = None, args: tuple = (), command: tuple | None = None):
+    """Run the API as a separate uvicorn process so the load generator does
+    not share a GIL with the server.  ``command`` replaces
+    ``-m uvicorn <app_path>``, e.g. ``("-m", "app.server")``."""
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, *(command or ("-m", "uvicorn", app_path)), "--port", str(port), "--log-level", "warning", *args],
+        env={**os.environ, **(env or {})},
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                time.sleep(0.05)
+        yield ("127.0.0.1", port)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+class Client:
+    """Minimal keep-alive HTTP client; one instance per thread."""
+
+    def __init__(self, address, token: str | None = None):
+        self.conn = http.client.HTTPConnection(*address, timeout=60)
+        self.headers = {"Content-Type": "application/json"}
+        self.last_headers = None
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def request(self, method: str, path: str, body=None, headers: dict | None = None):
+        payload = json.dumps(body) if body is not None else None
+        self.conn.request(method, path, body=payload, headers={**self.headers, **(headers or {})})
+        resp = self.conn.getresponse()
+        self.last_headers = resp.headers
+        return resp.status, resp.read()
+
+    def close(self):
+        self.conn.close()
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies) -> dict:
+    """Latency summary in milliseconds."""
+    return {
+        "count": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
@@ -0,0 +1,88 @@
+"""Bytes on the wire and CPU per request for catalog reads, by content coding.
+
+Calls the full ASGI app in-process (no sockets, so CPU time is the app's own)
+for cached catalog pages under three modes:
+
+* ``identity``: client sends no ``Accept-Encoding``;
+* ``compress per request``: the middleware compresses the cached body every time;
+* ``precompressed``: the catalog cache memoizes the compressed body per version.
+
+    python -m benchmarks.compression --rows 5000 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, insert_synthetic_sweets, use_temp_database
+
+
+async def call(app, path: str, headers: dict) -> tuple[int, int]:
+    """Returns (status, bytes of headers + body as sent)."""
+    scope = {
+        "type": "http", "method": "GET", "path": path.partition("?")[0],
+        "raw_path": path.encode(), "query_string": path.partition("?")[2].encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80), "scheme": "http",
+        "http_version": "1.1", "root_path": "",
+    }
+    sent = {"status": 0, "bytes": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            sent["status"] = message["status"]
+            sent["bytes"] += sum(len(k) + len(v) + 4 for k, v in message["headers"])
+        else:
+            sent["bytes"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return sent["status"], sent["bytes"]
+
+
+async def measure(app, path: str, headers: dict, requests: int) -> dict:
+    status, size = await call(app, path, headers)  # warm the cache entry
+    assert status == 200, status
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        await call(app, path, headers)
+    cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    return {"bytes": size, "cpu_us": round(cpu / requests * 1e6, 1), "wall_us": round(wall / requests * 1e6, 1)}
+
+
+async def run(args):
+    from app.main import app
+    from app.services.catalog_cache import catalog_cache
+    from app.utils.compression import available_encodings
+
+    for limit in args.limits:
+        path = f"/api/sweets/?limit={limit}"
+        results = {"identity": await measure(app, path, {}, args.requests)}
+        for encoding in available_encodings():
+            accept = {"Accept-Encoding": encoding}
+            catalog_cache.precompress = False
+            results[f"{encoding}, compress per request"] = await measure(app, path, accept, args.requests)
+            catalog_cache.precompress = True
+            results[f"{encoding}, precompressed"] = await measure(app, path, accept, args.requests)
+        for mode, result in results.items():
+            ratio = result["bytes"] / results["identity"]["bytes"]
+            print(json.dumps({"limit": limit, "mode": mode, **result, "wire_ratio": round(ratio, 3)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    insert_synthetic_sweets(args.rows)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Synthetic catalog and user base at production scale.
+
+Sweets and users go in with multi-row ``executemany`` batches, so a million
+sweets take seconds rather than the hours the ``seed_*.py`` scripts would.
+Everything is derived from the row number, so two runs with the same sizes
+produce the same database.  Every user shares one password
+(``benchpass123``), hashed once.  Without ``--database-url`` the rows go
+into a throwaway SQLite file, whose URL is printed; an explicit URL must
+point at an empty database.
+
+    python -m benchmarks.datagen --sweets 1000000 --users 100000
+    python -m benchmarks.datagen --sweets 10000 --users 1000 --database-url sqlite:///./load.db
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.common import create_schema, insert_synthetic_sweets, insert_synthetic_users, use_temp_database
+
+PASSWORD = "benchpass123"
+
+
+def generate(sweets: int, users: int, admins: int = 1) -> dict:
+    """Create the schema and fill it; returns rows and seconds per table."""
+    from sqlalchemy import func, select
+
+    from app.core.database import engine
+    from app.models.sweet import Sweet
+    from app.models.user import User
+
+    create_schema()
+    with engine.connect() as conn:
+        existing = conn.scalar(select(func.count()).select_from(Sweet)) + conn.scalar(
+            select(func.count()).select_from(User)
+        )
+    if existing:
+        raise SystemExit(f"{engine.url} already has {existing} sweets/users; point --database-url at an empty database")
+
+    report = {}
+    t0 = time.perf_counter()
+    insert_synthetic_sweets(sweets)
+    report["sweets"] = {"rows": sweets, "seconds": round(time.perf_counter() - t0, 2)}
+    t0 = time.perf_counter()
+    insert_synthetic_users(users, password=PASSWORD, admins=admins)
+    report["users"] = {"rows": users + admins, "seconds": round(time.perf_counter() - t0, 2)}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sweets", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--admins", type=int, default=1)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        use_temp_database("datagen.db")
+    report = generate(args.sweets, args.users, args.admins)
+    print(json.dumps({"database_url": os.environ["DATABASE_URL"], **report}))
+
+
+if __name__ == "__main__":
+    main()
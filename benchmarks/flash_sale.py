@@ -0,0 +1,122 @@
+"""Flash sale on one Festive sweet: reserve, then check out or abandon.
+
+``--buyers`` shoppers (served by ``--concurrency`` client threads) each try
+to hold one unit of a sweet with ``--stock`` units.  Winners check out with
+probability ``--convert``; the rest walk away and their holds expire, after
+which the sweeper puts the units back and a second wave buys them.  At the
+end sold + available must equal the starting stock.
+
+    python -m benchmarks.flash_sale --stock 500 --buyers 5000 --concurrency 64
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from benchmarks.common import Client, create_schema, make_sweet, make_user, serve_process, summarize, use_temp_database
+
+
+def wave(address, tokens, sweet_id, buyers, concurrency, convert, seed):
+    stats = {"reserve": [], "checkout": [], "held": 0, "sold": 0, "sold_out": 0, "errors": 0}
+    lock = threading.Lock()
+    remaining = iter(range(buyers))
+
+    def worker(n):
+        rng = random.Random(seed * 1000 + n)
+        client = Client(address, tokens[n])
+        local = {"reserve": [], "checkout": [], "held": 0, "sold": 0, "sold_out": 0, "errors": 0}
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            t0 = time.perf_counter()
+            code, body = client.request("POST", f"/api/sweets/{sweet_id}/reserve", {"quantity": 1})
+            local["reserve"].append(time.perf_counter() - t0)
+            if code == 400:
+                local["sold_out"] += 1
+                continue
+            if code != 201:
+                local["errors"] += 1
+                continue
+            local["held"] += 1
+            if rng.random() < convert:
+                hold_id = json.loads(body)["id"]
+                t0 = time.perf_counter()
+                code, _ = client.request("POST", "/api/reservations/checkout", {"reservation_ids": [hold_id]})
+                local["checkout"].append(time.perf_counter() - t0)
+                if code == 200:
+                    local["sold"] += 1
+                else:
+                    local["errors"] += 1
+        client.close()
+        with lock:
+            for key, value in local.items():
+                stats[key] += value
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {
+        "seconds": round(elapsed, 3),
+        "attempts_per_sec": round(buyers / elapsed, 1),
+        "held": stats["held"],
+        "sold": stats["sold"],
+        "sold_out": stats["sold_out"],
+        "errors": stats["errors"],
+        "reserve": summarize(stats["reserve"]),
+        "checkout": summarize(stats["checkout"]),
+    }
+
+
+def stock(address, sweet_id) -> int:
+    return json.loads(Client(address).request("GET", f"/api/sweets/{sweet_id}")[1])["quantity"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stock", type=int, default=500)
+    parser.add_argument("--buyers", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--convert", type=float, default=0.7)
+    parser.add_argument("--ttl", type=int, default=3, help="hold lifetime in seconds")
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    sweet_id = make_sweet(quantity=args.stock, price=80.0, name="Motichoor Ladoo")
+    tokens = [make_user(f"shopper{n}@example.com") for n in range(args.concurrency)]
+    env = {
+        "RESERVATION_TTL_SECONDS": str(args.ttl),
+        "RESERVATION_SWEEP_INTERVAL_SECONDS": "0.5",
+        "CATALOG_CACHE_SIZE": "0",
+    }
+    with serve_process(env=env, args=("--log-level", "critical")) as address:
+        first = wave(address, tokens, sweet_id, args.buyers, args.concurrency, args.convert, seed=1)
+        print(json.dumps({"wave": 1, **first, "available_after": stock(address, sweet_id)}))
+
+        # holds that expired mid-wave were already re-sold, so wait for every unsold unit
+        unsold = args.stock - first["sold"]
+        t0 = time.perf_counter()
+        deadline = t0 + args.ttl + 30
+        while stock(address, sweet_id) < unsold and time.perf_counter() < deadline:
+            time.sleep(0.1)
+        print(json.dumps({
+            "abandoned_holds": first["held"] - first["sold"],
+            "released_after_s": round(time.perf_counter() - t0, 2),
+            "available": stock(address, sweet_id),
+        }))
+
+        second = wave(address, tokens, sweet_id, args.buyers, args.concurrency, 1.0, seed=2)
+        left = stock(address, sweet_id)
+        print(json.dumps({"wave": 2, **second, "available_after": left}))
+        sold = first["sold"] + second["sold"]
+        print(json.dumps({"sold_total": sold, "available": left, "consistent": sold + left == args.stock}))
+
+
+if __name__ == "__main__":
+    main()
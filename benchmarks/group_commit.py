@@ -0,0 +1,101 @@
+"""Purchases per second with the group-commit write batcher on and off.
+
+``--concurrency`` client threads buy one unit at a time from a sweet with
+``--stock`` units until ``--purchases`` attempts are spent, so the tail of
+every run is out-of-stock refusals mixed into the same batches as sales.
+Each combination of ``WRITE_BATCH_ENABLED`` and ``SQLITE_SYNCHRONOUS``
+gets its own server and its own sweet; at the end sold + left must equal
+the starting stock.  ``FULL`` syncs on every commit, which is where
+batching pays; WAL with ``NORMAL`` (the default) only syncs on checkpoints.
+
+    python -m benchmarks.group_commit --purchases 3000 --concurrency 32 --synchronous NORMAL FULL
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.common import Client, create_schema, make_sweet, make_user, serve_process, summarize, use_temp_database
+
+
+def buy(address, tokens, sweet_id, purchases):
+    stats = {"latencies": [], "sold": 0, "sold_out": 0, "errors": 0}
+    lock = threading.Lock()
+    remaining = iter(range(purchases))
+
+    def worker(token):
+        client = Client(address, token)
+        latencies, sold, sold_out, errors = [], 0, 0, 0
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            t0 = time.perf_counter()
+            code, _ = client.request("POST", f"/api/sweets/{sweet_id}/purchase")
+            latencies.append(time.perf_counter() - t0)
+            if code == 200:
+                sold += 1
+            elif code == 400:
+                sold_out += 1
+            else:
+                errors += 1
+        client.close()
+        with lock:
+            stats["latencies"] += latencies
+            stats["sold"] += sold
+            stats["sold_out"] += sold_out
+            stats["errors"] += errors
+
+    threads = [threading.Thread(target=worker, args=(token,)) for token in tokens]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--purchases", type=int, default=3000)
+    parser.add_argument("--stock", type=int, default=None, help="defaults to 90%% of --purchases")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--synchronous", nargs="+", default=["NORMAL", "FULL"])
+    parser.add_argument("--max-delay-ms", type=float, default=0.0)
+    parser.add_argument("--db-async", action="store_true", help="serve through the async routes")
+    args = parser.parse_args()
+    stock = args.stock if args.stock is not None else args.purchases * 9 // 10
+
+    use_temp_database()
+    create_schema()
+    tokens = [make_user(f"buyer{n}@example.com") for n in range(args.concurrency)]
+
+    for synchronous in args.synchronous:
+        for batched in (False, True):
+            sweet_id = make_sweet(quantity=stock, name=f"Group Commit {synchronous} {batched}")
+            env = {
+                "WRITE_BATCH_ENABLED": str(batched).lower(),
+                "WRITE_BATCH_MAX_DELAY_MS": str(args.max_delay_ms),
+                "SQLITE_SYNCHRONOUS": synchronous,
+                "DB_ASYNC": str(args.db_async).lower(),
+                "CATALOG_CACHE_SIZE": "0",
+            }
+            with serve_process(env=env, args=("--log-level", "critical")) as address:
+                elapsed, stats = buy(address, tokens, sweet_id, args.purchases)
+                _, body = Client(address).request("GET", f"/api/sweets/{sweet_id}")
+                left = json.loads(body)["quantity"]
+            print(json.dumps({
+                "synchronous": synchronous,
+                "write_batch": batched,
+                "purchases_per_sec": round(args.purchases / elapsed, 1),
+                "sold": stats["sold"],
+                "sold_out": stats["sold_out"],
+                "errors": stats["errors"],
+                "consistent": stats["sold"] + left == stock,
+                "latency": summarize(stats["latencies"]),
+            }))
+
+
+if __name__ == "__main__":
+    main()
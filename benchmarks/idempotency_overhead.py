@@ -0,0 +1,85 @@
+"""Cost of ``Idempotency-Key`` handling on purchases.
+
+Drives the ASGI app in-process (httpx, no sockets) with one purchase at a
+time, in blocks that rotate through four cases so drift hits all equally:
+
+* ``no key``: the middleware only looks at the headers;
+* ``new key``: the happy path, a claim INSERT before and an UPDATE after;
+* ``replay (memory)``: a retry answered from the in-process LRU;
+* ``replay (table)``: a retry after the LRU forgot the key, e.g. on another worker.
+
+    python -m benchmarks.idempotency_overhead --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, make_sweet, make_user, summarize, use_temp_database
+
+
+async def measure(args):
+    import httpx
+
+    from app.main import app
+    from app.services.idempotency import idempotency_store
+
+    token = make_user("idempotency@example.com")
+    sweet_id = make_sweet(quantity=10 * args.requests)
+    path = f"/api/sweets/{sweet_id}/purchase"
+    auth = {"Authorization": f"Bearer {token}"}
+    timings = {"no key": [], "new key": [], "replay (memory)": [], "replay (table)": []}
+    counter = 0
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def purchase(headers, expect_replay):
+                t0 = time.perf_counter()
+                response = await client.post(path, headers=headers)
+                elapsed = time.perf_counter() - t0
+                assert response.status_code == 200, response.text
+                assert (response.headers.get("idempotent-replayed") == "true") == expect_replay
+                return elapsed
+
+            for _ in range(50):
+                await purchase(auth, False)  # warm caches and the pool
+            for start in range(0, args.requests, args.block):
+                block = min(args.block, args.requests - start)
+                for _ in range(block):
+                    timings["no key"].append(await purchase(auth, False))
+                keys = []
+                for _ in range(block):
+                    counter += 1
+                    keys.append({**auth, "Idempotency-Key": f"bench-{counter}"})
+                    timings["new key"].append(await purchase(keys[-1], False))
+                for headers in keys:
+                    timings["replay (memory)"].append(await purchase(headers, True))
+                idempotency_store.cache.clear()
+                for headers in keys:
+                    timings["replay (table)"].append(await purchase(headers, True))
+
+    base = summarize(timings["no key"])
+    for name, values in timings.items():
+        stats = summarize(values)
+        print(json.dumps({
+            "case": name,
+            **stats,
+            "vs_no_key_mean_ms": round(stats["mean_ms"] - base["mean_ms"], 3),
+        }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--block", type=int, default=100)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    asyncio.run(measure(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Whole-API load test: a weighted traffic mix replayed against seeded data.
+
+Seeds a throwaway database with ``benchmarks.datagen`` (``--sweets``,
+``--users``), then draws ``--requests`` requests from ``--mix``:
+
+* ``browse``: a catalog page, the first one or after a random cursor;
+* ``get``: one sweet, 80% of them from the hottest 2% of the catalog;
+* ``search``: a flavour or sweet word;
+* ``login``: a password login (bcrypt, so 429s are possible under load);
+* ``purchase``: one unit as a signed-in user (400 once a sweet runs out);
+* ``restock``: an admin adds 20 units.
+
+The schedule comes from ``--seed``, so every run and every commit sends
+the same requests in the same order.  ``--target inprocess`` drives the
+ASGI app (with its lifespan) through httpx in this process;
+``--target uvicorn`` starts a server process, with ``--workers``.  After
+``--warmup`` unmeasured requests the schedule is replayed ``--runs`` times.
+The JSON report has throughput (the median run), p50/p95/p99 latency per
+operation, status counts, and SQL statements per request from the server's
+``/metrics`` (left out with several workers, which do not share metrics).
+Save a report with ``--output`` and compare a later run with ``--compare``.
+``--env NAME=VALUE`` passes settings to the server and the seeding step;
+``--env BCRYPT_ROUNDS=4`` keeps logins from dominating a CPU-bound run.
+
+    python -m benchmarks.load_mix --sweets 100000 --users 10000 --requests 5000 --output before.json
+    python -m benchmarks.load_mix --sweets 100000 --users 10000 --requests 5000 --compare before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import threading
+import time
+from collections import Counter
+
+from benchmarks.common import BASES, FLAVOURS, Client, serve_process, summarize, use_temp_database
+from benchmarks.datagen import PASSWORD, generate
+
+DEFAULT_MIX = "browse=40,get=25,search=15,purchase=12,login=5,restock=3"
+
+# operation -> the route template its requests are labelled with in /metrics
+ROUTES = {
+    "browse": ("GET", "/api/sweets/"),
+    "get": ("GET", "/api/sweets/{sweet_id}"),
+    "search": ("GET", "/api/sweets/search"),
+    "login": ("POST", "/api/auth/login"),
+    "purchase": ("POST", "/api/sweets/{sweet_id}/purchase"),
+    "restock": ("POST", "/api/sweets/{sweet_id}/restock"),
+}
+
+QUERIES_SAMPLE = re.compile(r'^sweetshop_request_db_queries_(sum|count)\{method="(\w+)",route="([^"]*)"\} (\S+)$')
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise SystemExit(f"Unknown operation {name!r}; expected one of {', '.join(ROUTES)}")
+        mix[name] = float(weight)
+    return mix
+
+
+class Traffic:
+    """Builds requests for each operation from a seeded RNG."""
+
+    def __init__(self, sweets: int, users: int, user_tokens: list[str], admin_token: str, seed: int):
+        from app.utils.pagination import encode_cursor
+
+        self.rng = random.Random(seed)
+        self.sweets = sweets
+        self.users = users
+        self.user_tokens = user_tokens
+        self.admin_token = admin_token
+        self.hot = max(1, sweets // 50)
+        self.encode_cursor = encode_cursor
+        self.words = [word.lower() for word in FLAVOURS + BASES]
+
+    def sweet_id(self) -> int:
+        if self.rng.random() < 0.8:
+            return self.rng.randint(1, self.hot)
+        return self.rng.randint(1, self.sweets)
+
+    def request(self, op: str):
+        """``(op, method, path, json body, bearer token)``."""
+        rng = self.rng
+        if op == "browse":
+            if rng.random() < 0.7:
+                return op, "GET", "/api/sweets/?limit=50", None, None
+            return op, "GET", f"/api/sweets/?limit=50&cursor={self.encode_cursor(self.sweet_id())}", None, None
+        if op == "get":
+            return op, "GET", f"/api/sweets/{self.sweet_id()}", None, None
+        if op == "search":
+            return op, "GET", f"/api/sweets/search?q={rng.choice(self.words)}", None, None
+        if op == "login":
+            body = {"email": f"user{rng.randrange(self.users)}@example.com", "password": PASSWORD}
+            return op, "POST", "/api/auth/login", body, None
+        if op == "purchase":
+            return op, "POST", f"/api/sweets/{self.sweet_id()}/purchase", None, rng.choice(self.user_tokens)
+        return op, "POST", f"/api/sweets/{self.sweet_id()}/restock", {"quantity": 20}, self.admin_token
+
+    def schedule(self, mix: dict[str, float], count: int) -> list:
+        ops = self.rng.choices(list(mix), weights=list(mix.values()), k=count)
+        return [self.request(op) for op in ops]
+
+
+def issue_tokens(count: int) -> tuple[list[str], str]:
+    """Access tokens for the first ``count`` generated users and the admin, minted directly."""
+    from sqlalchemy import select
+
+    from app.core.database import SessionLocal
+    from app.models.user import User
+    from app.utils.security import create_access_token
+
+    with SessionLocal() as db:
+        people = db.execute(
+            select(User.id, User.email, User.role).where(User.email.like("user%") | (User.email == "admin0@example.com"))
+            .order_by(User.id).limit(count + 1)
+        ).all()
+    tokens = {p.email: create_access_token(subject=p.email, uid=p.id, role=p.role) for p in people}
+    admin = tokens.pop("admin0@example.com")
+    return list(tokens.values())[:count], admin
+
+
+def query_counts(metrics_text: str) -> dict:
+    counts = {}
+    for line in metrics_text.splitlines():
+        match = QUERIES_SAMPLE.match(line)
+        if match:
+            kind, method, route, value = match.groups()
+            counts[(kind, method, route)] = float(value)
+    return counts
+
+
+def replay_threads(address, schedule, concurrency: int):
+    results = [None] * len(schedule)
+    lock = threading.Lock()
+    remaining = iter(range(len(schedule)))
+
+    def worker():
+        client = Client(address)
+        while True:
+            with lock:
+                index = next(remaining, None)
+            if index is None:
+                break
+            op, method, path, body, token = schedule[index]
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            t0 = time.perf_counter()
+            status, _ = client.request(method, path, body, headers)
+            results[index] = (op, status, time.perf_counter() - t0)
+        client.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, results
+
+
+async def replay_async(client, schedule, concurrency: int):
+    results = [None] * len(schedule)
+    remaining = iter(range(len(schedule)))
+
+    async def worker():
+        for index in remaining:
+            op, method, path, body, token = schedule[index]
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            t0 = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            results[index] = (op, response.status_code, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - t0, results
+
+
+def run_uvicorn(warmup, schedule, args, env):
+    extra = ("--workers", str(args.workers)) if args.workers > 1 else ()
+    with serve_process(env=env, args=("--log-level", "critical", *extra)) as address:
+        replay_threads(address, warmup, args.concurrency)
+        before = query_counts(Client(address).request("GET", "/metrics")[1].decode())
+        runs = [replay_threads(address, schedule, args.concurrency) for _ in range(args.runs)]
+        after = query_counts(Client(address).request("GET", "/metrics")[1].decode())
+    return runs, before, after
+
+
+async def run_inprocess(warmup, schedule, args):
+    import httpx
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            await replay_async(client, warmup, args.concurrency)
+            before = query_counts((await client.get("/metrics")).text)
+            runs = [await replay_async(client, schedule, args.concurrency) for _ in range(args.runs)]
+            after = query_counts((await client.get("/metrics")).text)
+    return runs, before, after
+
+
+def report(runs, before, after, mix: dict, args) -> dict:
+    latencies = {op: [] for op in mix}
+    statuses = {op: Counter() for op in mix}
+    for _, results in runs:
+        for op, status, seconds in results:
+            latencies[op].append(seconds)
+            statuses[op][str(status)] += 1
+    elapsed = statistics.median(seconds for seconds, _ in runs)
+    per_run = len(runs[0][1])
+
+    operations = {}
+    for op in mix:
+        count = len(latencies[op]) // len(runs)
+        entry = {
+            "share_pct": round(count / per_run * 100, 1),
+            "throughput_rps": round(count / elapsed, 1),
+            **summarize(latencies[op]),
+            "statuses": dict(sorted(statuses[op].items())),
+        }
+        if args.workers == 1:
+            method, route = ROUTES[op]
+            served = after.get(("count", method, route), 0) - before.get(("count", method, route), 0)
+            queries = after.get(("sum", method, route), 0) - before.get(("sum", method, route), 0)
+            entry["queries_per_request"] = round(queries / served, 2) if served else None
+        operations[op] = entry
+
+    return {
+        "target": args.target,
+        "workers": args.workers,
+        "sweets": args.sweets,
+        "users": args.users,
+        "requests": per_run,
+        "concurrency": args.concurrency,
+        "mix": mix,
+        "seed": args.seed,
+        "runs": len(runs),
+        "total": {
+            "throughput_rps": round(per_run / elapsed, 1),
+            "runs_rps": [round(per_run / seconds, 1) for seconds, _ in runs],
+            **summarize([seconds for _, results in runs for _, _, seconds in results]),
+        },
+        "operations": operations,
+    }
+
+
+def pct_change(new, old):
+    return round((new - old) / old * 100, 1) if old else None
+
+
+def compare(current: dict, baseline: dict) -> list[dict]:
+    rows = [{
+        "operation": "total",
+        "throughput_change_pct": pct_change(current["total"]["throughput_rps"], baseline["total"]["throughput_rps"]),
+        "p95_change_pct": pct_change(current["total"]["p95_ms"], baseline["total"]["p95_ms"]),
+    }]
+    for op, entry in current["operations"].items():
+        old = baseline["operations"].get(op)
+        if old is None:
+            continue
+        rows.append({
+            "operation": op,
+            "throughput_change_pct": pct_change(entry["throughput_rps"], old["throughput_rps"]),
+            "p95_change_pct": pct_change(entry["p95_ms"], old["p95_ms"]),
+            "p99_change_pct": pct_change(entry["p99_ms"], old["p99_ms"]),
+            "queries_per_request": [old.get("queries_per_request"), entry.get("queries_per_request")],
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sweets", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="comma-separated operation=weight")
+    parser.add_argument("--requests", type=int, default=5_000, help="per measured run")
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--target", choices=("inprocess", "uvicorn"), default="uvicorn")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tokens", type=int, default=200, help="distinct signed-in buyers")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE", help="server setting, repeatable")
+    parser.add_argument("--output", help="also write the report to this file")
+    parser.add_argument("--compare", help="a previous report to compare against")
+    args = parser.parse_args()
+    if args.target == "inprocess":
+        args.workers = 1
+
+    mix = parse_mix(args.mix)
+    env = dict(item.split("=", 1) for item in args.env)
+    use_temp_database("load.db")
+    # before anything imports app settings
+    os.environ.update(env)
+    generate(args.sweets, args.users)
+    user_tokens, admin_token = issue_tokens(min(args.tokens, args.users))
+    traffic = Traffic(args.sweets, args.users, user_tokens, admin_token, args.seed)
+    warmup = traffic.schedule(mix, args.warmup)
+    schedule = traffic.schedule(mix, args.requests)
+
+    if args.target == "inprocess":
+        runs, before, after = asyncio.run(run_inprocess(warmup, schedule, args))
+    else:
+        runs, before, after = run_uvicorn(warmup, schedule, args, env)
+
+    result = report(runs, before, after, mix, args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for row in compare(result, baseline):
+            print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
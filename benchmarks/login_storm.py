@@ -0,0 +1,96 @@
+"""Catalog read latency while a login storm runs against the bcrypt pool.
+
+Phase one measures GET /api/sweets/ on its own; phase two repeats it while
+``--stormers`` clients hammer POST /api/auth/login.  Logins rejected with 429
+by the pool's back-pressure are counted separately.  The server runs in its
+own process; on a single core the bcrypt workers still compete for CPU.
+
+    python -m benchmarks.login_storm --readers 4 --stormers 32 --seconds 5
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.common import Client, create_schema, make_sweet, make_user, serve_process, summarize, use_temp_database
+
+PASSWORD = "stormpass123"
+
+
+def read_catalog(address, seconds, latencies, lock):
+    client = Client(address)
+    local = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        code, _ = client.request("GET", "/api/sweets/")
+        local.append(time.perf_counter() - t0)
+        assert code == 200, code
+    client.close()
+    with lock:
+        latencies.extend(local)
+
+
+def storm_logins(address, stop, counts, lock):
+    client = Client(address)
+    local = {}
+    body = {"email": "storm@example.com", "password": PASSWORD}
+    while not stop.is_set():
+        code, _ = client.request("POST", "/api/auth/login", body)
+        local[code] = local.get(code, 0) + 1
+    client.close()
+    with lock:
+        for code, n in local.items():
+            counts[code] = counts.get(code, 0) + n
+
+
+def measure(address, readers, seconds):
+    latencies, lock = [], threading.Lock()
+    threads = [threading.Thread(target=read_catalog, args=(address, seconds, latencies, lock)) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--stormers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    make_user("storm@example.com", password=PASSWORD)
+    for i in range(12):
+        make_sweet(100, name=f"Bench Sweet {i}")
+
+    with serve_process() as address:
+        measure(address, 1, 0.5)  # warm up
+        quiet = measure(address, args.readers, args.seconds)
+
+        stop, counts, lock = threading.Event(), {}, threading.Lock()
+        stormers = [threading.Thread(target=storm_logins, args=(address, stop, counts, lock)) for _ in range(args.stormers)]
+        for t in stormers:
+            t.start()
+        t0 = time.perf_counter()
+        stormy = measure(address, args.readers, args.seconds)
+        stop.set()
+        for t in stormers:
+            t.join()
+        elapsed = time.perf_counter() - t0
+
+    result = {
+        "catalog_without_storm": quiet,
+        "catalog_during_storm": stormy,
+        "logins_ok_per_sec": round(counts.get(200, 0) / elapsed, 1),
+        "logins_rejected_429": counts.get(429, 0),
+        "login_status_counts": counts,
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
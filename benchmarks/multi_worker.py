@@ -0,0 +1,187 @@
+"""Multi-worker mode: cross-worker cache consistency and throughput per core.
+
+Starts the API with ``python -m app.server --workers N`` for each N and:
+
+* consistency: opens several keep-alive connections, so they land on
+  different workers, and warms each one's cached ``GET /api/sweets/{id}``.
+  It then changes that sweet's price over another connection and re-reads
+  on every connection until all of them show the new price.  The time that
+  takes is the staleness window; ``stale_after_deadline`` counts updates
+  some worker was still serving stale after ``--deadline`` seconds;
+* throughput: client processes replay a read-mostly mix (catalog page,
+  single sweet, 5% purchases) for ``--seconds`` and report requests/s,
+  also divided by the cores the workers can use.
+
+``no bus`` runs plain ``uvicorn --workers N`` on the single-process bus for
+comparison: its caches never hear about the other workers' writes.  The
+``limits: memory`` / ``limits: sqlite`` rows repeat the throughput run with
+the rate limiter on (limits high enough never to refuse), buckets per worker
+or in one shared SQLite file, which every limited request then writes to.
+
+    python -m benchmarks.multi_worker --workers 1 2 4 --seconds 10
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.common import (
+    Client,
+    create_schema,
+    insert_synthetic_sweets,
+    make_user,
+    serve_process,
+    summarize,
+    use_temp_database,
+)
+
+
+def price_seen(client: Client, sweet_id: int) -> float:
+    status, body = client.request("GET", f"/api/sweets/{sweet_id}")
+    assert status == 200, body
+    return json.loads(body)["price"]
+
+
+def consistency(address, admin: str, user: str, connections: int, updates: int, deadline: float) -> dict:
+    sweet_id = 1
+    writer = Client(address, admin)
+    readers = [Client(address, user) for _ in range(connections)]
+    status, body = writer.request("GET", f"/api/sweets/{sweet_id}")
+    sweet = json.loads(body)
+    windows, stale_reads, stale_after_deadline = [], 0, 0
+    try:
+        for i in range(updates):
+            for reader in readers:
+                price_seen(reader, sweet_id)  # cache the current version on every worker
+            price = round(100 + i + random.random(), 2)
+            status, body = writer.request("PUT", f"/api/sweets/{sweet_id}", {**sweet, "price": price})
+            assert status == 200, body
+            written = time.perf_counter()
+            pending = list(readers)
+            while pending and time.perf_counter() - written < deadline:
+                stale = [reader for reader in pending if price_seen(reader, sweet_id) != price]
+                stale_reads += len(stale)
+                pending = stale
+            if pending:
+                stale_after_deadline += 1
+            else:
+                windows.append(time.perf_counter() - written)
+    finally:
+        for client in [writer, *readers]:
+            client.close()
+    return {
+        "updates": updates,
+        "connections": connections,
+        "stale_reads": stale_reads,
+        "stale_after_deadline": stale_after_deadline,
+        "window": summarize(windows),
+    }
+
+
+def drive(address, token: str, sweets: int, threads: int, seconds: float, seed: int) -> list:
+    """One client process: ``threads`` connections for ``seconds``; returns latencies."""
+    import threading
+
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def loop(n):
+        rng = random.Random(seed * 1000 + n)
+        client = Client(address, token)
+        mine = []
+        try:
+            while time.monotonic() < stop_at:
+                roll = rng.random()
+                if roll < 0.05:
+                    method, path = "POST", f"/api/sweets/{rng.randint(1, sweets)}/purchase"
+                elif roll < 0.35:
+                    method, path = "GET", "/api/sweets/?limit=20"
+                else:
+                    method, path = "GET", f"/api/sweets/{rng.randint(1, min(sweets, 200))}"
+                t0 = time.perf_counter()
+                status, _ = client.request(method, path)
+                mine.append(time.perf_counter() - t0)
+                assert status in (200, 400), status
+        finally:
+            client.close()
+        with lock:
+            latencies.extend(mine)
+
+    workers = [threading.Thread(target=loop, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies
+
+
+def throughput(address, token: str, args) -> dict:
+    with ProcessPoolExecutor(args.clients) as pool:
+        futures = [
+            pool.submit(drive, address, token, args.sweets, args.threads, args.seconds, seed)
+            for seed in range(args.clients)
+        ]
+        latencies = [value for future in futures for value in future.result()]
+    return {"requests_per_s": round(len(latencies) / args.seconds, 1), **summarize(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--sweets", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=2, help="load generator processes")
+    parser.add_argument("--threads", type=int, default=8, help="connections per client process")
+    args = parser.parse_args()
+
+    url = use_temp_database()
+    create_schema()
+    insert_synthetic_sweets(args.sweets)
+    # plenty of stock, so purchases keep succeeding for the whole run
+    from sqlalchemy import update
+
+    from app.core.database import engine
+    from app.models.sweet import Sweet
+
+    with engine.begin() as conn:
+        conn.execute(update(Sweet).values(quantity=10**9))
+    admin = make_user("multi-admin@example.com", role="admin")
+    user = make_user("multi-user@example.com")
+    bus_path = os.path.join(os.path.dirname(url.removeprefix("sqlite:///")), "bus.db")
+
+    limits_path = os.path.join(os.path.dirname(url.removeprefix("sqlite:///")), "limits.db")
+    unlimited = "1000000000/second"
+
+    cores = os.cpu_count() or 1
+    for workers in args.workers:
+        bus = {"INVALIDATION_BUS": "sqlite", "INVALIDATION_SQLITE_PATH": bus_path}
+        limits = {"RATE_LIMIT_ENABLED": "true", "RATE_LIMIT_DEFAULT": unlimited, "RATE_LIMIT_PURCHASE": unlimited}
+        launcher = ("-m", "app.server")
+        # (mode, environment, command, measure consistency)
+        modes = [("bus", bus, launcher, True)]
+        if workers > 1:
+            modes.append(("no bus", {"INVALIDATION_BUS": "local"}, None, True))
+        modes += [
+            ("limits: memory", {**bus, **limits, "RATE_LIMIT_BACKEND": "memory"}, launcher, False),
+            ("limits: sqlite", {**bus, **limits, "RATE_LIMIT_BACKEND": "sqlite",
+                                "RATE_LIMIT_SQLITE_PATH": limits_path}, launcher, False),
+        ]
+        for mode, env, command, check_consistency in modes:
+            with serve_process(env=env, args=("--workers", str(workers)), command=command) as address:
+                report = {"workers": workers, "mode": mode}
+                if check_consistency:
+                    report["consistency"] = consistency(address, admin, user, 4 * workers, args.updates, args.deadline)
+                report["throughput"] = throughput(address, user, args)
+            report["throughput"]["requests_per_s_per_core"] = round(
+                report["throughput"]["requests_per_s"] / min(workers, cores), 1
+            )
+            print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
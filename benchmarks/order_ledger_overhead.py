@@ -0,0 +1,57 @@
+"""Write-path cost the orders ledger adds to purchase and checkout.
+
+Calls SweetService directly (no HTTP) so the difference is the two extra
+INSERTs: once without a buyer (stock decrement only) and once with one
+(decrement plus order and order lines, same transaction).  Modes alternate
+in blocks so drift in the SQLite file affects both equally.
+
+    python -m benchmarks.order_ledger_overhead --ops 5000 --basket 5
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import create_schema, make_sweet, make_user, summarize, use_temp_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--basket", type=int, default=5, help="lines per checkout")
+    parser.add_argument("--block", type=int, default=250)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    from app.core.database import SessionLocal
+    from app.models.user import User
+    from app.schemas.sweet import CheckoutLine
+    from app.services.sweet_service import SweetService
+
+    make_user("ledger@example.com")
+    with SessionLocal() as db:
+        user_id = db.query(User.id).scalar()
+    sweet_ids = [make_sweet(quantity=10 * args.ops * args.basket, name=f"Ledger Sweet {i}") for i in range(args.basket)]
+    basket = [CheckoutLine(sweet_id=sweet_id, quantity=1) for sweet_id in sweet_ids]
+
+    cases = {
+        "purchase": lambda svc, buyer: svc.purchase(sweet_ids[0], user_id=buyer),
+        f"checkout x{args.basket}": lambda svc, buyer: svc.checkout(basket, user_id=buyer),
+    }
+    for name, op in cases.items():
+        timings = {"no ledger": [], "ledger": []}
+        with SessionLocal() as db:
+            svc = SweetService(db)
+            for start in range(0, args.ops, args.block):
+                for mode, buyer in (("no ledger", None), ("ledger", user_id)):
+                    for _ in range(min(args.block, args.ops - start)):
+                        t0 = time.perf_counter()
+                        op(svc, buyer)
+                        timings[mode].append(time.perf_counter() - t0)
+        base, ledger = summarize(timings["no ledger"]), summarize(timings["ledger"])
+        overhead = (ledger["mean_ms"] - base["mean_ms"]) / base["mean_ms"] * 100
+        print(json.dumps({"case": name, "no_ledger": base, "ledger": ledger, "overhead_pct": round(overhead, 1)}))
+
+
+if __name__ == "__main__":
+    main()
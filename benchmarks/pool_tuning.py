@@ -0,0 +1,112 @@
+"""Concurrent writers against SQLite with default vs tuned pool/pragma settings.
+
+"default" runs with a rollback journal, no busy timeout and a small pool;
+"tuned" uses the shipped settings (WAL, busy_timeout, larger pool).  Clients
+hammer purchase and restock on a handful of hot sweets; errors are mostly
+"database is locked".  The server's ``/metrics/json`` pool snapshot is printed
+after each run.
+
+    python -m benchmarks.pool_tuning --concurrency 32 --seconds 10
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import threading
+import time
+
+from benchmarks.common import (
+    Client,
+    create_schema,
+    make_sweet,
+    make_user,
+    serve_process,
+    summarize,
+    use_temp_database,
+)
+
+MODES = {
+    "default": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_BUSY_TIMEOUT_MS": "0",
+        "DB_POOL_SIZE": "5",
+        "DB_MAX_OVERFLOW": "10",
+    },
+    "tuned": {},
+}
+
+
+def drive(address, user_token, admin_token, sweet_ids, seconds, concurrency):
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(seed):
+        rng = random.Random(seed)
+        user, admin = Client(address, user_token), Client(address, admin_token)
+        local, local_err = [], 0
+        while time.perf_counter() < deadline:
+            sweet_id = rng.choice(sweet_ids)
+            client = user if rng.random() < 0.8 else admin
+            t0 = time.perf_counter()
+            try:
+                if client is user:
+                    code, _ = user.request("POST", f"/api/sweets/{sweet_id}/purchase")
+                else:
+                    code, _ = admin.request("POST", f"/api/sweets/{sweet_id}/restock", {"quantity": 5})
+            except (ConnectionError, http.client.HTTPException):
+                # uvicorn drops the connection after an unhandled 500
+                code = 500
+                client.close()
+            local.append(time.perf_counter() - t0)
+            local_err += code >= 500
+        user.close()
+        admin.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_err
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {"requests_per_sec": round(len(latencies) / elapsed, 1), "errors": errors[0], **summarize(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[32])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--hot-sweets", type=int, default=4)
+    args = parser.parse_args()
+
+    # seed with a rollback journal so each mode starts from the same file
+    os.environ.update(MODES["default"])
+    seed_url = use_temp_database()
+    create_schema()
+    sweet_ids = [make_sweet(quantity=10_000_000, name=f"Hot Sweet {i}") for i in range(args.hot_sweets)]
+    user_token = make_user("writer@example.com")
+    admin_token = make_user("admin@example.com", role="admin")
+    seed_path = seed_url.removeprefix("sqlite:///")
+    for key in MODES["default"]:
+        del os.environ[key]
+
+    for mode, overrides in MODES.items():
+        path = f"{seed_path}.{mode}"
+        shutil.copyfile(seed_path, path)
+        env = {"DATABASE_URL": f"sqlite:///{path}", "CATALOG_CACHE_SIZE": "0", **overrides}
+        with serve_process(env=env, args=("--log-level", "critical")) as address:
+            for concurrency in args.concurrency:
+                result = drive(address, user_token, admin_token, sweet_ids, args.seconds, concurrency)
+                _, body = Client(address).request("GET", "/metrics/json")
+                pool = json.loads(body)["pools"]["sync"]
+                print(json.dumps({"mode": mode, "concurrency": concurrency, **result, "pool": pool}))
+
+
+if __name__ == "__main__":
+    main()
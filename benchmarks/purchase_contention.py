@@ -0,0 +1,85 @@
+"""Concurrent buyers hammering one sweet through POST /api/sweets/{id}/purchase.
+
+Every buyer keeps purchasing until the API reports "Out of stock".  The run
+fails if more units were sold than were ever in stock.
+
+    python -m benchmarks.purchase_contention --buyers 64 --stock 2000
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.common import Client, create_schema, make_sweet, make_user, serve, summarize, use_temp_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buyers", type=int, default=64)
+    parser.add_argument("--stock", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app.main import app
+
+    create_schema()
+    token = make_user("buyer@bench.local")
+    sweet_id = make_sweet(args.stock)
+
+    latencies, sold, errors = [], [0], [0]
+    lock = threading.Lock()
+    start_gate = threading.Barrier(args.buyers + 1)
+
+    def buyer(address):
+        client = Client(address, token)
+        local_lat, local_sold, local_err = [], 0, 0
+        start_gate.wait()
+        while True:
+            t0 = time.perf_counter()
+            code, body = client.request("POST", f"/api/sweets/{sweet_id}/purchase")
+            local_lat.append(time.perf_counter() - t0)
+            if code == 200:
+                local_sold += 1
+            elif code == 400:
+                break
+            else:
+                local_err += 1
+                if local_err > 100:
+                    break
+        client.close()
+        with lock:
+            latencies.extend(local_lat)
+            sold[0] += local_sold
+            errors[0] += local_err
+
+    with serve(app) as address:
+        threads = [threading.Thread(target=buyer, args=(address,)) for _ in range(args.buyers)]
+        for t in threads:
+            t.start()
+        start_gate.wait()
+        t0 = time.perf_counter()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+
+        client = Client(address)
+        _, body = client.request("GET", f"/api/sweets/{sweet_id}")
+        remaining = json.loads(body)["quantity"]
+
+    result = {
+        "buyers": args.buyers,
+        "stock": args.stock,
+        "sold": sold[0],
+        "remaining": remaining,
+        "oversold": max(0, sold[0] - args.stock),
+        "errors": errors[0],
+        "purchases_per_sec": round(sold[0] / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+    print(json.dumps(result, indent=2))
+    if sold[0] + remaining != args.stock or remaining < 0:
+        raise SystemExit("stock accounting mismatch: oversell detected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Per-endpoint SQL statement and row budgets.
+
+Drives every route the app mounts through ``TestClient`` against a seeded
+in-memory SQLite database, one scripted request per endpoint, and counts
+the statements each request sends (engine cursor events) and the rows
+SQLite hands back (a counting ``row_factory``).  Catalog and token caches
+are cleared before each request, so the numbers are the cold path.
+
+Counts are compared with ``query_budgets.json`` next to this file; any
+endpoint over budget, or mounted without a scenario here, makes the script
+exit non-zero.  ``--update`` rewrites the budgets from the current counts
+and ``--report`` writes the measured counts as JSON for tracking over time.
+
+    python -m benchmarks.query_budget
+    DB_ASYNC=true python -m benchmarks.query_budget   # the async twins, same budgets
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+DEFAULT_BUDGETS = Path(__file__).with_name("query_budgets.json")
+
+# mounted routes that cannot be measured as a single request/response
+SKIPPED = {
+    "GET /api/sweets/stream": "event stream never completes",
+}
+
+
+class StatementCounter:
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.rows = 0
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+
+    def row_factory(self, cursor, row):
+        self.rows += 1
+        return row
+
+    def on_connect(self, dbapi_connection, connection_record):
+        raw = dbapi_connection
+        # aiosqlite: SQLAlchemy adapter -> aiosqlite.Connection -> sqlite3.Connection
+        while not isinstance(raw, sqlite3.Connection) and hasattr(raw, "_connection"):
+            raw = raw._connection
+        if isinstance(raw, sqlite3.Connection):
+            raw.row_factory = self.row_factory
+
+    def attach(self, sync_engine) -> None:
+        from sqlalchemy import event
+
+        event.listen(sync_engine, "connect", self.on_connect)
+        event.listen(sync_engine, "before_cursor_execute", self.before_cursor_execute)
+
+
+def seed(sweets: int) -> dict:
+    from benchmarks.common import create_schema, insert_synthetic_sweets, make_sweet, make_user
+
+    create_schema()
+    insert_synthetic_sweets(sweets)
+    state = {
+        "admin": make_user("budget-admin@example.com", role="admin"),
+        "user": make_user("budget-user@example.com"),
+        "sweet": make_sweet(quantity=1000, name="Budget Barfi"),
+        "other": make_sweet(quantity=1000, name="Budget Ladoo"),
+        "doomed": make_sweet(quantity=1, name="Budget Peda"),
+    }
+    from app.core.database import SessionLocal
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        state["user_id"] = db.query(User.id).filter(User.email == "budget-user@example.com").scalar()
+    from app.utils.security import create_access_token, create_refresh_token, new_token_family
+
+    # a separate session for /refresh and /logout, so the one above stays valid
+    family = new_token_family()
+    state["session"] = create_access_token("budget-user@example.com", uid=state["user_id"], role="user", family=family)
+    state["refresh"] = create_refresh_token("budget-user@example.com", uid=state["user_id"], family=family)
+    return state
+
+
+def scenarios(state: dict) -> list[tuple]:
+    """``(method, route template, url, request kwargs)`` in execution order."""
+    user = {"Authorization": f"Bearer {state['user']}"}
+    admin = {"Authorization": f"Bearer {state['admin']}"}
+    sweet, other = state["sweet"], state["other"]
+    ndjson = "\n".join(
+        json.dumps({"name": f"Imported {i}", "category": "Bulk", "price": 5, "quantity": 10}) for i in range(100)
+    )
+    return [
+        ("GET", "/", "/", {}),
+        # register stores a fixed debug password and then signs in with the given one
+        ("POST", "/api/auth/register", "/api/auth/register",
+         {"json": {"email": "budget-new@example.com", "password": "hardcoded123", "full_name": "New"}}),
+        ("POST", "/api/auth/login", "/api/auth/login",
+         {"json": {"email": "budget-user@example.com", "password": "benchpass123"}}),
+        ("POST", "/api/auth/refresh", "/api/auth/refresh", {"json": {"refresh_token": state["refresh"]}}),
+        ("POST", "/api/auth/logout", "/api/auth/logout", {"headers": {"Authorization": f"Bearer {state['session']}"}}),
+        ("PUT", "/api/auth/users/{user_id}/role", f"/api/auth/users/{state['user_id']}/role",
+         {"json": {"role": "user"}, "headers": admin}),
+        ("POST", "/api/sweets/", "/api/sweets/",
+         {"json": {"name": "Budget Jalebi", "category": "Budget", "price": 12, "quantity": 30}, "headers": admin}),
+        ("GET", "/api/sweets/", "/api/sweets/?limit=50", {"headers": user}),
+        ("GET", "/api/sweets/search", "/api/sweets/search?q=kesar&limit=20", {"headers": user}),
+        ("GET", "/api/sweets/{sweet_id}", f"/api/sweets/{sweet}", {"headers": user}),
+        ("PUT", "/api/sweets/{sweet_id}", f"/api/sweets/{sweet}",
+         {"json": {"name": "Budget Barfi", "category": "Budget", "price": 11, "quantity": 1000}, "headers": admin}),
+        ("POST", "/api/sweets/{sweet_id}/purchase", f"/api/sweets/{sweet}/purchase", {"headers": user}),
+        ("POST", "/api/sweets/checkout", "/api/sweets/checkout",
+         {"json": {"items": [{"sweet_id": sweet, "quantity": 2}, {"sweet_id": other, "quantity": 1}]}, "headers": user}),
+        ("POST", "/api/sweets/{sweet_id}/restock", f"/api/sweets/{sweet}/restock",
+         {"json": {"quantity": 5}, "headers": admin}),
+        ("POST", "/api/sweets/{sweet_id}/reserve", f"/api/sweets/{sweet}/reserve",
+         {"json": {"quantity": 1}, "headers": user}),
+        ("GET", "/api/reservations/", "/api/reservations/", {"headers": user}),
+        ("POST", "/api/reservations/checkout", "/api/reservations/checkout", {"json": {}, "headers": user}),
+        ("DELETE", "/api/reservations/{reservation_id}", "/api/reservations/{reservation_id}", {"headers": user}),
+        ("GET", "/api/orders/", "/api/orders/?limit=20", {"headers": user}),
+        ("GET", "/api/admin/analytics/", "/api/admin/analytics/", {"headers": admin}),
+        ("GET", "/api/admin/analytics/best-sellers", "/api/admin/analytics/best-sellers", {"headers": admin}),
+        ("GET", "/api/admin/analytics/revenue-by-category", "/api/admin/analytics/revenue-by-category",
+         {"headers": admin}),
+        ("GET", "/api/admin/analytics/low-stock", "/api/admin/analytics/low-stock", {"headers": admin}),
+        ("POST", "/api/sweets/bulk", "/api/sweets/bulk",
+         {"content": ndjson, "headers": {**admin, "Content-Type": "application/x-ndjson"}}),
+        ("GET", "/api/sweets/export", "/api/sweets/export?format=ndjson", {"headers": admin}),
+        ("DELETE", "/api/sweets/{sweet_id}", f"/api/sweets/{state['doomed']}", {"headers": admin}),
+        ("GET", "/metrics", "/metrics", {}),
+        ("GET", "/metrics/json", "/metrics/json", {}),
+    ]
+
+
+def mounted_endpoints(app) -> set[str]:
+    from fastapi.routing import APIRoute
+
+    return {
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+
+def measure(client, counter: StatementCounter, state: dict) -> dict:
+    from app.services.auth_service import principal_cache
+    from app.services.catalog_cache import catalog_cache
+
+    report = {}
+    for method, template, url, kwargs in scenarios(state):
+        if "{reservation_id}" in url:
+            # needs a live hold; setting it up is not part of the measured request
+            created = client.post(f"/api/sweets/{state['sweet']}/reserve", json={"quantity": 1},
+                                  headers=kwargs["headers"])
+            url = url.format(reservation_id=created.json()["id"])
+        catalog_cache.clear()
+        principal_cache.clear()
+        counter.reset()
+        response = client.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {url} -> {response.status_code}: {response.text[:200]}")
+        report[f"{method} {template}"] = {"statements": counter.statements, "rows": counter.rows}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS)
+    parser.add_argument("--report", type=Path, help="write measured counts here as JSON")
+    parser.add_argument("--update", action="store_true", help="rewrite the budgets from this run")
+    parser.add_argument("--sweets", type=int, default=200, help="catalog rows to seed")
+    args = parser.parse_args()
+
+    # shared-cache in-memory database: every pooled connection sees the same data
+    os.environ["DATABASE_URL"] = "sqlite:///file:query-budget?mode=memory&cache=shared&uri=true"
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+    from fastapi.testclient import TestClient
+
+    from app.core.config import get_settings
+    from app.core.database import engine, get_async_engine
+
+    counter = StatementCounter()
+    counter.attach(engine)
+    if get_settings().db_async:
+        counter.attach(get_async_engine().sync_engine)
+    # held open so the in-memory database outlives idle pool connections
+    keepalive = engine.connect()
+
+    state = seed(args.sweets)
+    from app.main import app
+
+    # no context manager: startup hooks (the reservation sweeper) would add
+    # background statements to whichever request happens to be running
+    client = TestClient(app)
+    report = measure(client, counter, state)
+    keepalive.close()
+
+    budgets = json.loads(args.budgets.read_text()) if args.budgets.exists() and not args.update else {}
+    failures = []
+    width = max(map(len, report))
+    print(f"{'endpoint':<{width}}  statements  rows  budget")
+    for endpoint, counts in report.items():
+        budget = budgets.get(endpoint)
+        over = budget and (counts["statements"] > budget["statements"] or counts["rows"] > budget["rows"])
+        limit = f"{budget['statements']}/{budget['rows']}" if budget else "-"
+        print(f"{endpoint:<{width}}  {counts['statements']:>10}  {counts['rows']:>4}  {limit}{'  OVER' if over else ''}")
+        if over:
+            failures.append(f"{endpoint} is over budget: {counts} > {budget}")
+        elif not args.update and budget is None:
+            failures.append(f"{endpoint} has no budget")
+
+    for endpoint in sorted(mounted_endpoints(app) - report.keys() - SKIPPED.keys()):
+        failures.append(f"{endpoint} is mounted but has no scenario")
+
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update:
+        args.budgets.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"wrote {len(report)} budgets to {args.budgets}")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Per-request cost of the rate limiter, in microseconds.
+
+Backend: ``acquire`` on one hot key and spread over many keys, for the
+sharded memory backend and the SQLite shared-store stand-in (which runs
+each UPSERT in a worker thread; ``blocking_take_us`` is the UPSERT alone).  Middleware:
+a minimal ASGI app called directly with and without ``RateLimitMiddleware``
+in front, anonymous and with a bearer token (principal cache warm), so the
+difference is the limiter alone with no server or network in the way.
+
+    python -m benchmarks.rate_limit_overhead --calls 200000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import use_temp_database
+
+
+def per_call_us(fn, calls: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return round((time.perf_counter() - t0) / calls * 1e6, 3)
+
+
+async def per_acquire_us(backend, key, calls: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(calls):
+        # a huge rate so every call is allowed and takes the same path
+        await backend.acquire(key(i), 1e9, 1_000_000)
+    return round((time.perf_counter() - t0) / calls * 1e6, 3)
+
+
+async def bench_backends(calls: int):
+    from app.utils.rate_limit import MemoryBackend, SQLiteBackend
+
+    path = os.path.join(tempfile.mkdtemp(prefix="sweet-bench-"), "limits.db")
+    backends = {"memory": (MemoryBackend(), calls), "sqlite": (SQLiteBackend(path), max(1, calls // 20))}
+    for name, (backend, n) in backends.items():
+        hot = await per_acquire_us(backend, lambda i: "user:1", n)
+        spread = await per_acquire_us(backend, lambda i: f"user:{i % 50_000}", n)
+        report = {"backend": name, "calls": n, "hot_key_us": hot, "50k_keys_us": spread}
+        if isinstance(backend, SQLiteBackend):
+            # the same UPSERT without the hop to a worker thread
+            report["blocking_take_us"] = per_call_us(lambda i: backend.take(f"user:{i % 50_000}", 1e9, 1_000_000), n)
+        print(json.dumps(report))
+        backend.close()
+
+
+async def bench_middleware(calls: int, token: str):
+    from app.core.config import get_settings
+    from app.middleware.rate_limit import RateLimitMiddleware, default_groups
+    from app.utils.rate_limit import MemoryBackend
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    settings = get_settings().model_copy(update={"rate_limit_purchase": "1000000000/second"})
+    limited = RateLimitMiddleware(endpoint, default_groups(settings), MemoryBackend())
+
+    def scope(headers):
+        return {
+            "type": "http", "method": "POST", "path": "/api/sweets/1/purchase",
+            "headers": headers, "client": ("127.0.0.1", 50000),
+        }
+
+    anonymous = scope([(b"host", b"bench")])
+    bearer = scope([(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())])
+    results = {}
+    for name, app, request in (
+        ("bare app", endpoint, anonymous),
+        ("limited, by IP", limited, anonymous),
+        ("limited, by user", limited, bearer),
+    ):
+        await app(dict(request), receive, send)  # warm the principal cache
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            await app(dict(request), receive, send)
+        results[name] = round((time.perf_counter() - t0) / calls * 1e6, 3)
+    base = results["bare app"]
+    print(json.dumps({
+        "middleware_calls": calls,
+        **{f"{name}_us": value for name, value in results.items()},
+        "overhead_by_ip_us": round(results["limited, by IP"] - base, 3),
+        "overhead_by_user_us": round(results["limited, by user"] - base, 3),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app.utils.security import create_access_token
+
+    asyncio.run(bench_backends(args.calls))
+    token = create_access_token(subject="bench@example.com", uid=1, role="user")
+    asyncio.run(bench_middleware(args.calls, token))
+
+
+if __name__ == "__main__":
+    main()
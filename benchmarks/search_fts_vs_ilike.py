@@ -0,0 +1,63 @@
+"""ILIKE scans versus the FTS index behind GET /api/sweets/search.
+
+The catalog grows through each ``--sizes`` step; at every size each query is
+timed through both query builders at the service layer.  One JSON line is
+printed per (size, query).  Broad terms cost FTS more than an unranked ILIKE
+that stops at the first page, because every match has to be ranked.
+
+    python -m benchmarks.search_fts_vs_ilike --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import create_schema, insert_synthetic_sweets, summarize, use_temp_database
+
+QUERIES = (
+    {"q": "kesar"},
+    {"q": "pista lad"},
+    {"name": "rasgulla", "category": "bengali"},
+    {"q": "4242"},
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    use_temp_database()
+    from app.core.database import SessionLocal, engine
+    from app.services import search_index
+    from app.services.sweet_service import READ_COLUMNS, ilike_statement
+
+    create_schema()
+    search_index.install_search_index(engine)
+
+    loaded = 0
+    for size in sorted(args.sizes):
+        insert_synthetic_sweets(size - loaded, start=loaded)
+        loaded = size
+        with SessionLocal() as db:
+            for params in QUERIES:
+                builders = {
+                    "ilike": lambda: ilike_statement(params.get("q"), params.get("name"), params.get("category")),
+                    "fts": lambda: search_index.build_query(
+                        "sqlite", READ_COLUMNS, params.get("q"), params.get("name"), params.get("category")
+                    ),
+                }
+                row = {"rows": size, "query": params}
+                for label, build in builders.items():
+                    latencies = []
+                    for _ in range(args.repeat):
+                        t0 = time.perf_counter()
+                        hits = db.execute(build().limit(args.limit)).all()
+                        latencies.append(time.perf_counter() - t0)
+                    row[label] = {"hits": len(hits), **summarize(latencies)}
+                print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
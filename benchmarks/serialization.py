@@ -0,0 +1,91 @@
+"""Throughput of serializing large sweet lists to JSON.
+
+Compares, on the same ``--items`` rows:
+
+* ``response_model``: what FastAPI does for ``response_model=list[SweetRead]``
+  with ORM objects (validate from attributes, ``jsonable_encoder``, ``json.dumps``);
+* ``validate + jsonable_encoder``: the catalog's previous hand-rolled path over Core rows;
+* ``sweet_json``: Core rows reshaped to dicts and dumped by pydantic-core.
+
+The byte output of the last two is checked to be identical.
+
+    python -m benchmarks.serialization --items 10000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import create_schema, insert_synthetic_sweets, use_temp_database
+
+
+def best_of(repeats: int, fn) -> float:
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    insert_synthetic_sweets(args.items)
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from sqlalchemy import select
+
+    from app.core.database import SessionLocal
+    from app.models.sweet import Sweet
+    from app.schemas.sweet import SweetRead
+    from app.services.sweet_json import render_rows
+    from app.services.sweet_service import READ_COLUMNS
+
+    with SessionLocal() as db:
+        orm_rows = db.scalars(select(Sweet)).all()
+        core_rows = db.execute(select(*READ_COLUMNS)).all()
+
+        field = create_response_field(name="bench", type_=list[SweetRead])
+        loop = asyncio.new_event_loop()
+
+        def response_model():
+            content = loop.run_until_complete(serialize_response(field=field, response_content=orm_rows))
+            return JSONResponse(content).body
+
+        def previous():
+            content = [SweetRead.model_validate(row) for row in core_rows]
+            return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+
+        def fast():
+            return render_rows(core_rows)
+
+        assert previous() == fast(), "sweet_json output differs from the previous encoder"
+        assert json.loads(response_model()) == json.loads(fast())
+
+        size = len(fast())
+        baseline = None
+        for name, fn in (("response_model", response_model), ("validate + jsonable_encoder", previous), ("sweet_json", fast)):
+            seconds = best_of(args.repeats, fn)
+            baseline = baseline or seconds
+            print(json.dumps({
+                "path": name,
+                "items": len(core_rows),
+                "ms": round(seconds * 1000, 2),
+                "items_per_s": round(len(core_rows) / seconds),
+                "mb_per_s": round(size / seconds / 1e6, 1),
+                "speedup": round(baseline / seconds, 1),
+            }))
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Idle SSE subscribers on /api/sweets/stream: broadcast latency and memory.
+
+Opens ``--subscribers`` event streams from one asyncio client, reads the
+server's resident memory from ``/metrics/json`` before and after, then triggers
+purchases and measures how long each frame takes to reach every subscriber.
+On a single machine the client competes with the server for CPU, so the
+latencies are an upper bound.
+
+    python -m benchmarks.stock_stream_fanout --subscribers 5000 --broadcasts 20
+"""
+import argparse
+import asyncio
+import json
+import resource
+import time
+
+from benchmarks.common import Client, create_schema, make_sweet, make_user, serve_process, summarize, use_temp_database
+
+
+async def open_stream(host: str, port: int):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /api/sweets/stream HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode())
+    await writer.drain()
+    while (await reader.readline()) not in (b"\r\n", b""):
+        pass  # response headers
+    return reader, writer
+
+
+async def wait_for_frame(reader, marker: bytes) -> float:
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("stream closed")
+        if marker in line:
+            return time.perf_counter()
+
+
+def metrics(address) -> dict:
+    _, body = Client(address).request("GET", "/metrics/json")
+    return json.loads(body)
+
+
+async def run(address, subscribers: int, broadcasts: int, token: str, sweet_id: int):
+    host, port = address
+    baseline = metrics(address)["process"]["resident_memory_bytes"]
+    streams = []
+    for start in range(0, subscribers, 500):
+        streams += await asyncio.gather(*(open_stream(host, port) for _ in range(min(500, subscribers - start))))
+    await asyncio.sleep(1)
+    after = metrics(address)
+    rss = after["process"]["resident_memory_bytes"]
+    print(json.dumps({
+        "subscribers": after["stock_stream"]["subscribers"],
+        "server_rss_before_mb": round(baseline / 2**20, 1),
+        "server_rss_after_mb": round(rss / 2**20, 1),
+        "bytes_per_subscriber": round((rss - baseline) / subscribers),
+    }))
+
+    buyer = Client(address, token)
+    first, last = [], []
+    for _ in range(broadcasts):
+        # the purchase returns the new quantity, which is what the frame will carry
+        waiters = [asyncio.ensure_future(wait_for_frame(reader, b'"quantity"')) for reader, _ in streams]
+        await asyncio.sleep(0)
+        t0 = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(None, buyer.request, "POST", f"/api/sweets/{sweet_id}/purchase")
+        arrivals = await asyncio.gather(*waiters)
+        first.append(min(arrivals) - t0)
+        last.append(max(arrivals) - t0)
+    buyer.close()
+    print(json.dumps({"broadcast_first_subscriber": summarize(first), "broadcast_all_subscribers": summarize(last)}))
+    print(json.dumps({"stock_stream": metrics(address)["stock_stream"]}))
+    for _, writer in streams:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--broadcasts", type=int, default=20)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, max(soft, args.subscribers + 1024)), hard))
+
+    use_temp_database()
+    create_schema()
+    token = make_user("watcher@example.com")
+    sweet_id = make_sweet(quantity=1_000_000)
+    # the server inherits the raised file limit; a deep backlog absorbs the connect burst
+    with serve_process(args=("--backlog", "4096", "--log-level", "critical")) as address:
+        asyncio.run(run(address, args.subscribers, args.broadcasts, token, sweet_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Refresh-token rotation versus a full login, and the cost of revocation checks.
+
+Drives the ASGI app in-process (httpx, no sockets), one request at a time:
+
+* ``login``: email + password, so one bcrypt verify in the hashing pool;
+* ``refresh``: rotates the previous refresh token, no bcrypt at all;
+* ``authed GET (N revoked)``: ``GET /api/reservations/`` with a cached
+  principal while the in-memory revocation list holds N ids.
+
+    python -m benchmarks.token_refresh --requests 500 --revoked 100000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import create_schema, make_user, summarize, use_temp_database
+from benchmarks.datagen import PASSWORD
+
+
+async def measure(args):
+    import httpx
+
+    from app.main import app
+    from app.services.token_revocation import revocations
+
+    make_user("refresh@example.com", password=PASSWORD)
+    credentials = {"email": "refresh@example.com", "password": PASSWORD}
+    timings = {"login": [], "refresh": []}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def timed(method, url, **kwargs):
+                t0 = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                elapsed = time.perf_counter() - t0
+                assert response.status_code == 200, response.text
+                return elapsed, response
+
+            _, response = await timed("POST", "/api/auth/login", json=credentials)
+            tokens = response.json()
+            for _ in range(args.requests):
+                elapsed, _ = await timed("POST", "/api/auth/login", json=credentials)
+                timings["login"].append(elapsed)
+                elapsed, response = await timed("POST", "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+                timings["refresh"].append(elapsed)
+                tokens = response.json()
+
+            auth = {"Authorization": f"Bearer {tokens['access_token']}"}
+            expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+            for size in (0, args.revoked):
+                revocations.clear()
+                for i in range(size):
+                    revocations.add(f"bench-{i}", expiry)
+                name = f"authed GET ({size} revoked)"
+                timings[name] = []
+                for _ in range(50):
+                    await timed("GET", "/api/reservations/", headers=auth)
+                for _ in range(args.requests):
+                    elapsed, _ = await timed("GET", "/api/reservations/", headers=auth)
+                    timings[name].append(elapsed)
+
+    for name, values in timings.items():
+        print(json.dumps({"case": name, **summarize(values)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--revoked", type=int, default=100_000)
+    args = parser.parse_args()
+
+    use_temp_database()
+    create_schema()
+    asyncio.run(measure(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,5 +12,7 @@ export const deleteSweet = (id: string, token?: string) =>
   api.delete(`/sweets/${id}`, token ? { headers: { Authorization: `Bearer ${token}` } } : {});
 export const purchaseSweet = (id: string, token?: string) =>
   api.post(`/sweets/${id}/purchase`, {}, token ? { headers: { Authorization: `Bearer ${token}` } } : {});
+export const checkoutSweets = (items: { sweet_id: number; quantity: number }[], token?: string) =>
+  api.post("/sweets/checkout", { items }, token ? { headers: { Authorization: `Bearer ${token}` } } : {});
 export const restockSweet = (id: string, qty: number, token?: string) =>
   api.post(`/sweets/${id}/restock`, { quantity: qty }, token ? { headers: { Authorization: `Bearer ${token}` } } : {});
@@ -204,7 +204,6 @@ const Dashboard: React.FC = () => {
     try {
       await authAxios.post("/api/sweets/purchase", { sweet_id: id });
       alert("Sweet purchased successfully!");
-      fetchSweets();
     } catch (err) {
       console.error("Purchase error:", err);
       alert("Failed to purchase sweet (Unauthorized or Server Error)");
@@ -224,6 +223,26 @@ const Dashboard: React.FC = () => {
     fetchSweets();
   }, []);
 
+  // Live stock: apply pushed deltas instead of re-fetching the whole list.
+  useEffect(() => {
+    const stream = new EventSource(`${import.meta.env.VITE_API_URL}/api/sweets/stream`);
+    stream.addEventListener("stock", (e) => {
+      const deltas: { id: number; quantity?: number; price?: number; deleted?: boolean }[] =
+        JSON.parse((e as MessageEvent).data);
+      setSweets((current) => {
+        const byId = new Map(deltas.map((d) => [d.id, d]));
+        return current
+          .filter((s) => !byId.get(s.id)?.deleted)
+          .map((s) => {
+            const d = byId.get(s.id);
+            return d ? { ...s, quantity: d.quantity ?? s.quantity, price: d.price ?? s.price } : s;
+          });
+      });
+    });
+    stream.addEventListener("resync", () => fetchSweets());
+    return () => stream.close();
+  }, []);
+
   return (
     <div className="min-h-screen bg-linear-to-br from-pink-500 via-purple-500 to-indigo-500 p-10 text-white">
       {/* Header */}
@@ -0,0 +1,23 @@
+"""Recompute the daily sales rollups from the orders ledger.
+
+    python rebuild_analytics.py [--batch-size 10000]
+"""
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.analytics_service import AnalyticsService
+
+
+def rebuild_analytics(batch_size: int):
+    db = SessionLocal()
+    try:
+        lines = AnalyticsService(db).rebuild(batch_size=batch_size)
+    finally:
+        db.close()
+    print(f"✅ Rebuilt sales rollups from {lines} order lines.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the daily sales rollups from the orders ledger.")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    rebuild_analytics(parser.parse_args().batch_size)
@@ -1,3 +1,5 @@
+from sqlalchemy import insert
+
 from app.core.database import SessionLocal
 from app.models.sweet import Sweet
 
@@ -106,10 +108,8 @@ def seed_sweets():
         },
     ]
 
-    for sweet_data in sweets_data:
-        sweet = Sweet(**sweet_data)
-        db.add(sweet)
-
+    # one executemany instead of an INSERT per object
+    db.execute(insert(Sweet), sweets_data)
     db.commit()
     db.close()
     print("✅ Added sample sweets successfully!")
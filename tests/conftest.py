@@ -0,0 +1,81 @@
+"""Shared fixtures.
+
+Settings are read once at import, so the environment is pinned here, before
+anything imports ``app``: one throwaway SQLite file for the whole session,
+migrated by the app's own lifespan, with the rate limiter off (its tests
+drive the middleware directly) and cheap bcrypt.
+"""
+import itertools
+import os
+import tempfile
+
+import pytest
+
+_directory = tempfile.mkdtemp(prefix="sweet-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directory, 'test.db')}"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["INVALIDATION_BUS"] = "local"
+
+PASSWORD = "testpass123"
+_ids = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def make_user(client):
+    """``make_user(role="user")`` -> ``(user_id, email, access_token)``, a fresh user each call."""
+    from app.core.database import SessionLocal
+    from app.models.user import User
+    from app.utils.security import create_access_token, hash_password
+
+    def make(role: str = "user"):
+        email = f"user{next(_ids)}@example.com"
+        with SessionLocal() as db:
+            user = User(email=email, full_name=email, password_hash=hash_password(PASSWORD), role=role)
+            db.add(user)
+            db.commit()
+            return user.id, email, create_access_token(subject=email, uid=user.id, role=role)
+
+    return make
+
+
+@pytest.fixture
+def admin(make_user) -> dict:
+    return auth(make_user("admin")[2])
+
+
+@pytest.fixture
+def make_sweet(client, admin):
+    """``make_sweet(quantity, price=2.5)`` -> id of a new sweet, created through the API."""
+
+    def make(quantity: int, price: float = 2.5, category: str = "Test") -> int:
+        payload = {"name": f"Sweet {next(_ids)}", "category": category, "price": price, "quantity": quantity}
+        response = client.post("/api/sweets/", json=payload, headers=admin)
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    return make
+
+
+def stock(sweet_id: int) -> int | None:
+    """Current quantity straight from the table, past every cache."""
+    from app.core.database import SessionLocal
+    from app.models.sweet import Sweet
+
+    with SessionLocal() as db:
+        sweet = db.get(Sweet, sweet_id)
+        return None if sweet is None else sweet.quantity
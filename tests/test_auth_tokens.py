@@ -0,0 +1,60 @@
+from tests.conftest import PASSWORD, auth
+
+
+def login(client, email):
+    response = client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def refresh(client, token):
+    return client.post("/api/auth/refresh", json={"refresh_token": token})
+
+
+def test_refresh_rotates(client, make_user):
+    tokens = login(client, make_user()[1])
+
+    rotated = refresh(client, tokens["refresh_token"])
+
+    assert rotated.status_code == 200
+    assert rotated.json()["refresh_token"] != tokens["refresh_token"]
+    assert client.get("/api/orders/", headers=auth(rotated.json()["access_token"])).status_code == 200
+
+
+def test_replayed_refresh_token_revokes_the_family(client, make_user):
+    tokens = login(client, make_user()[1])
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    # the thief's replay also ends the legitimate holder's chain
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+    assert client.get("/api/orders/", headers=auth(rotated["access_token"])).status_code == 401
+
+
+def test_logout_revokes_access_and_refresh(client, make_user):
+    tokens = login(client, make_user()[1])
+    headers = auth(tokens["access_token"])
+
+    response = client.post("/api/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+
+    assert response.status_code == 204
+    assert client.get("/api/orders/", headers=headers).status_code == 401
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_demoted_admin_loses_access_across_restart(client, make_user, admin):
+    from app.core.database import engine
+    from app.services import auth_service
+
+    user_id, _, token = make_user("admin")
+    assert client.get("/api/admin/analytics/low-stock", headers=auth(token)).status_code == 200
+
+    response = client.put(f"/api/auth/users/{user_id}/role", json={"role": "user"}, headers=admin)
+    assert response.status_code == 200, response.text
+    assert client.get("/api/admin/analytics/low-stock", headers=auth(token)).status_code == 403
+
+    # a restart forgets everything in memory; the stored change has to carry it
+    auth_service._role_changed_at.clear()
+    auth_service.principal_cache.clear()
+    auth_service.load_role_changes(engine)
+    assert client.get("/api/admin/analytics/low-stock", headers=auth(token)).status_code == 403
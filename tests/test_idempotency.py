@@ -0,0 +1,96 @@
+import uuid
+
+from sqlalchemy import event, select, text
+
+from tests.conftest import auth, stock
+
+
+def key() -> dict:
+    return {"Idempotency-Key": uuid.uuid4().hex}
+
+
+def test_retry_replays_instead_of_buying_twice(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=5)
+    headers = auth(make_user()[2]) | key()
+
+    first = client.post(f"/api/sweets/{sweet_id}/purchase", headers=headers)
+    retry = client.post(f"/api/sweets/{sweet_id}/purchase", headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.content == first.content
+    assert "idempotent-replayed" not in first.headers
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert stock(sweet_id) == 4
+
+
+def test_client_errors_replay_too(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=0)
+    headers = auth(make_user()[2]) | key()
+
+    assert client.post(f"/api/sweets/{sweet_id}/purchase", headers=headers).status_code == 400
+    retry = client.post(f"/api/sweets/{sweet_id}/purchase", headers=headers)
+
+    assert retry.status_code == 400
+    assert retry.headers["idempotent-replayed"] == "true"
+
+
+def test_key_reused_for_another_request_is_422(client, make_user, make_sweet):
+    first, second = make_sweet(quantity=5), make_sweet(quantity=5)
+    headers = auth(make_user()[2]) | key()
+
+    assert client.post(f"/api/sweets/{first}/purchase", headers=headers).status_code == 200
+    response = client.post(f"/api/sweets/{second}/purchase", headers=headers)
+
+    assert response.status_code == 422
+    assert stock(second) == 5
+
+
+def test_keys_are_per_user(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=5)
+    shared = key()
+
+    for _ in range(2):
+        response = client.post(f"/api/sweets/{sweet_id}/purchase", headers=auth(make_user()[2]) | shared)
+        assert "idempotent-replayed" not in response.headers
+    assert stock(sweet_id) == 3
+
+
+def test_forbidden_is_not_stored(client, make_user):
+    headers = auth(make_user()[2]) | key()
+    sweet = {"name": f"Forbidden {uuid.uuid4().hex}", "category": "Test", "price": 1.0, "quantity": 1}
+
+    assert client.post("/api/sweets/", json=sweet, headers=headers).status_code == 403
+    retry = client.post("/api/sweets/", json=sweet, headers=headers)
+
+    assert retry.status_code == 403
+    assert "idempotent-replayed" not in retry.headers
+
+
+def test_claim_survives_the_owner_vanishing(client):
+    from app.core.database import engine
+    from app.models.idempotency import IdempotencyKey
+    from app.services.idempotency import IdempotencyStore
+
+    store = IdempotencyStore(engine, ttl_seconds=3600, cache_size=0, lease_seconds=60)
+    name = uuid.uuid4().hex
+    assert store.claim(name, "fingerprint") is None
+
+    vanished = []
+
+    def vanish(conn, clauseelement, multiparams, params, execution_options, result):
+        # the first owner releases the key between our INSERT and our SELECT
+        if not vanished and str(clauseelement).startswith("INSERT INTO idempotency_keys") and result.rowcount == 0:
+            vanished.append(True)
+            conn.execute(text("DELETE FROM idempotency_keys WHERE key = :key"), {"key": name})
+
+    event.listen(engine, "after_execute", vanish)
+    try:
+        assert store.claim(name, "fingerprint") is None
+    finally:
+        event.remove(engine, "after_execute", vanish)
+
+    assert vanished
+
+    with engine.connect() as conn:
+        row = conn.execute(select(IdempotencyKey.__table__).where(IdempotencyKey.key == name)).one()
+    assert row.status is None
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from app.services.invalidation import InvalidationBus
+from app.utils.pubsub import LocalPubSub, SQLitePubSub
+
+
+class Recorder:
+    def __init__(self):
+        self.payloads = []
+        self.arrived = threading.Event()
+
+    def __call__(self, payload):
+        self.payloads.append(payload)
+        self.arrived.set()
+
+
+def wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two buses on one SQLite transport file, as two uvicorn workers would have."""
+    path = str(tmp_path / "bus.db")
+    buses = [InvalidationBus(SQLitePubSub(path, poll_interval=0.005), shared=True) for _ in range(2)]
+    recorders = [Recorder() for _ in buses]
+    for bus, recorder in zip(buses, recorders):
+        bus.on("sweet", recorder)
+        bus.start()
+    yield list(zip(buses, recorders))
+    for bus in buses:
+        bus.stop()
+        bus.client.close()
+
+
+def test_publish_reaches_the_other_worker(workers):
+    (first, first_seen), (second, second_seen) = workers
+
+    first.publish("sweet", {"id": 7})
+
+    assert second_seen.arrived.wait(5)
+    assert second_seen.payloads == [{"id": 7}]
+    assert second.received == 1
+
+
+def test_publisher_applies_its_own_message_once(workers):
+    (first, first_seen), (second, second_seen) = workers
+
+    first.publish("sweet", {"id": 1})
+    second.publish("sweet", {"id": 2})
+    assert wait_for(lambda: len(first_seen.payloads) >= 2 and len(second_seen.payloads) >= 2)
+    # give each listener time to read back (and skip) its own message
+    time.sleep(0.1)
+
+    assert sorted(p["id"] for p in first_seen.payloads) == [1, 2]
+    assert sorted(p["id"] for p in second_seen.payloads) == [1, 2]
+
+
+def test_local_transport_stays_in_process():
+    seen = Recorder()
+    bus = InvalidationBus(LocalPubSub(), shared=False)
+    bus.on("sweet", seen)
+    bus.start()
+
+    bus.publish("sweet", {"id": 3})
+
+    assert seen.payloads == [{"id": 3}]
+    assert bus.stats()["published"] == 0
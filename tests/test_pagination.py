@@ -0,0 +1,36 @@
+from tests.conftest import auth
+
+
+def test_order_pages_cover_every_order_once(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=20)
+    token = make_user()[2]
+    for _ in range(7):
+        assert client.post(f"/api/sweets/{sweet_id}/purchase", headers=auth(token)).status_code == 200
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+        response = client.get("/api/orders/", params=params, headers=auth(token))
+        assert response.status_code == 200, response.text
+        seen += [order["id"] for order in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 7
+    assert seen == sorted(set(seen), reverse=True)
+
+
+def test_deleted_sweet_id_is_not_reused(client, make_user, make_sweet, admin):
+    sweet_id = make_sweet(quantity=5)
+    token = make_user()[2]
+    assert client.post(f"/api/sweets/{sweet_id}/purchase", headers=auth(token)).status_code == 200
+
+    assert client.delete(f"/api/sweets/{sweet_id}", headers=admin).status_code == 204
+    replacement = make_sweet(quantity=5)
+
+    assert replacement > sweet_id
+    # the order keeps its snapshot but no longer points at any sweet
+    (line,) = client.get("/api/orders/", headers=auth(token)).json()[0]["lines"]
+    assert line["sweet_id"] is None
+    assert line["quantity"] == 1
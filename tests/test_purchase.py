@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.conftest import auth, stock
+
+
+def test_concurrent_purchases_never_oversell(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=5)
+    token = make_user()[2]
+
+    def buy(_):
+        return client.post(f"/api/sweets/{sweet_id}/purchase", headers=auth(token)).status_code
+
+    with ThreadPoolExecutor(8) as pool:
+        statuses = list(pool.map(buy, range(20)))
+
+    assert statuses.count(200) == 5
+    assert statuses.count(400) == 15
+    assert stock(sweet_id) == 0
+
+
+def test_checkout_is_all_or_nothing(client, make_user, make_sweet):
+    plenty, scarce = make_sweet(quantity=10), make_sweet(quantity=1)
+    token = make_user()[2]
+    basket = {"items": [{"sweet_id": plenty, "quantity": 3}, {"sweet_id": scarce, "quantity": 2}]}
+
+    response = client.post("/api/sweets/checkout", json=basket, headers=auth(token))
+
+    assert response.status_code == 400
+    assert (stock(plenty), stock(scarce)) == (10, 1)
+
+
+def test_checkout_records_one_order(client, make_user, make_sweet):
+    first, second = make_sweet(quantity=4, price=2.0), make_sweet(quantity=4, price=3.0)
+    token = make_user()[2]
+    basket = {"items": [{"sweet_id": first, "quantity": 1}, {"sweet_id": second, "quantity": 2}, {"sweet_id": first, "quantity": 1}]}
+
+    response = client.post("/api/sweets/checkout", json=basket, headers=auth(token))
+    assert response.status_code == 200, response.text
+    assert (stock(first), stock(second)) == (2, 2)
+
+    orders = client.get("/api/orders/", headers=auth(token)).json()
+    assert len(orders) == 1
+    assert orders[0]["total"] == 10.0
+    assert {line["sweet_id"]: line["quantity"] for line in orders[0]["lines"]} == {first: 2, second: 2}
+
+
+def test_unknown_sweet_is_404(client, make_user):
+    response = client.post("/api/sweets/999999/purchase", headers=auth(make_user()[2]))
+    assert response.status_code == 404
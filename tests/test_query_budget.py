@@ -0,0 +1,22 @@
+"""Gate on ``benchmarks/query_budgets.json``.
+
+The script pins its own settings and database before importing the app, so
+it runs in a fresh interpreter rather than inside this session.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("db_async", ["false", "true"])
+def test_every_endpoint_is_within_budget(db_async):
+    env = {**os.environ, "DB_ASYNC": db_async}
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.query_budget"], cwd=ROOT, env=env, capture_output=True, text=True, timeout=600
+    )
+    assert result.returncode == 0, result.stdout[-4000:] + result.stderr[-4000:]
@@ -0,0 +1,69 @@
+import pytest
+from starlette.testclient import TestClient
+
+from app.middleware.rate_limit import RateLimitMiddleware, route_group
+from app.utils.rate_limit import MemoryBackend, RateLimitBackend, SQLiteBackend
+
+
+async def ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    backend = MemoryBackend() if request.param == "memory" else SQLiteBackend(str(tmp_path / "limits.db"))
+    yield backend
+    backend.close()
+
+
+def limited(backend, limit="3/minute"):
+    return TestClient(RateLimitMiddleware(ok, [route_group("purchase", {"POST"}, r"^/buy$", limit)], backend))
+
+
+def test_headers_then_429(backend):
+    client = limited(backend)
+
+    remaining = []
+    for _ in range(3):
+        response = client.post("/buy")
+        assert response.status_code == 200
+        assert response.headers["ratelimit-limit"] == "3"
+        assert response.headers["ratelimit-policy"] == "3;w=60"
+        remaining.append(int(response.headers["ratelimit-remaining"]))
+    refused = client.post("/buy")
+
+    assert remaining == [2, 1, 0]
+    assert refused.status_code == 429
+    assert refused.json() == {"detail": "Too many requests"}
+    assert int(refused.headers["retry-after"]) >= 1
+    assert int(refused.headers["ratelimit-reset"]) >= 1
+
+
+def test_unmatched_routes_pass_untouched(backend):
+    client = limited(backend)
+
+    for _ in range(5):
+        response = client.get("/buy")
+        assert response.status_code == 200
+        assert "ratelimit-limit" not in response.headers
+
+
+def test_sqlite_buckets_are_shared_between_backends(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    try:
+        assert limited(first, "2/minute").post("/buy").status_code == 200
+        assert limited(second, "2/minute").post("/buy").status_code == 200
+        assert limited(first, "2/minute").post("/buy").status_code == 429
+    finally:
+        first.close()
+        second.close()
+
+
+def test_backend_without_acquire_cannot_be_built():
+    class Incomplete(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
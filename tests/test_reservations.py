@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from tests.conftest import auth, stock
+
+
+def reserve(client, token, sweet_id, quantity):
+    response = client.post(f"/api/sweets/{sweet_id}/reserve", json={"quantity": quantity}, headers=auth(token))
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def expire(reservation_id):
+    from app.core.database import SessionLocal
+    from app.models.reservation import Reservation
+
+    with SessionLocal() as db:
+        past = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.execute(update(Reservation).where(Reservation.id == reservation_id).values(expires_at=past))
+        db.commit()
+
+
+def test_hold_takes_stock_and_reports_utc_expiry(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=5)
+    hold = reserve(client, make_user()[2], sweet_id, 2)
+
+    assert stock(sweet_id) == 3
+    expires_at = datetime.fromisoformat(hold["expires_at"].replace("Z", "+00:00"))
+    assert expires_at.utcoffset() == timedelta(0)
+    assert expires_at > datetime.now(timezone.utc)
+
+
+def test_expired_hold_returns_stock(client, make_user, make_sweet):
+    from app.services.reservation_service import _sweep_once
+
+    sweet_id = make_sweet(quantity=5)
+    token = make_user()[2]
+    hold = reserve(client, token, sweet_id, 2)
+    expire(hold["id"])
+
+    assert _sweep_once(batch_size=1) >= 1
+    assert stock(sweet_id) == 5
+    assert client.get("/api/reservations/", headers=auth(token)).json() == []
+    assert client.post("/api/reservations/checkout", json={}, headers=auth(token)).status_code == 409
+
+
+def test_checkout_turns_holds_into_an_order(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=5)
+    token = make_user()[2]
+    reserve(client, token, sweet_id, 3)
+
+    response = client.post("/api/reservations/checkout", json={}, headers=auth(token))
+
+    assert response.status_code == 200, response.text
+    assert response.json()["lines"][0]["quantity"] == 3
+    assert stock(sweet_id) == 2
+    assert client.get("/api/reservations/", headers=auth(token)).json() == []
+
+
+def test_release_gives_stock_back(client, make_user, make_sweet):
+    sweet_id = make_sweet(quantity=5)
+    token = make_user()[2]
+    hold = reserve(client, token, sweet_id, 4)
+
+    assert client.delete(f"/api/reservations/{hold['id']}", headers=auth(token)).status_code == 204
+    assert stock(sweet_id) == 5
+
+
+def test_deleting_a_sweet_discards_its_holds(client, make_user, make_sweet, admin):
+    sweet_id = make_sweet(quantity=5)
+    token = make_user()[2]
+    reserve(client, token, sweet_id, 1)
+
+    assert client.delete(f"/api/sweets/{sweet_id}", headers=admin).status_code == 204
+    assert client.get("/api/reservations/", headers=auth(token)).json() == []